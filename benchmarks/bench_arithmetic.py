@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Variadic arithmetic primitives on long argument lists.
+
+    python -m benchmarks.bench_arithmetic --args 10000
+
+Compares folding the arguments pairwise through the binary operations of
+csvinspector.lang.arithmetic with the primitives.
+"""
+
+import argparse
+import functools
+import random
+
+from csvinspector.lang import arithmetic
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.types import Integer, Real
+from csvinspector.primitives import FunctionAdd, FunctionDivide, \
+    FunctionMultiply, FunctionSubtract
+
+from .common import best_of
+
+
+def operands(n_args: int, reals: bool, seed: int=0) -> tuple:
+    rnd = random.Random(seed)
+    if reals:
+        return tuple(Real(rnd.uniform(0.5, 1.5)) for _ in range(n_args))
+    return tuple(Integer(rnd.randint(1, 3)) for _ in range(n_args))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--args", type=int, default=10000)
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    env = NestedEnvironment()
+    cases = (("+", FunctionAdd("+"), arithmetic.add),
+             ("-", FunctionSubtract("-"), arithmetic.subtract),
+             ("*", FunctionMultiply("*"), arithmetic.multiply),
+             ("/", FunctionDivide("/"), arithmetic.divide))
+    for reals in (False, True):
+        ops = operands(args.args, reals)
+        for name, function, binary in cases:
+            def pairwise():
+                for _ in range(args.calls):
+                    functools.reduce(binary, ops)
+
+            def primitive():
+                for _ in range(args.calls):
+                    function.call(ops, env)
+
+            pairwise_secs, _ = best_of(args.repeat, pairwise)
+            primitive_secs, _ = best_of(args.repeat, primitive)
+            print("{0} {1:>5}: pairwise {2:.4f}s, primitive {3:.4f}s "
+                  "({4:.1f}x)".format(name, "reals" if reals else "ints",
+                                      pairwise_secs, primitive_secs,
+                                      pairwise_secs / primitive_secs))
+
+
+if __name__ == '__main__':
+    main()
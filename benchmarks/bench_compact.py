@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Memory of a CSV file loaded with the default and the compact types.
+
+    python -m benchmarks.bench_compact --size-mb 256 [--csv data.csv]
+
+Generates the CSV file if it does not exist yet.
+"""
+
+import argparse
+import os
+import tempfile
+
+from csvinspector.frames import compact
+from csvinspector.frames.scan import CsvScan
+
+from .bench_read_csv import generate_csv
+from .common import best_of
+
+
+def collect(file_path: str, compact_types: bool):
+    return CsvScan(file_path, compact=compact_types).collect()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--csv", default=os.path.join(
+        tempfile.gettempdir(), "csvi_bench_compact.csv"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv):
+        generate_csv(args.csv, args.size_mb)
+
+    baseline = None
+    for compact_types in (False, True):
+        secs, df = best_of(args.repeat, collect, args.csv, compact_types)
+        usage = compact.memory_usage(df)
+        total = usage["bytes"].iloc[-1]
+        baseline = baseline or total
+        print("{0:>7}: {1:.2f}s, {2:.1f} MiB ({3:.1f}x smaller)".format(
+            "compact" if compact_types else "default", secs, total / 2 ** 20,
+            baseline / total))
+        print(usage.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Symbol lookup cost against environment nesting depth.
+
+    python -m benchmarks.bench_env --lookups 200000
+
+Measures Environment.find for a locked primitive and for a plain global
+variable from environments nested at increasing depths.
+"""
+
+import argparse
+
+from csvinspector import primitives
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.symbol import Symbol
+from csvinspector.lang.types import Integer
+
+from .common import best_of
+
+
+def lookups(fn, arg, n):
+    for _ in range(n):
+        fn(arg)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lookups", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    root = NestedEnvironment()
+    primitives.load_all(root)
+    root.bind(Symbol("variable"), Integer(1))
+
+    print("{0:>6} {1:>14} {2:>14}".format(
+        "depth", "find(+)", "find(variable)"))
+    env, depth = root, 0
+    for target_depth in (0, 1, 10, 100, 1000):
+        while depth < target_depth:
+            env, depth = env.extend(), depth + 1
+
+        timings = []
+        for fn, arg in ((env.find, Symbol("+")),
+                        (env.find, Symbol("variable"))):
+            secs, _ = best_of(args.repeat, lookups, fn, arg, args.lookups)
+            timings.append(1e9 * secs / args.lookups)
+        print("{0:>6} {1:>11.0f} ns {2:>11.0f} ns".format(
+            depth, *timings))
+
+
+if __name__ == '__main__':
+    main()
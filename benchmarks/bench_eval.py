@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Evaluations per second of arithmetic-heavy scripts.
+
+    python -m benchmarks.bench_eval --forms 20000
+
+Measures interpreter.evaluate, the path taken by run_file, run_stream
+and the REPL for each top-level form, with and without parsing the
+script text.
+"""
+
+import argparse
+import random
+
+from csvinspector import interpreter, primitives
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.lexer import StrLexer
+from csvinspector.lang.parser import Parser
+
+from .common import best_of
+
+
+def arithmetic_script(n_forms: int, seed: int=0) -> str:
+    rnd = random.Random(seed)
+    forms = ["(let x 3) (let y 2.5)"]
+    for i in range(n_forms):
+        forms.append("(let r{0} (+ (* x {1} y) (- {2} x (/ {3} 7)) {4} y))"
+                     .format(i % 100, rnd.randint(1, 9), rnd.randint(0, 99),
+                             rnd.randint(1, 999), round(rnd.random(), 4)))
+    return "\n".join(forms)
+
+
+def parse_all(text: str):
+    parser = Parser(StrLexer(text))
+    forms = []
+    while parser.has_next():
+        forms.append(parser.parse_next())
+    return forms
+
+
+def new_env():
+    env = NestedEnvironment()
+    primitives.load_all(env)
+    return env
+
+
+def parse_and_run(text, env):
+    evaluate_all(parse_all(text), env)
+
+
+def evaluate_all(forms, env):
+    for s_expr in forms:
+        interpreter.evaluate(s_expr, env)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--forms", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = arithmetic_script(args.forms)
+    forms = parse_all(text)
+    env = new_env()
+
+    runs = (("parse + run", parse_and_run, text),
+            ("evaluate", evaluate_all, forms))
+    for name, run, data in runs:
+        secs, _ = best_of(args.repeat, run, data, env)
+        print("{0:>14}: {1:,.0f} forms/s".format(name, len(forms) / secs))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Aggregating the groups of rows of a large CSV file with df_groupby.
+
+    python -m benchmarks.bench_groupby [--csv data.csv] [--chunk-size N]
+
+Uses the file generated by benchmarks.bench_where, generating it if it does
+not exist yet. The aggregation streamed chunk by chunk is compared with
+loading the whole file with pandas and grouping it, in time and in peak
+memory traced while aggregating.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from csvinspector.frames.plan import ScanNode
+from csvinspector.frames.scan import CsvScan
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.symbol import Symbol
+from csvinspector.lang.types import DataFrame
+from csvinspector.primitives import load_all
+
+from .bench_where import generate_csv, run
+from .common import best_of
+
+
+#
+##############################################################################
+
+GROUP_BY = "(df_groupby (STATUS COUNTRY) ((count id) (mean price)" \
+           " (max qty) (nunique qty)) df)"
+
+
+def eager_group_by(file_path: str) -> pd.DataFrame:
+    df = pd.read_csv(file_path)
+    return df.groupby(["STATUS", "COUNTRY"]).agg(
+        {"id": "count", "price": "mean", "qty": ["max", "nunique"]})
+
+
+def traced(function, *args):
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000000)
+    parser.add_argument("--csv", default=os.path.join(
+        tempfile.gettempdir(), "csvi_bench_where.csv"))
+    parser.add_argument("--chunk-size", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--memory", action="store_true",
+                        help="also trace the peak memory (slow)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv):
+        start = time.perf_counter()
+        generate_csv(args.csv, args.rows)
+        print("Generated {0} in {1:.1f}s".format(
+            args.csv, time.perf_counter() - start))
+    print("{0}, {1:.0f} MiB".format(args.csv,
+                                    os.path.getsize(args.csv) / 2 ** 20))
+
+    env = NestedEnvironment()
+    load_all(env)
+    env.bind(Symbol("df"), DataFrame(plan=ScanNode(
+        CsvScan(args.csv, chunk_size=args.chunk_size))))
+
+    def streamed():
+        return run(env, GROUP_BY).data_frame
+
+    secs, result = best_of(args.repeat, streamed)
+    print("df_groupby, streamed: {0:.2f}s, {1} groups".format(
+        secs, len(result)))
+    secs, result = best_of(args.repeat, eager_group_by, args.csv)
+    print("pandas, eager:        {0:.2f}s, {1} groups".format(
+        secs, len(result)))
+
+    if args.memory:
+        print("df_groupby peak:      {0:.0f} MiB".format(
+            traced(streamed) / 2 ** 20))
+        print("pandas peak:          {0:.0f} MiB".format(
+            traced(eager_group_by, args.csv) / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
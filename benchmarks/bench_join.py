@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Joining a large CSV file with a small one with df_join.
+
+    python -m benchmarks.bench_join [--csv data.csv] [--memory]
+
+Uses the file generated by benchmarks.bench_where as the large side,
+generating it if it does not exist yet, and joins it by id with a file of
+--dimension-rows rows. The small file is the build side of the hash join,
+and the large one is streamed chunk by chunk, so the memory used depends on
+the chunk size and the small file, not on the size of the large file. The
+join is compared with loading both files with pandas and merging them, in
+time and in peak memory traced while joining.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from csvinspector.frames.plan import ScanNode
+from csvinspector.frames.scan import CsvScan
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.symbol import Symbol
+from csvinspector.lang.types import DataFrame
+from csvinspector.primitives import load_all
+
+from .bench_where import generate_csv, run
+from .common import best_of
+
+
+#
+##############################################################################
+
+def generate_dimension(file_path: str, n_rows: int, step: int, seed: int=0):
+    rnd = np.random.default_rng(seed)
+    pd.DataFrame({
+        "id": np.arange(n_rows) * step,
+        "segment": np.array(["retail", "online", "wholesale"])[
+            rnd.integers(0, 3, n_rows)],
+    }).to_csv(file_path, index=False)
+
+
+def eager_join(file_path: str, dimension_path: str) -> int:
+    merged = pd.merge(pd.read_csv(file_path), pd.read_csv(dimension_path),
+                      on="id")
+    return int((merged["price"] > 500).sum())
+
+
+def traced(function, *args):
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000000)
+    parser.add_argument("--dimension-rows", type=int, default=100000)
+    parser.add_argument("--csv", default=os.path.join(
+        tempfile.gettempdir(), "csvi_bench_where.csv"))
+    parser.add_argument("--chunk-size", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--memory", action="store_true",
+                        help="also trace the peak memory (slow)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv):
+        start = time.perf_counter()
+        generate_csv(args.csv, args.rows)
+        print("Generated {0} in {1:.1f}s".format(
+            args.csv, time.perf_counter() - start))
+    tmp_dir = tempfile.mkdtemp()
+    dimension_path = os.path.join(tmp_dir, "dimension.csv")
+    generate_dimension(dimension_path, args.dimension_rows,
+                       max(args.rows // args.dimension_rows, 1))
+    print("{0}, {1:.0f} MiB joined with {2:,} rows".format(
+        args.csv, os.path.getsize(args.csv) / 2 ** 20, args.dimension_rows))
+
+    env = NestedEnvironment()
+    load_all(env)
+    env.bind(Symbol("df"), DataFrame(plan=ScanNode(
+        CsvScan(args.csv, chunk_size=args.chunk_size))))
+    env.bind(Symbol("dimension"), DataFrame.from_csv_file(dimension_path))
+
+    def streamed():
+        return run(env, "(df_nrows (df_where (> price 500)"
+                        " (df_join id df dimension)))").value
+
+    try:
+        secs, rows = best_of(args.repeat, streamed)
+        print("df_join, streamed: {0:.2f}s, {1:,} rows".format(secs, rows))
+        secs, rows = best_of(args.repeat, eager_join, args.csv,
+                             dimension_path)
+        print("pandas, eager:     {0:.2f}s, {1:,} rows".format(secs, rows))
+
+        if args.memory:
+            print("df_join peak:      {0:.0f} MiB".format(
+                traced(streamed) / 2 ** 20))
+            print("pandas peak:       {0:.0f} MiB".format(
+                traced(eager_join, args.csv, dimension_path) / 2 ** 20))
+    finally:
+        os.remove(dimension_path)
+        os.rmdir(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
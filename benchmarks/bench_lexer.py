@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Tokens per second of the lexers on a large synthetic script.
+
+    python -m benchmarks.bench_lexer --forms 50000
+
+Only the public lexer API is used, so running the script on two revisions
+compares their lexer engines.
+"""
+
+import argparse
+import os
+import tempfile
+
+from csvinspector.lang.lexer import FileLexer, StrLexer, TokenType
+
+from .common import best_of, synthetic_script
+
+
+def count_tokens(lexer) -> int:
+    n = 0
+    while lexer.next_token().type is not TokenType.EOF:
+        n += 1
+    return n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--forms", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    script = synthetic_script(args.forms)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bench.cl")
+        with open(path, "w") as f:
+            f.write(script)
+
+        print("script: {0} forms, {1:.1f} KiB".format(
+            args.forms, len(script) / 1024))
+        for name, make_lexer in (("StrLexer", lambda: StrLexer(script)),
+                                 ("FileLexer", lambda: FileLexer(path))):
+            secs, n_tokens = best_of(args.repeat,
+                                     lambda: count_tokens(make_lexer()))
+            print("{0:>10}: {1} tokens in {2:.3f}s -> {3:,.0f} tokens/s"
+                  .format(name, n_tokens, secs, n_tokens / secs))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Memory retained by the forms parsed from a script.
+
+    python -m benchmarks.bench_memory --forms 100000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from csvinspector.lang.lexer import StrLexer
+from csvinspector.lang.parser import Parser
+
+from .common import synthetic_script
+
+
+def parse_all(text: str) -> list:
+    parser = Parser(StrLexer(text))
+    forms = []
+    while parser.has_next():
+        forms.append(parser.parse_next())
+    return forms
+
+
+def retained_bytes(text: str) -> (int, int):
+    """Parses `text` and returns (number of forms, bytes still allocated
+    while the forms are alive)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        forms = parse_all(text)
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return len(forms), retained
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--forms", type=int, default=100000)
+    args = parser.parse_args()
+
+    text = synthetic_script(args.forms)
+    n_forms, retained = retained_bytes(text)
+    print("{0} forms: {1:,.1f} MiB, {2:,.0f} bytes/form".format(
+        n_forms, retained / 2 ** 20, retained / n_forms))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Reading a directory of CSV shards with different worker counts.
+
+    python -m benchmarks.bench_multi_csv --files 32 --rows 200000 --jobs 1 2 4
+
+Generates the shards in a temporary directory unless --dir is given and
+already holds them.
+"""
+
+import argparse
+import os
+import tempfile
+
+from csvinspector.frames import multi
+
+from .bench_read_csv import generate_csv
+from .common import best_of
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=32)
+    parser.add_argument("--size-mb", type=int, default=16)
+    parser.add_argument("--jobs", type=int, nargs="+",
+                        default=sorted({1, 2, 4, multi.default_jobs()}))
+    parser.add_argument("--dir", default=os.path.join(
+        tempfile.gettempdir(), "csvi_bench_shards"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    paths = []
+    for i in range(args.files):
+        paths.append(os.path.join(args.dir, "shard{0:03d}.csv".format(i)))
+        if not os.path.exists(paths[-1]):
+            generate_csv(paths[-1], args.size_mb, seed=i)
+    print("{0} files of {1} MiB in {2}, {3} CPUs".format(
+        args.files, args.size_mb, args.dir, multi.default_jobs()))
+
+    baseline = None
+    for jobs in args.jobs:
+        for use_threads in (False, True) if jobs > 1 else (False,):
+            secs, df = best_of(args.repeat, multi.read_csv_files, paths,
+                               jobs, None, None, use_threads)
+            baseline = baseline or secs
+            kind = "sequential" if jobs == 1 else \
+                "threads" if use_threads else "processes"
+            print("{0:>2} {1:>10}: {2:.2f}s, {3:,} rows ({4:.1f}x)".format(
+                jobs, kind, secs, len(df), baseline / secs))
+
+
+if __name__ == '__main__':
+    main()
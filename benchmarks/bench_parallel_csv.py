@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Collecting a single large CSV file with different worker counts.
+
+    python -m benchmarks.bench_parallel_csv --size-mb 1024 --jobs 1 2 4
+
+Generates the CSV file if it does not exist yet. With --numeric only the
+numeric columns are read, which come back from the workers through shared
+memory instead of being pickled.
+"""
+
+import argparse
+import os
+import tempfile
+
+from csvinspector.frames import multi
+from csvinspector.frames.scan import CsvScan
+
+from .bench_read_csv import generate_csv
+from .common import best_of
+
+
+def collect(file_path: str, jobs: int, usecols: [int] or None):
+    scan = CsvScan(file_path, jobs=jobs)
+    return (scan if usecols is None else scan.project(usecols)).collect()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--jobs", type=int, nargs="+",
+                        default=sorted({1, 2, 4, multi.default_jobs()}))
+    parser.add_argument("--csv", default=os.path.join(
+        tempfile.gettempdir(), "csvi_bench_parallel.csv"))
+    parser.add_argument("--numeric", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv):
+        generate_csv(args.csv, args.size_mb)
+    print("{0}, {1:.0f} MiB, {2} CPUs".format(
+        args.csv, os.path.getsize(args.csv) / 2 ** 20, multi.default_jobs()))
+
+    usecols = [0, 1, 2] if args.numeric else None
+    baseline = None
+    for jobs in args.jobs:
+        secs, df = best_of(args.repeat, collect, args.csv, jobs, usecols)
+        baseline = baseline or secs
+        print("{0:>2} jobs: {1:.2f}s, {2:,} rows ({3:.1f}x)".format(
+            jobs, secs, len(df), baseline / secs))
+
+
+if __name__ == '__main__':
+    main()
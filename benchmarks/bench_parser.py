@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Parser stress benchmark with deeply nested, very wide and script-like
+inputs.
+
+    python -m benchmarks.bench_parser --depth 100000 --width 200000
+"""
+
+import argparse
+
+from csvinspector.lang.lexer import StrLexer
+from csvinspector.lang.parser import Parser
+
+from .common import best_of, synthetic_script
+
+
+def parse_all(text: str) -> int:
+    parser = Parser(StrLexer(text))
+    n_forms = 0
+    while parser.has_next():
+        parser.parse_next()
+        n_forms += 1
+    return n_forms
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=100000)
+    parser.add_argument("--width", type=int, default=200000)
+    parser.add_argument("--forms", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    inputs = (
+        ("deep", "(" * args.depth + "x" + ")" * args.depth, args.depth),
+        ("wide", "(+ " + "1 " * args.width + ")", args.width),
+        ("script", synthetic_script(args.forms), None),
+    )
+    for name, text, size in inputs:
+        try:
+            secs, n_forms = best_of(args.repeat, parse_all, text)
+        except RecursionError:
+            print("{0:>7}: RecursionError".format(name))
+            continue
+        print("{0:>7}: {1} forms{2} in {3:.3f}s ({4:,.0f} KiB/s)".format(
+            name, n_forms, "" if size is None else " of size {0}".format(size),
+            secs, len(text) / 1024 / secs))
+
+
+if __name__ == '__main__':
+    main()
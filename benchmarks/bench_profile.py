@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""Profiling the columns of a large CSV file with df_profile.
+
+    python -m benchmarks.bench_profile [--csv data.csv] [--jobs N] [--memory]
+
+Uses the file generated by benchmarks.bench_where, generating it if it does
+not exist yet. The profile computed in a single streamed pass is compared
+with loading the whole file with pandas and computing the same statistics
+exactly with describe() and nunique(), in time and in peak memory traced
+while profiling. With --jobs, the profile is also reduced in parallel over
+byte ranges of the file.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from csvinspector.frames.plan import ScanNode
+from csvinspector.frames.scan import CsvScan
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.symbol import Symbol
+from csvinspector.lang.types import DataFrame
+from csvinspector.primitives import load_all
+
+from .bench_where import generate_csv, run
+from .common import best_of
+
+
+#
+##############################################################################
+
+def eager_profile(file_path: str) -> pd.DataFrame:
+    df = pd.read_csv(file_path)
+    return pd.concat([df.describe(include="all").T,
+                      df.isna().sum().rename("nulls"),
+                      df.nunique().rename("distinct")], axis=1)
+
+
+def traced(function, *args):
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000000)
+    parser.add_argument("--csv", default=os.path.join(
+        tempfile.gettempdir(), "csvi_bench_where.csv"))
+    parser.add_argument("--chunk-size", type=int, default=1000000)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--memory", action="store_true",
+                        help="also trace the peak memory (slow)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv):
+        start = time.perf_counter()
+        generate_csv(args.csv, args.rows)
+        print("Generated {0} in {1:.1f}s".format(
+            args.csv, time.perf_counter() - start))
+    print("{0}, {1:.0f} MiB".format(args.csv,
+                                    os.path.getsize(args.csv) / 2 ** 20))
+
+    env = NestedEnvironment()
+    load_all(env)
+
+    def streamed(jobs: int):
+        env.bind(Symbol("df"), DataFrame(plan=ScanNode(CsvScan(
+            args.csv, chunk_size=args.chunk_size, jobs=jobs))))
+        return run(env, "(df_profile df)").data_frame
+
+    secs, result = best_of(args.repeat, streamed, 1)
+    print("df_profile, streamed: {0:.2f}s".format(secs))
+    if args.jobs > 1:
+        secs, _ = best_of(args.repeat, streamed, args.jobs)
+        print("df_profile, {0} jobs:  {1:.2f}s".format(args.jobs, secs))
+    secs, expected = best_of(args.repeat, eager_profile, args.csv)
+    print("pandas, eager:        {0:.2f}s".format(secs))
+    print(result.to_string())
+    print(expected.to_string())
+
+    if args.memory:
+        print("df_profile peak:      {0:.0f} MiB".format(
+            traced(streamed, 1) / 2 ** 20))
+        print("pandas peak:          {0:.0f} MiB".format(
+            traced(eager_profile, args.csv) / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
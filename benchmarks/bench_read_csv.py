@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Time and peak memory of data frame operations on a large CSV file.
+
+    python -m benchmarks.bench_read_csv --size-mb 2048 [--csv data.csv]
+
+Generates the CSV file if it does not exist yet. Every operation runs in a
+fresh process, so the reported peak RSS is the one of that operation
+alone. The eager baseline loads the whole file with pandas.read_csv, use
+--no-eager to skip it on machines without memory for the whole file.
+
+With --csv-cache-dir the lazy operations are also run through the
+columnar cache: once with an empty cache, which parses the file and fills
+the cache, and once more reading from it.
+"""
+
+import argparse
+import concurrent.futures
+import functools
+import os
+import random
+import resource
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from csvinspector.frames.colcache import ColumnCache
+from csvinspector.lang.types import DataFrame
+
+
+#
+##############################################################################
+
+def generate_csv(file_path: str, size_mb: int, seed: int=0):
+    rnd = random.Random(seed)
+    target = size_mb * 2 ** 20
+    with open(file_path, "w") as f:
+        f.write("id,price,qty,category,comment\n")
+        i = 0
+        while f.tell() < target:
+            rows = []
+            for _ in range(10000):
+                rows.append("{0},{1:.2f},{2},cat{3},some free text {4}\n"
+                            .format(i, rnd.uniform(0, 1000),
+                                    rnd.randint(1, 50), rnd.randint(0, 20),
+                                    rnd.random()))
+                i += 1
+            f.write("".join(rows))
+
+
+def eager_count(file_path: str):
+    return len(pd.read_csv(file_path))
+
+
+def lazy(file_path: str, cache_dir: str=None) -> DataFrame:
+    cache = None if cache_dir is None else ColumnCache(cache_dir)
+    return DataFrame.from_csv_file(file_path, cache)
+
+
+def lazy_header(file_path: str, cache_dir: str=None):
+    return lazy(file_path, cache_dir).columns
+
+
+def lazy_head(file_path: str, cache_dir: str=None):
+    return len(str(lazy(file_path, cache_dir)))
+
+
+def lazy_count(file_path: str, cache_dir: str=None):
+    return lazy(file_path, cache_dir).count_rows()
+
+
+def lazy_project_count(file_path: str, cache_dir: str=None):
+    return lazy(file_path, cache_dir).project([1]).count_rows()
+
+
+def lazy_project_collect(file_path: str, cache_dir: str=None):
+    return len(lazy(file_path, cache_dir).project([1, 2]).data_frame)
+
+
+def measure(fn, file_path: str):
+    start = time.perf_counter()
+    result = fn(file_path)
+    secs = time.perf_counter() - start
+    max_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return secs, max_rss_kib, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--csv", default=os.path.join(
+        tempfile.gettempdir(), "csvi_bench.csv"))
+    parser.add_argument("--no-eager", action="store_true")
+    parser.add_argument("--csv-cache-dir", default=None)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv):
+        print("Generating {0} MiB in {1}".format(args.size_mb, args.csv))
+        generate_csv(args.csv, args.size_mb)
+    print("{0}: {1:,.0f} MiB".format(args.csv,
+                                     os.path.getsize(args.csv) / 2 ** 20))
+
+    operations = [("lazy header", lazy_header), ("lazy head", lazy_head),
+                  ("lazy count", lazy_count),
+                  ("lazy $ 1 count", lazy_project_count),
+                  ("lazy $ 1 2 data", lazy_project_collect)]
+    if not args.no_eager:
+        operations.insert(0, ("eager read_csv", eager_count))
+    if args.csv_cache_dir is not None:
+        shutil.rmtree(args.csv_cache_dir, ignore_errors=True)
+        cached = functools.partial(lazy_count, cache_dir=args.csv_cache_dir)
+        operations.append(("cold cache", cached))
+        for name, fn in operations[-6:-1]:
+            if fn is not eager_count:
+                operations.append(("cached " + name[5:], functools.partial(
+                    fn, cache_dir=args.csv_cache_dir)))
+
+    for name, fn in operations:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1) as pool:
+            secs, max_rss_kib, _ = pool.submit(measure, fn, args.csv).result()
+        print("{0:>17}: {1:8.3f}s, peak RSS {2:,.0f} MiB".format(
+            name, secs, max_rss_kib / 1024))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""Filtering the rows of a large CSV file with df_where.
+
+    python -m benchmarks.bench_where --rows 10000000 [--csv data.csv]
+
+Generates the CSV file if it does not exist yet. The compiled predicate
+is compared with loading the whole file with pandas and masking it, and
+with evaluating the same predicate once per row. The cost of evaluating
+the predicate alone, per row and vectorized, is measured on the first
+--row-sample rows and extrapolated to the whole file.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from csvinspector import interpreter
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.lexer import StrLexer
+from csvinspector.lang.parser import Parser
+from csvinspector.lang.predicate import compile_predicate
+from csvinspector.lang.symbol import Symbol
+from csvinspector.lang.types import DataFrame
+from csvinspector.primitives import load_all
+
+from .common import best_of
+
+
+#
+##############################################################################
+
+CONDITION = '(and (= STATUS "ACTIVE") (or (> price 900) (< qty 2)))'
+
+
+def generate_csv(file_path: str, n_rows: int, seed: int=0):
+    rnd = np.random.default_rng(seed)
+    block = 1000000
+    for start in range(0, n_rows, block):
+        size = min(block, n_rows - start)
+        pd.DataFrame({
+            "id": np.arange(start, start + size),
+            "STATUS": np.array(["ACTIVE", "INACTIVE", "PENDING"])[
+                rnd.integers(0, 3, size)],
+            "price": np.round(rnd.uniform(0, 1000, size), 2),
+            "qty": rnd.integers(1, 50, size),
+            "COUNTRY": np.array(["ES", "FR", "US", "DE"])[
+                rnd.integers(0, 4, size)],
+        }).to_csv(file_path, mode="w" if start == 0 else "a",
+                  header=start == 0, index=False)
+
+
+def run(env: NestedEnvironment, script: str):
+    return interpreter.evaluate(Parser(StrLexer(script)).parse_next(), env)
+
+
+def eager_mask(file_path: str) -> int:
+    df = pd.read_csv(file_path)
+    mask = (df["STATUS"] == "ACTIVE") & ((df["price"] > 900) | (df["qty"] < 2))
+    return int(mask.sum())
+
+
+def per_row(values: pd.DataFrame, function) -> int:
+    return sum(1 for row in values.itertuples(index=False) if function(*row))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000000)
+    parser.add_argument("--row-sample", type=int, default=200000)
+    parser.add_argument("--csv", default=os.path.join(
+        tempfile.gettempdir(), "csvi_bench_where.csv"))
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv):
+        start = time.perf_counter()
+        generate_csv(args.csv, args.rows)
+        print("Generated {0} in {1:.1f}s".format(
+            args.csv, time.perf_counter() - start))
+    print("{0}, {1:.0f} MiB".format(args.csv,
+                                    os.path.getsize(args.csv) / 2 ** 20))
+
+    env = NestedEnvironment()
+    load_all(env)
+    env.bind(Symbol("df"), DataFrame.from_csv_file(args.csv))
+    n_rows = run(env, "(df_nrows df)").value
+
+    secs, count = best_of(args.repeat, run, env,
+                          "(df_nrows (df_where {0} df))".format(CONDITION))
+    print("df_where, count:   {0:.2f}s, {1:,} rows".format(secs, count.value))
+    secs, df = best_of(args.repeat, lambda: len(run(
+        env, "($ 0 (df_where {0} df))".format(CONDITION)).data_frame))
+    print("df_where, collect: {0:.2f}s, {1:,} rows".format(secs, df))
+    secs, count = best_of(args.repeat, eager_mask, args.csv)
+    print("pandas, eager:     {0:.2f}s, {1:,} rows".format(secs, count))
+
+    sample = min(args.row_sample, n_rows)
+    rows = pd.read_csv(args.csv, nrows=sample)
+    predicate = compile_predicate(Parser(StrLexer(CONDITION)).parse_next(),
+                                  list(rows.columns), env)
+    values = rows.iloc[:, list(predicate.positions)]
+    # Evaluation alone, without parsing the file
+    secs, _ = best_of(args.repeat, per_row, values, predicate._function)
+    print("per row eval:      {0:.2f}s estimated ({1:.3f}s for {2:,} rows)"
+          .format(secs * n_rows / sample, secs, sample))
+    secs, _ = best_of(args.repeat, predicate.mask, rows)
+    print("vectorized eval:   {0:.2f}s estimated ({1:.3f}s for {2:,} rows)"
+          .format(secs * n_rows / sample, secs, sample))
+
+
+if __name__ == '__main__':
+    main()
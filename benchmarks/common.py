@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+import random
+import time
+
+
+# Synthetic inputs
+##############################################################################
+
+_ATOMS = ["df", "df12", "total", "price", "qty", "+", "-", "*", "/"]
+
+
+def synthetic_script(n_forms: int, seed: int=0) -> str:
+    """Generates a script with `n_forms` top-level forms that resembles the
+    output of our pipeline generators: lets, arithmetic and prints.
+    """
+    rnd = random.Random(seed)
+    forms = []
+    for i in range(n_forms):
+        kind = i % 4
+        if kind == 0:
+            forms.append('(let v{0} (+ {1} {2} {3}))'.format(
+                i, rnd.randint(-999, 999), rnd.random() * 100,
+                rnd.randint(0, 50)))
+        elif kind == 1:
+            forms.append('(println "form {0} \\"{1}\\"")'.format(
+                i, rnd.choice(_ATOMS)))
+        elif kind == 2:
+            forms.append('(* (- {0} {1}) (/ {2} {3}.5))'.format(
+                rnd.randint(0, 99), rnd.randint(0, 99),
+                rnd.randint(1, 99), rnd.randint(1, 9)))
+        else:
+            forms.append('($ 1 2 {0})'.format(rnd.choice(_ATOMS[:4])))
+    return "\n".join(forms) + "\n"
+
+
+# Timing
+##############################################################################
+
+def best_of(repeat: int, fn, *args):
+    """Runs `fn(*args)` `repeat` times and returns (best seconds, result)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -8,7 +8,9 @@ import sys
 
 from csvinspector import primitives
 from csvinspector import VERSION_BRANCH, VERSION_STR, interpreter
+from csvinspector.frames import colcache, memo, multi
 from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.scriptcache import ScriptCache
 
 
 #
@@ -23,6 +25,8 @@ LOGGING_LEVELS = {
 
 DEFAULT_LOGGING_LEVEL = 'error'
 
+STDIN_SCRIPT = '-'
+
 
 #
 ##############################################################################
@@ -32,12 +36,22 @@ def main():
     set_up_logging(args)
 
     env = NestedEnvironment()
-    primitives.load_all(env)
-
-    if args.script is not None:
-        interpreter.run_file(env, args.script)
+    csv_cache = None
+    if args.csv_cache_dir is not None:
+        csv_cache = colcache.ColumnCache(args.csv_cache_dir,
+                                         args.csv_cache_size * 2 ** 20)
+    frame_memo = None
+    if args.frame_cache_size > 0:
+        frame_memo = memo.FrameMemo(args.frame_cache_size * 2 ** 20)
+    primitives.load_all(env, csv_cache, frame_memo, args.jobs, args.compact)
+
+    if args.script == STDIN_SCRIPT:
+        interpreter.run_stream(env, sys.stdin)
+    elif args.script is not None:
+        cache = None if args.no_cache else ScriptCache(args.cache_dir)
+        interpreter.run_file(env, args.script, cache)
     else:
-        interpreter.run_repl(env)
+        interpreter.run_repl(env, frame_memo)
 
 
 # Setup
@@ -69,8 +83,45 @@ def parse_command_line_args(args):
                         choices=LOGGING_LEVELS.keys(),
                         default=DEFAULT_LOGGING_LEVEL)
 
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Always parse the script, do not read or write"
+                             " its compiled forms cache")
+
+    parser.add_argument('--cache-dir', action='store', type=str,
+                        default=None,
+                        help="Directory for the compiled forms cache, by"
+                             " default a __csvicache__ directory next to"
+                             " the script")
+
+    parser.add_argument('--csv-cache-dir', action='store', type=str,
+                        default=None,
+                        help="Directory where the columns parsed from CSV"
+                             " files are cached in a binary format, no"
+                             " cache is used by default")
+
+    parser.add_argument('--csv-cache-size', action='store', type=int,
+                        default=colcache.DEFAULT_MAX_BYTES // 2 ** 20,
+                        help="Size limit of the CSV cache in MiB, the least"
+                             " recently used files are evicted first")
+
+    parser.add_argument('--frame-cache-size', action='store', type=int,
+                        default=memo.DEFAULT_MAX_BYTES // 2 ** 20,
+                        help="Memory in MiB for keeping the data frames"
+                             " loaded from files, 0 disables it")
+
+    parser.add_argument('-j', '--jobs', action='store', type=int,
+                        default=multi.default_jobs(),
+                        help="Worker processes used to read several CSV"
+                             " files at once or a large one in parts")
+
+    parser.add_argument('--compact', action='store_true', default=False,
+                        help="Read CSV files with compact column types:"
+                             " categories for low cardinality strings, dates"
+                             " for ISO 8601 strings and downcast numbers")
+
     parser.add_argument('script', nargs='?', type=str, default=None,
-                        help="Script file to execute")
+                        help="Script file to execute, {0} reads the forms"
+                             " from the standard input".format(STDIN_SCRIPT))
 
     return parser.parse_args(args)
 
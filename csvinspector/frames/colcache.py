@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import typing
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+
+#
+##############################################################################
+
+# Bump whenever the layout of the cache entries changes
+FORMAT_VERSION = 1
+
+DEFAULT_MAX_BYTES = 4 * 2 ** 30
+
+MANIFEST_NAME = "manifest.json"
+_TMP_PREFIX = ".tmp-"
+
+_log = logging.getLogger("colcache")
+
+
+#
+##############################################################################
+
+CacheKey = collections.namedtuple(
+    "CacheKey", ["path", "mtime_ns", "size", "options"])
+
+
+class ColumnCache(object):
+    """On-disk columnar cache of the chunks parsed from CSV files.
+
+    Every chunk of a file is stored in a binary columnar format: a Feather
+    (Arrow IPC) file per chunk when pyarrow is available, otherwise a
+    NumPy .npy file per chunk and column. Numeric columns are memory-mapped
+    when read back and only the requested columns are loaded.
+
+    Entries are keyed by the absolute path, modification time and size of
+    the file and the options used to read it. Once the entries take more
+    than `max_bytes`, the least recently used ones are deleted.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int=DEFAULT_MAX_BYTES,
+                 use_arrow: bool=None):
+        if use_arrow is None:
+            use_arrow = feather is not None
+        elif use_arrow and feather is None:
+            raise ValueError("use_arrow requires pyarrow")
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+        self._format = "feather" if use_arrow else "npy"
+
+    @property
+    def cache_dir(self) -> str:
+        return self._cache_dir
+
+    def key(self, file_path: str, **options) -> CacheKey:
+        stat = os.stat(file_path)
+        return CacheKey(os.path.abspath(file_path), stat.st_mtime_ns,
+                        stat.st_size, tuple(sorted(options.items())))
+
+    def entry_path(self, key: CacheKey) -> str:
+        description = json.dumps([list(key), self._format, FORMAT_VERSION,
+                                  pd.__version__])
+        digest = hashlib.sha1(description.encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_dir, digest)
+
+    def load(self, key: CacheKey) -> 'CacheEntry' or None:
+        entry_path = self.entry_path(key)
+        manifest_path = os.path.join(entry_path, MANIFEST_NAME)
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            os.utime(manifest_path)  # Most recently used
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            _log.warning("Ignoring unreadable cache entry for '%s': %s",
+                         key.path, e)
+            return None
+        return CacheEntry(entry_path, manifest)
+
+    def writer(self, key: CacheKey, columns: [str]) -> 'CacheWriter':
+        os.makedirs(self._cache_dir, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(prefix=_TMP_PREFIX, dir=self._cache_dir)
+        return CacheWriter(self, key, columns, tmp_path, self._format)
+
+    def evict(self, keep: str=None):
+        """Deletes the least recently used entries, other than `keep`,
+        until the cache is within its size limit."""
+        entries = []
+        for name in os.listdir(self._cache_dir):
+            entry_path = os.path.join(self._cache_dir, name)
+            manifest_path = os.path.join(entry_path, MANIFEST_NAME)
+            if name.startswith(_TMP_PREFIX) or \
+                    not os.path.exists(manifest_path):
+                continue
+            entries.append((os.path.getmtime(manifest_path),
+                            _directory_size(entry_path), entry_path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            if entry_path != keep:
+                _log.debug("Evicting cache entry %s", entry_path)
+                shutil.rmtree(entry_path, ignore_errors=True)
+                total -= size
+
+    def _commit(self, key: CacheKey, tmp_path: str):
+        entry_path = self.entry_path(key)
+        shutil.rmtree(entry_path, ignore_errors=True)
+        os.replace(tmp_path, entry_path)
+        if _directory_size(entry_path) > self._max_bytes:
+            _log.info("Not caching '%s', it is larger than the cache",
+                      key.path)
+            shutil.rmtree(entry_path, ignore_errors=True)
+        else:
+            self.evict(keep=entry_path)
+
+
+class CacheEntry(object):
+    """Chunks of a CSV file stored in the cache."""
+
+    def __init__(self, entry_path: str, manifest: dict):
+        self._entry_path = entry_path
+        self._manifest = manifest
+
+    @property
+    def columns(self) -> [str]:
+        return self._manifest["columns"]
+
+    @property
+    def n_rows(self) -> int:
+        return sum(self._manifest["chunk_rows"])
+
+    def chunks(self, usecols: [int]=None) -> typing.Iterator[pd.DataFrame]:
+        """Yields the chunks with the columns at positions `usecols`, in
+        file order, like pandas.read_csv does."""
+        if usecols is None:
+            usecols = range(len(self.columns))
+        offset = 0
+        for i, n_rows in enumerate(self._manifest["chunk_rows"]):
+            index = pd.RangeIndex(offset, offset + n_rows)
+            yield self._read_chunk(i, sorted(usecols), index)
+            offset += n_rows
+
+    def _read_chunk(self, chunk: int, usecols: [int],
+                    index: pd.RangeIndex) -> pd.DataFrame:
+        names = [self.columns[p] for p in usecols]
+        if self._manifest["format"] == "feather":
+            table = feather.read_table(
+                os.path.join(self._entry_path, "{0}.feather".format(chunk)),
+                columns=names, memory_map=True)
+            df = table.to_pandas()
+            df.index = index
+            return df
+
+        dtypes = self._manifest["dtypes"][chunk]
+        pickled = self._manifest["pickled"][chunk]
+        data = {}
+        for position, name in zip(usecols, names):
+            # Arrays of Python objects cannot be memory-mapped
+            values = np.load(os.path.join(
+                self._entry_path, "{0}_{1}.npy".format(chunk, position)),
+                mmap_mode=None if pickled[position] else "r",
+                allow_pickle=pickled[position])
+            data[name] = pd.Series(values, index=index, copy=False) \
+                .astype(dtypes[position])
+        return pd.DataFrame(data, index=index)
+
+
+class CacheWriter(object):
+    """Stores the chunks of a file as they are parsed. The entry only
+    becomes visible when commit() is called."""
+
+    def __init__(self, cache: ColumnCache, key: CacheKey, columns: [str],
+                 tmp_path: str, file_format: str):
+        self._cache = cache
+        self._key = key
+        self._tmp_path = tmp_path
+        self._manifest = {"columns": list(columns), "chunk_rows": [],
+                          "format": file_format, "dtypes": [],
+                          "pickled": []}
+        self._failed = False
+
+    def add(self, chunk: pd.DataFrame):
+        if self._failed:
+            return
+        try:
+            self._write_chunk(len(self._manifest["chunk_rows"]), chunk)
+        except (OSError, ValueError, TypeError) as e:
+            _log.warning("Could not cache '%s': %s", self._key.path, e)
+            self.abort()
+            return
+        self._manifest["chunk_rows"].append(len(chunk))
+        # Each chunk infers its own dtypes, like pandas.read_csv does
+        self._manifest["dtypes"].append([str(t) for t in chunk.dtypes])
+        self._manifest["pickled"].append(
+            [t.kind == "O" or not isinstance(t, np.dtype)
+             for t in chunk.dtypes])
+
+    def commit(self):
+        if self._failed:
+            return
+        try:
+            with open(os.path.join(self._tmp_path, MANIFEST_NAME), "w") as f:
+                json.dump(self._manifest, f)
+            self._cache._commit(self._key, self._tmp_path)
+        except OSError as e:
+            _log.warning("Could not cache '%s': %s", self._key.path, e)
+            self.abort()
+
+    def abort(self):
+        self._failed = True
+        shutil.rmtree(self._tmp_path, ignore_errors=True)
+
+    def _write_chunk(self, i: int, chunk: pd.DataFrame):
+        if self._manifest["format"] == "feather":
+            feather.write_feather(
+                chunk.reset_index(drop=True),
+                os.path.join(self._tmp_path, "{0}.feather".format(i)))
+            return
+
+        for position, (_, column) in enumerate(chunk.items()):
+            values = column.to_numpy()
+            np.save(os.path.join(self._tmp_path, "{0}_{1}.npy".format(
+                i, position)), values, allow_pickle=values.dtype.hasobject)
+
+
+def _directory_size(path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path))
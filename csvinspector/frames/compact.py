@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import re
+import typing
+
+import numpy as np
+import pandas as pd
+
+
+#
+##############################################################################
+
+# Rows read from the start of a file to decide the type of its columns
+SAMPLE_ROWS = 10000
+
+# String columns with at most this ratio of distinct values to rows in the
+# sample are stored as categories
+CATEGORY_RATIO = 0.5
+
+CATEGORY = "category"
+DATETIME = "datetime"
+DATETIME_UTC = "datetime_utc"
+
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}"
+                       r"([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?"
+                       r"(?P<offset>Z|[+-]\d{2}:?\d{2})?)?")
+
+_log = logging.getLogger("compact")
+
+
+#
+##############################################################################
+
+def infer_plan(sample: pd.DataFrame) -> typing.Dict[str, str]:
+    """Conversions of the string columns of `sample`, by column name, to
+    categories or dates.
+
+    A column is converted to dates if all its values in the sample are
+    ISO 8601 dates, with an offset in all of them, then converted to UTC,
+    or in none of them. Numeric columns are downcast chunk by chunk and do
+    not need a plan.
+    """
+    plan = {}
+    for name, column in sample.items():
+        if not _is_string(column):
+            continue
+        values = column.dropna()
+        if values.empty:
+            continue
+
+        matches = [_ISO_DATE.fullmatch(v) for v in values.unique()]
+        if all(matches):
+            offsets = {m.group("offset") is not None for m in matches}
+            if len(offsets) == 1:
+                plan[name] = DATETIME_UTC if True in offsets else DATETIME
+                continue
+        if values.nunique() <= CATEGORY_RATIO * len(column):
+            plan[name] = CATEGORY
+    return plan
+
+
+def compact_chunk(chunk: pd.DataFrame, plan: typing.Dict[str, str]) \
+        -> pd.DataFrame:
+    """Converts the columns of `chunk` according to `plan` and downcasts
+    its numeric columns to the narrowest type holding all their values."""
+    columns = []
+    for name, column in chunk.items():
+        conversion = plan.get(name)
+        if conversion == CATEGORY:
+            column = column.astype(CATEGORY)
+        elif conversion is not None:
+            try:
+                column = pd.to_datetime(column, format="ISO8601",
+                                        utc=conversion == DATETIME_UTC)
+            except (ValueError, TypeError) as e:
+                _log.info("Keeping '%s' as strings: %s", name, e)
+        elif column.dtype.kind in "iu":
+            column = pd.to_numeric(column, downcast="integer")
+        elif column.dtype.kind == "f":
+            column = _downcast_float(column)
+        columns.append(column)
+    # Columns may have repeated names
+    df = pd.concat(columns, axis=1) if columns else chunk.copy()
+    df.columns = chunk.columns
+    return df
+
+
+def concat_chunks(chunks: typing.Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenates compacted chunks, keeping as categories the columns
+    that are categories in all of them."""
+    if len(chunks) > 1:
+        chunks = list(chunks)
+        for name, dtype in chunks[0].dtypes.items():
+            if not isinstance(dtype, pd.CategoricalDtype) or \
+                    not all(isinstance(c[name].dtype, pd.CategoricalDtype)
+                            for c in chunks):
+                continue
+            categories = pd.Index(list(dict.fromkeys(
+                v for c in chunks for v in c[name].cat.categories)))
+            for i, chunk in enumerate(chunks):
+                chunks[i] = chunk.assign(**{
+                    name: chunk[name].cat.set_categories(categories)})
+    return pd.concat(chunks, ignore_index=True)
+
+
+def memory_usage(df: pd.DataFrame) -> pd.DataFrame:
+    """Bytes taken by every column of `df`, followed by their total."""
+    sizes = df.memory_usage(index=False, deep=True)
+    return pd.DataFrame({
+        "column": list(df.columns) + ["(total)"],
+        "dtype": [str(t) for t in df.dtypes] + [""],
+        "bytes": list(sizes) + [int(sizes.sum())]})
+
+
+def _is_string(column: pd.Series) -> bool:
+    return pd.api.types.infer_dtype(column, skipna=True) == "string"
+
+
+def _downcast_float(column: pd.Series) -> pd.Series:
+    values = column.to_numpy()
+    with np.errstate(over="ignore"):
+        narrow = values.astype(np.float32)
+    if np.array_equal(narrow.astype(values.dtype), values, equal_nan=True):
+        return pd.Series(narrow, index=column.index, name=column.name)
+    return column
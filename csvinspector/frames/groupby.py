@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+import typing
+
+import numpy as np
+import pandas as pd
+
+
+#
+##############################################################################
+
+AGGREGATIONS = ("count", "sum", "mean", "min", "max", "nunique")
+
+# Partial results computed on each chunk for every aggregation, and how
+# the partial results of several chunks are combined
+_PARTIALS = {"count": ("count",),
+             "sum": ("sum",),
+             "mean": ("sum", "count"),
+             "min": ("min",),
+             "max": ("max",),
+             "nunique": ("values",)}
+
+_COMBINE = {"count": "sum",
+            "sum": "sum",
+            "min": "min",
+            "max": "max",
+            "values": lambda sets: set().union(*sets)}
+
+
+#
+##############################################################################
+
+class GroupAggregator(object):
+    """Aggregates the groups of rows of a frame read in chunks.
+
+    Each chunk is reduced to partial results per group, which are merged
+    with the ones of the previous chunks, so memory is bounded by the
+    number of groups instead of the number of rows. Means are kept as sums
+    and counts, and distinct values as sets, so combining the chunks gives
+    the same results as aggregating all the rows at once.
+
+    `keys` and `aggregations` refer to the columns of the chunks by
+    position, aggregations being pairs of a position and one of the
+    AGGREGATIONS. Without keys, all the rows are a single group.
+    """
+
+    def __init__(self, keys: typing.Sequence[int],
+                 aggregations: typing.Sequence[typing.Tuple[int, str]]):
+        self._keys = list(keys)
+        self._aggregations = list(aggregations)
+        self._partials = [
+            ("{0}_{1}".format(i, stat), position, stat)
+            for i, (position, function) in enumerate(aggregations)
+            for stat in _PARTIALS[function]]
+        self._categorical_keys = set()
+        self._state = None
+
+    def add(self, chunk: pd.DataFrame):
+        """Aggregates the rows of `chunk`."""
+        partial = self._partial(
+            chunk.set_axis(range(chunk.shape[1]), axis=1))
+        if self._state is None:
+            self._state = partial
+        elif len(partial):
+            combined = pd.concat([self._state, partial])
+            if self._keys:
+                groups = combined.groupby(level=list(range(len(self._keys))),
+                                          sort=False, dropna=False)
+            else:
+                groups = combined.groupby(np.zeros(len(combined), int))
+            self._state = groups.agg({name: _COMBINE[stat]
+                                      for name, _, stat in self._partials})
+
+    def result(self) -> pd.DataFrame:
+        """Frame with the key columns followed by the aggregations, one row
+        per group sorted by the keys, with the columns named by position."""
+        state = self._state
+        columns = []
+        for i, (_, function) in enumerate(self._aggregations):
+            if function == "mean":
+                count = state["{0}_count".format(i)]
+                columns.append(state["{0}_sum".format(i)] /
+                               count.where(count > 0))
+            elif function == "nunique":
+                columns.append(state["{0}_values".format(i)].map(len))
+            else:
+                columns.append(state["{0}_{1}".format(
+                    i, _PARTIALS[function][0])])
+
+        n_keys = len(self._keys)
+        result = pd.DataFrame({n_keys + i: column.to_numpy()
+                               for i, column in enumerate(columns)})
+        if self._keys:
+            keys = state.index.to_frame(index=False)
+            for k in range(n_keys):
+                key = keys.iloc[:, k].infer_objects()
+                result.insert(k, k, key.astype("category")
+                              if k in self._categorical_keys else key)
+        for i, (_, function) in enumerate(self._aggregations):
+            if function in ("count", "nunique"):
+                result[n_keys + i] = result[n_keys + i].astype(np.int64)
+
+        if self._keys:
+            try:
+                result = result.sort_values(list(range(n_keys)),
+                                            kind="stable", ignore_index=True)
+            except TypeError:
+                pass  # Keys of types that cannot be compared
+        return result
+
+    def _partial(self, df: pd.DataFrame) -> pd.DataFrame:
+        if not self._keys:
+            return pd.DataFrame({name: [_aggregate(df[position], stat)]
+                                 for name, position, stat in self._partials})
+
+        self._categorical_keys.update(
+            i for i, k in enumerate(self._keys)
+            if isinstance(df[k].dtype, pd.CategoricalDtype))
+        # Hash grouping on the codes of categorical keys
+        keys = [pd.Categorical(df[k]) if _is_string(df[k]) else df[k]
+                for k in self._keys]
+        groups = df.groupby(keys, sort=False, observed=True, dropna=False)
+        partial = pd.DataFrame({
+            name: _aggregate(groups[position], stat)
+            for name, position, stat in self._partials})
+
+        # Categorical levels of each chunk have different categories
+        partial.index = pd.MultiIndex.from_frame(
+            partial.index.to_frame(index=False).astype(object)) \
+            if len(self._keys) > 1 else pd.Index(
+                partial.index.astype(object), name=partial.index.name)
+        return partial
+
+
+def empty_result(df: pd.DataFrame, keys: typing.Sequence[int],
+                 aggregations: typing.Sequence[typing.Tuple[int, str]]) \
+        -> pd.DataFrame:
+    """Frame without rows with the columns of the result of aggregating
+    frames with the columns of `df`, named by position as in
+    GroupAggregator.result."""
+    columns = [df.iloc[:0, k].reset_index(drop=True) for k in keys]
+    for position, function in aggregations:
+        dtype = df.dtypes.iloc[position]
+        if function in ("count", "nunique") or \
+                function == "sum" and pd.api.types.is_bool_dtype(dtype):
+            dtype = np.int64
+        elif function == "mean":
+            dtype = np.float64
+        columns.append(pd.Series(dtype=dtype))
+    return pd.DataFrame(dict(enumerate(columns)))
+
+
+def _aggregate(values, stat: str):
+    """`stat` of a column or of the column of each group."""
+    if stat == "values":
+        if isinstance(values, pd.Series):
+            return _value_set(values.unique())
+        return values.unique().map(_value_set)
+    return getattr(values, stat)()
+
+
+def _value_set(values: np.ndarray) -> set:
+    return set(v for v in values if not pd.isna(v))
+
+
+def _is_string(column: pd.Series) -> bool:
+    return pd.api.types.infer_dtype(column, skipna=True) == "string"
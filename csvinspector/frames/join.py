@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+import typing
+
+import numpy as np
+import pandas as pd
+
+
+#
+##############################################################################
+
+JOIN_TYPES = ("inner", "left", "outer")
+
+# Added to the names of the columns present on both sides of a join
+SUFFIXES = ("_x", "_y")
+
+
+#
+##############################################################################
+
+class HashTable(object):
+    """Rows of the build side of a hash join, indexed by their keys.
+
+    The keys are factorized into one code per distinct key, and the rows
+    are sorted by code, so the rows with a key are a contiguous range of
+    `order`. Probing a chunk looks up the code of each of its keys in the
+    distinct keys and expands the ranges of the matching rows, without a
+    Python loop over the rows. Rows with a missing key never match.
+    """
+
+    def __init__(self, df: pd.DataFrame, keys: typing.Sequence[int]):
+        self.df = df
+        codes, self._uniques = _index(df, keys).factorize()
+        codes[_has_missing(df, keys)] = -1
+        self._order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(self._uniques))
+        # Rows without a key are sorted first, and the code -1 of the keys
+        # without a match gets the last item, that has no rows
+        self._counts = np.append(counts, 0)
+        self._starts = np.append(
+            np.cumsum(counts) - counts + np.count_nonzero(codes < 0), 0)
+        self._matched = np.zeros(len(df), bool)
+
+    def probe(self, chunk: pd.DataFrame, keys: typing.Sequence[int],
+              keep_unmatched: bool) -> typing.Tuple[np.ndarray, np.ndarray]:
+        """Pairs of positions of the rows of `chunk` and of the build rows
+        with the same keys, in the order of the rows of `chunk`.
+
+        With `keep_unmatched`, the rows of `chunk` without a match are
+        paired with -1.
+        """
+        codes = self._uniques.get_indexer(_index(chunk, keys))
+        codes[_has_missing(chunk, keys)] = -1
+        matches = self._counts[codes]
+        n_rows = np.maximum(matches, 1) if keep_unmatched else matches
+
+        probe_rows = np.repeat(np.arange(len(chunk)), n_rows)
+        offsets = np.arange(len(probe_rows)) - np.repeat(
+            np.cumsum(n_rows) - n_rows, n_rows)
+        matched = np.repeat(matches > 0, n_rows)
+        build_rows = np.full(len(probe_rows), -1)
+        build_rows[matched] = self._order[
+            np.repeat(self._starts[codes], n_rows)[matched] +
+            offsets[matched]]
+        self._matched[build_rows[build_rows >= 0]] = True
+        return probe_rows, build_rows
+
+    def unmatched(self) -> np.ndarray:
+        """Positions of the build rows that no probe has matched yet."""
+        return np.flatnonzero(~self._matched)
+
+
+def column_names(left: [str], right: [str]) -> [str]:
+    """Names of the columns of a join of columns named `left` and `right`,
+    adding the SUFFIXES to the names present on both sides."""
+    shared = set(left) & set(right)
+    return [name + suffix if name in shared else name
+            for names, suffix in ((left, SUFFIXES[0]), (right, SUFFIXES[1]))
+            for name in names]
+
+
+def take(df: pd.DataFrame, rows: np.ndarray,
+         nullable: bool) -> typing.List[pd.Series]:
+    """Columns of the rows of `df` at positions `rows`, missing values for
+    the positions that are -1.
+
+    The columns of a `nullable` side are always of a type with missing
+    values, so every chunk of a join has the same types.
+    """
+    columns = []
+    for i in range(df.shape[1]):
+        values = pd.api.extensions.take(df.iloc[:, i].array, rows,
+                                        allow_fill=True)
+        if nullable and values.dtype.kind in "iub":
+            values = values.astype(float if values.dtype.kind != "b"
+                                   else object)
+        columns.append(pd.Series(values, copy=False))
+    return columns
+
+
+def _index(df: pd.DataFrame, keys: typing.Sequence[int]) -> pd.Index:
+    values = []
+    for k in keys:
+        column = df.iloc[:, k]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Compare the values, the categories of each chunk differ
+            column = column.astype(column.dtype.categories.dtype)
+        values.append(column.array)
+    if len(values) == 1:
+        return pd.Index(values[0])
+    return pd.MultiIndex.from_arrays(values)
+
+
+def _has_missing(df: pd.DataFrame, keys: typing.Sequence[int]) -> np.ndarray:
+    return df.iloc[:, list(keys)].isna().any(axis=1).to_numpy()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import logging
+import os
+import threading
+
+import pandas as pd
+
+
+#
+##############################################################################
+
+DEFAULT_MAX_BYTES = 2 ** 30
+
+# With copy-on-write, a shallow copy of a cached frame shares its data
+# until either of them is modified, otherwise the copies must be deep
+_COPY_ON_WRITE = int(pd.__version__.split(".")[0]) >= 3 or \
+    getattr(pd.options.mode, "copy_on_write", False) is True
+
+_log = logging.getLogger("memo")
+
+
+#
+##############################################################################
+
+FileKey = collections.namedtuple("FileKey", ["path", "mtime_ns", "size"])
+
+MemoStats = collections.namedtuple(
+    "MemoStats", ["hits", "misses", "evictions", "entries", "resident_bytes",
+                  "max_bytes"])
+
+
+def file_key(file_path: str) -> FileKey:
+    stat = os.stat(file_path)
+    return FileKey(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+class FrameMemo(object):
+    """In-memory cache of the frames read from files.
+
+    Frames are stored under the key of the file they were read from, the
+    positions of the columns read, None meaning all of them, and the
+    variant of the reader, such as the compact one, and evicted least
+    recently used first once they take more than `max_bytes`. A frame read
+    with all the columns also serves reads of any subset of them.
+
+    get() returns copies of the stored frames, so modifying them does not
+    modify the cached ones.
+    """
+
+    def __init__(self, max_bytes: int=DEFAULT_MAX_BYTES):
+        self._max_bytes = max_bytes
+        self._frames = collections.OrderedDict()
+        self._sizes = {}
+        self._resident_bytes = 0
+        self._hits = self._misses = self._evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int):
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict()
+
+    def get(self, key: FileKey, usecols: [int] or None, variant: str=None) \
+            -> pd.DataFrame or None:
+        """Returns a copy of the frame with the columns at positions
+        `usecols` in file order, or None if it is not cached."""
+        usecols = None if usecols is None else tuple(usecols)
+        with self._lock:
+            for memo_key in ((key, usecols, variant), (key, None, variant)):
+                df = self._frames.get(memo_key)
+                if df is not None:
+                    self._frames.move_to_end(memo_key)
+                    self._hits += 1
+                    break
+            else:
+                self._misses += 1
+                return None
+
+        if memo_key[1] != usecols:
+            return df.iloc[:, list(usecols)]
+        return df.copy(deep=not _COPY_ON_WRITE)
+
+    def put(self, key: FileKey, usecols: [int] or None, df: pd.DataFrame,
+            variant: str=None):
+        """Stores a copy of `df`, unless it is larger than the cache."""
+        usecols = None if usecols is None else tuple(usecols)
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self._max_bytes:
+            _log.debug("Not memoizing %s, %d bytes", key.path, size)
+            return
+
+        df = df.copy(deep=not _COPY_ON_WRITE)
+        with self._lock:
+            # Frames of previous versions of the file are stale
+            for memo_key in list(self._frames):
+                if memo_key[0].path == key.path and memo_key[0] != key:
+                    self._discard(memo_key)
+            memo_key = (key, usecols, variant)
+            self._discard(memo_key)
+            self._frames[memo_key] = df
+            self._sizes[memo_key] = size
+            self._resident_bytes += size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._sizes.clear()
+            self._resident_bytes = 0
+
+    def stats(self) -> MemoStats:
+        with self._lock:
+            return MemoStats(self._hits, self._misses, self._evictions,
+                             len(self._frames), self._resident_bytes,
+                             self._max_bytes)
+
+    def _evict(self):
+        while self._resident_bytes > self._max_bytes and self._frames:
+            memo_key = next(iter(self._frames))
+            _log.debug("Evicting memoized frame %s", memo_key[0].path)
+            self._discard(memo_key)
+            self._evictions += 1
+
+    def _discard(self, memo_key):
+        if memo_key in self._frames:
+            del self._frames[memo_key]
+            self._resident_bytes -= self._sizes.pop(memo_key)
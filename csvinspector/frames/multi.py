@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import concurrent.futures
+import glob
+import os
+import typing
+
+import numpy as np
+import pandas as pd
+
+from .colcache import ColumnCache
+from .compact import concat_chunks
+from .memo import FrameMemo, file_key
+from .scan import COMPACT_VARIANT, CsvScan
+
+
+#
+##############################################################################
+
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+
+def expand_globs(patterns: typing.Iterable[str]) -> [str]:
+    """Paths matched by each pattern, sorted, in the order of the patterns
+    and without repeating any path."""
+    paths, seen = [], set()
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def read_csv_files(paths: typing.Sequence[str], jobs: int=None,
+                   source_column: str=None, cache: ColumnCache=None,
+                   use_threads: bool=False, memo: FrameMemo=None,
+                   compact: bool=False) -> pd.DataFrame:
+    """Reads the CSV files at `paths` concurrently and concatenates them in
+    order.
+
+    The files are parsed by a pool of `jobs` worker processes, or threads
+    if `use_threads` is set, and read through `cache` if given. The frames
+    of the files are kept in `memo` if given, and have compact column
+    types with `compact`, see CsvScan. When `source_column` is given, a
+    categorical column with that name records the path each row was read
+    from.
+    """
+    if not paths:
+        raise ValueError("there are no files to read")
+
+    jobs = min(jobs or default_jobs(), len(paths))
+    if jobs <= 1:
+        frames = [_read_file(path, cache, memo, compact) for path in paths]
+    elif use_threads:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+            frames = list(pool.map(_read_file, paths, [cache] * len(paths),
+                                   [memo] * len(paths),
+                                   [compact] * len(paths)))
+    else:
+        frames = _read_files_in_processes(paths, jobs, cache, memo, compact)
+
+    df = concat_chunks(frames) if compact \
+        else pd.concat(frames, ignore_index=True)
+    if source_column is not None:
+        if source_column in df.columns:
+            raise ValueError("the files already have a '{0}' column"
+                             .format(source_column))
+        categories = list(dict.fromkeys(paths))
+        codes = [categories.index(path) for path in paths]
+        df[source_column] = pd.Categorical.from_codes(
+            np.repeat(codes, [len(f) for f in frames]), categories)
+    return df
+
+
+def _read_files_in_processes(paths: typing.Sequence[str], jobs: int,
+                             cache: ColumnCache or None,
+                             memo: FrameMemo or None,
+                             compact: bool) -> [pd.DataFrame]:
+    # The memo lives in this process, so the workers only read the files
+    # that are not memoized and their frames are memoized here
+    variant = COMPACT_VARIANT if compact else None
+    frames = [None if memo is None else memo.get(file_key(path), None,
+                                                 variant)
+              for path in paths]
+    missing = [i for i, df in enumerate(frames) if df is None]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        read = pool.map(_read_file, [paths[i] for i in missing],
+                        [cache] * len(missing), [None] * len(missing),
+                        [compact] * len(missing))
+        for i, df in zip(missing, read):
+            frames[i] = df
+            if memo is not None:
+                memo.put(file_key(paths[i]), None, df, variant)
+    return frames
+
+
+def _read_file(path: str, cache: ColumnCache or None, memo: FrameMemo or None,
+               compact: bool) -> pd.DataFrame:
+    return CsvScan(path, cache=cache, memo=memo, compact=compact).collect()
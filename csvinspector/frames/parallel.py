@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import concurrent.futures
+import io
+import logging
+import mmap
+import os
+import typing
+
+import numpy as np
+import pandas as pd
+from multiprocessing import resource_tracker, shared_memory
+
+
+#
+##############################################################################
+
+# Files smaller than this are not worth starting a pool for
+MIN_PARALLEL_BYTES = 32 * 2 ** 20
+
+# Upper bound on the bytes parsed by a single task
+MAX_RANGE_BYTES = 256 * 2 ** 20
+
+_log = logging.getLogger("parallel")
+
+
+#
+##############################################################################
+
+def split_ranges(file_path: str, n_ranges: int) -> [(int, int)] or None:
+    """Splits the rows of a CSV file into at most `n_ranges` byte ranges
+    that start and end at line boundaries.
+
+    Returns None if the file contains quotes, since a quoted field may span
+    several lines and a range could start in the middle of it.
+    """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data.find(b'"') != -1:
+                return None
+
+            header_end = data.find(b"\n")
+            if header_end == -1:
+                return []
+            start, ranges = header_end + 1, []
+            step = max(1, (size - start) // n_ranges)
+            while start < size:
+                end = data.find(b"\n", min(start + step, size) - 1)
+                end = size if end == -1 else end + 1
+                ranges.append((start, end))
+                start = end
+    return ranges
+
+
+def read_csv_parallel(file_path: str, names: [str], jobs: int,
+                      usecols: [int]=None) -> pd.DataFrame or None:
+    """Parses the rows of a CSV file with `names` columns in a pool of
+    `jobs` processes, returning only the columns at positions `usecols`.
+
+    Returns None when the file cannot be split safely or is too small to
+    benefit from it, in which case it should be read sequentially.
+    """
+    ranges = _parallel_ranges(file_path, jobs)
+    if not ranges:
+        return None
+
+    usecols = list(range(len(names))) if usecols is None else list(usecols)
+    parts = []
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+            parts = _gather([pool.submit(_parse_range, file_path, start, end,
+                                         names, usecols, ())
+                             for start, end in ranges])
+
+            # Ranges may infer different types for a column. As pandas does
+            # when it reads the whole file, booleans with missing values in
+            # some ranges are objects, and the columns that are not numeric
+            # in all the ranges are parsed as strings
+            as_bool = set(i for i in range(len(usecols)) if _is_boolean(
+                [part[i] for part in parts]))
+            as_str = tuple(i for i in range(len(usecols)) if i not in as_bool
+                           and _needs_str([part[i].dtype for part in parts]))
+            redo = [j for j, part in enumerate(parts)
+                    if any(part[i].series is None for i in as_str)]
+            if redo:
+                reparsed = _gather([pool.submit(
+                    _parse_range, file_path, *ranges[j], names, usecols,
+                    as_str) for j in redo])
+                for j, part in zip(redo, reparsed):
+                    _release(parts[j])
+                    parts[j] = part
+
+        return pd.DataFrame(
+            {names[p]: _concatenate([part[i] for part in parts], i in as_bool)
+             for i, p in enumerate(usecols)},
+            columns=[names[p] for p in usecols])
+    finally:
+        for part in parts:
+            _release(part)
+
+
+def reduce_parallel(file_path: str, names: [str], jobs: int,
+                    usecols: [int] or None, order: [int] or None,
+                    chunk_size: int, new_accumulator: typing.Callable):
+    """Adds the rows of a CSV file with `names` columns to accumulators in
+    a pool of `jobs` processes, one accumulator per byte range, and merges
+    them in the order of the ranges.
+
+    Accumulators are created by `new_accumulator` and have add(chunk) and
+    merge(other) methods. The chunks have at most `chunk_size` rows and
+    the columns at positions `usecols`, in file order and then reordered
+    by `order` if given. Only the accumulators are sent back from the
+    workers, not the rows, so they should be small.
+
+    Returns None when the file cannot be split safely or is too small to
+    benefit from it, in which case it should be read sequentially.
+    """
+    ranges = _parallel_ranges(file_path, jobs)
+    if not ranges:
+        return None
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+        accumulators = [future.result() for future in [
+            pool.submit(_reduce_range, file_path, start, end, names, usecols,
+                        order, chunk_size, new_accumulator)
+            for start, end in ranges]]
+    for accumulator in accumulators[1:]:
+        accumulators[0].merge(accumulator)
+    return accumulators[0]
+
+
+def _parallel_ranges(file_path: str, jobs: int) -> [(int, int)] or None:
+    size = os.path.getsize(file_path)
+    if jobs <= 1 or size < MIN_PARALLEL_BYTES:
+        return None
+    ranges = split_ranges(file_path,
+                          max(jobs, -(-size // MAX_RANGE_BYTES)))
+    if ranges is None:
+        _log.info("'%s' contains quotes, reading it sequentially", file_path)
+    return ranges
+
+
+def _gather(futures: [concurrent.futures.Future]) -> list:
+    """Results of `futures` in order, releasing the shared memory of the
+    ones that succeeded if any of them failed."""
+    try:
+        return [future.result() for future in futures]
+    except BaseException:
+        for future in futures:
+            if future.done() and not future.cancelled() and \
+                    future.exception() is None:
+                _release(future.result())
+        raise
+
+
+# Workers
+##############################################################################
+#
+# Workers parsing a range return each column either as an array of Python
+# objects, which is pickled, or as the name of a shared memory block holding
+# its values, so numeric columns are not serialized. Workers reducing a
+# range only return their accumulator.
+
+ColumnPart = collections.namedtuple(
+    "ColumnPart", ["block", "dtype", "length", "series", "all_missing"])
+
+
+def _parse_range(file_path: str, start: int, end: int, names: [str],
+                 usecols: [int], as_str: typing.Tuple[int]) -> [ColumnPart]:
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    dtype = {names[usecols[i]]: str for i in as_str}
+    df = pd.read_csv(io.BytesIO(data), header=None, names=names,
+                     usecols=usecols, dtype=dtype or None)
+    df = df[[names[p] for p in usecols]]
+
+    parts = []
+    for _, column in df.items():
+        all_missing = bool(column.isna().all())
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind in "biuf":
+            values = column.to_numpy()
+            block = shared_memory.SharedMemory(create=True,
+                                               size=max(1, values.nbytes))
+            np.ndarray(values.shape, values.dtype, block.buf)[:] = values
+            # The parent process unlinks the block once it has read it
+            _untrack(block)
+            block.close()
+            parts.append(ColumnPart(block.name, values.dtype, len(values),
+                                    None, all_missing))
+        else:
+            parts.append(ColumnPart(None, np.dtype(object), len(column),
+                                    column, all_missing))
+    return parts
+
+
+def _untrack(block: shared_memory.SharedMemory):
+    # Only POSIX blocks are tracked, by their name with a leading slash
+    if os.name == "posix":
+        resource_tracker.unregister("/" + block.name, "shared_memory")
+
+
+def _reduce_range(file_path: str, start: int, end: int, names: [str],
+                  usecols: [int] or None, order: [int] or None,
+                  chunk_size: int, new_accumulator: typing.Callable):
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    accumulator = new_accumulator()
+    with pd.read_csv(io.BytesIO(data), header=None, names=names,
+                     usecols=usecols, chunksize=chunk_size) as reader:
+        for chunk in reader:
+            accumulator.add(chunk if order is None else chunk.iloc[:, order])
+    return accumulator
+
+
+def _needs_str(dtypes: [np.dtype]) -> bool:
+    kinds = {dtype.kind for dtype in dtypes}
+    return len(kinds) > 1 and not kinds <= set("iuf")
+
+
+def _is_boolean(parts: [ColumnPart]) -> bool:
+    """Whether the ranges of a column, of different types, only have
+    booleans and missing values."""
+    kinds = {part.dtype.kind for part in parts}
+    present = [part for part in parts if not part.all_missing]
+    return len(kinds) > 1 and bool(present) and all(
+        part.dtype.kind == "b" or part.series is not None and
+        pd.api.types.infer_dtype(part.series, skipna=True) == "boolean"
+        for part in present)
+
+
+def _concatenate(parts: [ColumnPart],
+                 objects: bool=False) -> np.ndarray or pd.Series:
+    if all(part.series is not None for part in parts):
+        return pd.concat([part.series for part in parts], ignore_index=True)
+
+    values = np.empty(sum(part.length for part in parts), object if objects
+                      else np.result_type(*[part.dtype for part in parts]))
+    offset = 0
+    for part in parts:
+        if part.series is not None:
+            values[offset:offset + part.length] = part.series.to_numpy(object)
+            offset += part.length
+            continue
+        block = shared_memory.SharedMemory(name=part.block)
+        try:
+            part_values = np.ndarray(part.length, part.dtype, block.buf)
+            values[offset:offset + part.length] = \
+                part_values.astype(object) if objects else part_values
+        finally:
+            block.close()
+        offset += part.length
+    return values
+
+
+def _release(part: [ColumnPart]):
+    for column in part:
+        if column.block is None:
+            continue
+        try:
+            block = shared_memory.SharedMemory(name=column.block)
+        except FileNotFoundError:
+            continue
+        block.close()
+        block.unlink()
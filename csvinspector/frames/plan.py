@@ -0,0 +1,628 @@
+# -*- coding: utf-8 -*-
+
+import abc
+import functools
+import typing
+
+import numpy as np
+import pandas as pd
+
+from . import compact, groupby, join, profile
+from .scan import CsvScan
+
+
+#
+##############################################################################
+
+class Predicate(object):
+    """Vectorized condition on some columns of a frame.
+
+    `function` receives the columns at `positions`, in that order, and
+    returns a boolean mask with a value per row.
+    """
+
+    def __init__(self, positions: typing.Sequence[int],
+                 function: typing.Callable[..., pd.Series], text: str):
+        self._positions = tuple(positions)
+        self._function = function
+        self._text = text
+
+    @property
+    def positions(self) -> typing.Tuple[int]:
+        return self._positions
+
+    def mask(self, chunk: pd.DataFrame) -> np.ndarray:
+        mask = self._function(*[chunk.iloc[:, p] for p in self._positions])
+        if not is_condition(mask):
+            raise TypeError("{0} is not a condition".format(
+                describe_value(mask)))
+        elif isinstance(mask, pd.Series):
+            # Missing values do not satisfy the condition
+            return mask.fillna(False).astype(bool).to_numpy()
+        # Conditions that do not depend on the columns
+        return np.full(len(chunk), bool(mask))
+
+    def remap(self, mapping: typing.Mapping[int, int]) -> 'Predicate':
+        """The same condition on a frame where the column at position `p`
+        is at position `mapping[p]`."""
+        return Predicate([mapping[p] for p in self._positions],
+                         self._function, self._text)
+
+    def conjunction(self, other: 'Predicate') -> 'Predicate':
+        n = len(self._positions)
+
+        def both(*columns):
+            return self._function(*columns[:n]) & \
+                other._function(*columns[n:])
+        return Predicate(self._positions + other._positions, both,
+                         "{0} and {1}".format(self, other))
+
+    def __str__(self):
+        return self._text
+
+
+def is_condition(value) -> bool:
+    """Whether `value` is a boolean or a column of booleans, which may
+    have missing values."""
+    if isinstance(value, pd.Series):
+        return pd.api.types.is_bool_dtype(value.dtype) or \
+            value.dtype == object and pd.api.types.infer_dtype(
+                value, skipna=True) in ("boolean", "empty")
+    return isinstance(value, (bool, np.bool_))
+
+
+def describe_value(value) -> str:
+    if isinstance(value, pd.Series):
+        return "a column of {0}".format(value.dtype)
+    return repr(value)
+
+
+# Plan nodes
+##############################################################################
+#
+# The nodes describe how to compute a frame from a CSV scan or a frame in
+# memory. Every node streams its rows in chunks and knows the names of its
+# columns without computing them.
+
+class PlanNode(abc.ABC):
+
+    @property
+    @abc.abstractmethod
+    def columns(self) -> [str]:
+        pass
+
+    @abc.abstractmethod
+    def chunks(self) -> typing.Iterator[pd.DataFrame]:
+        pass
+
+    @abc.abstractmethod
+    def empty(self) -> pd.DataFrame:
+        """Frame without rows and with the columns and types of this one."""
+
+    @abc.abstractmethod
+    def compacted(self) -> 'PlanNode':
+        """The same plan reading compact column types."""
+
+    def collect(self) -> pd.DataFrame:
+        chunks = [chunk for chunk in self.chunks() if len(chunk)]
+        if not chunks:
+            return self.empty()
+        return pd.concat(chunks, ignore_index=True)
+
+    def head(self, n_rows: int) -> pd.DataFrame:
+        chunks, n_read = [], 0
+        for chunk in self.chunks():
+            chunks.append(chunk)
+            n_read += len(chunk)
+            if n_read >= n_rows:
+                break
+        if not chunks:
+            return self.empty()
+        return pd.concat(chunks, ignore_index=True).iloc[:n_rows]
+
+    def count_rows(self) -> int:
+        return sum(len(chunk) for chunk in self.chunks())
+
+    def reduce(self, new_accumulator: typing.Callable):
+        """Adds all the chunks to an accumulator created by
+        `new_accumulator`, see CsvScan.reduce()."""
+        accumulator = new_accumulator()
+        for chunk in self.chunks():
+            accumulator.add(chunk)
+        return accumulator
+
+    @abc.abstractmethod
+    def estimate_rows(self) -> int:
+        """Approximate number of rows, without computing them."""
+
+
+class ScanNode(PlanNode):
+    """Rows of a CSV scan, keeping only the ones that match `predicate`,
+    if given."""
+
+    def __init__(self, scan: CsvScan, predicate: Predicate=None):
+        self.scan = scan
+        self.predicate = predicate
+
+    @property
+    def columns(self) -> [str]:
+        return self.scan.columns
+
+    def chunks(self) -> typing.Iterator[pd.DataFrame]:
+        for chunk in self.scan.chunks():
+            yield chunk if self.predicate is None \
+                else chunk[self.predicate.mask(chunk)]
+
+    def empty(self) -> pd.DataFrame:
+        return self.scan.head(0)
+
+    def compacted(self) -> PlanNode:
+        return ScanNode(self.scan.compacted(), self.predicate)
+
+    def collect(self) -> pd.DataFrame:
+        if self.predicate is None:
+            return self.scan.collect()
+        return super().collect()
+
+    def head(self, n_rows: int) -> pd.DataFrame:
+        if self.predicate is None:
+            return self.scan.head(n_rows)
+        return super().head(n_rows)
+
+    def count_rows(self) -> int:
+        if self.predicate is None:
+            return self.scan.count_rows()
+        return int(sum(self.predicate.mask(chunk).sum()
+                       for chunk in self.scan.chunks()))
+
+    def reduce(self, new_accumulator: typing.Callable):
+        if self.predicate is None:
+            return self.scan.reduce(new_accumulator)
+        return super().reduce(new_accumulator)
+
+    def estimate_rows(self) -> int:
+        return self.scan.estimate_rows()
+
+    def __str__(self):
+        if self.predicate is None:
+            return str(self.scan)
+        return "{0} where {1}".format(self.scan, self.predicate)
+
+
+class FrameNode(PlanNode):
+    """Rows of a frame in memory."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+    @property
+    def columns(self) -> [str]:
+        return list(self.df.columns)
+
+    def chunks(self) -> typing.Iterator[pd.DataFrame]:
+        yield self.df
+
+    def empty(self) -> pd.DataFrame:
+        return self.df.iloc[:0]
+
+    def compacted(self) -> PlanNode:
+        plan = compact.infer_plan(self.df.head(compact.SAMPLE_ROWS))
+        return FrameNode(compact.compact_chunk(self.df, plan))
+
+    def collect(self) -> pd.DataFrame:
+        return self.df
+
+    def count_rows(self) -> int:
+        return len(self.df)
+
+    def estimate_rows(self) -> int:
+        return len(self.df)
+
+    def __str__(self):
+        return "frame of {0} rows ({1} columns)".format(
+            len(self.df), len(self.df.columns))
+
+
+class UnaryNode(PlanNode):
+
+    def __init__(self, child: PlanNode):
+        self.child = child
+
+    @abc.abstractmethod
+    def with_child(self, child: PlanNode) -> 'UnaryNode':
+        """The same operation applied to `child`."""
+
+    def compacted(self) -> PlanNode:
+        return self.with_child(self.child.compacted())
+
+    def estimate_rows(self) -> int:
+        return self.child.estimate_rows()
+
+
+class ProjectNode(UnaryNode):
+    """Columns at `indexes` of the child, in that order."""
+
+    def __init__(self, child: PlanNode, indexes: typing.Sequence[int]):
+        super().__init__(child)
+        n_columns = len(child.columns)
+        if any(not -n_columns <= i < n_columns for i in indexes):
+            raise IndexError("column index out of range for {0} columns"
+                             .format(n_columns))
+        self.indexes = [i % n_columns for i in indexes]
+
+    @property
+    def columns(self) -> [str]:
+        columns = self.child.columns
+        return [columns[i] for i in self.indexes]
+
+    def with_child(self, child: PlanNode) -> 'ProjectNode':
+        return ProjectNode(child, self.indexes)
+
+    def chunks(self) -> typing.Iterator[pd.DataFrame]:
+        for chunk in self.child.chunks():
+            yield chunk.iloc[:, self.indexes]
+
+    def empty(self) -> pd.DataFrame:
+        return self.child.empty().iloc[:, self.indexes]
+
+    def collect(self) -> pd.DataFrame:
+        return self.child.collect().iloc[:, self.indexes]
+
+    def head(self, n_rows: int) -> pd.DataFrame:
+        return self.child.head(n_rows).iloc[:, self.indexes]
+
+    def count_rows(self) -> int:
+        return self.child.count_rows()
+
+    def __str__(self):
+        return "{0} columns of {1}".format(len(self.indexes), self.child)
+
+
+class FilterNode(UnaryNode):
+    """Rows of the child that match `predicate`."""
+
+    def __init__(self, child: PlanNode, predicate: Predicate):
+        super().__init__(child)
+        self.predicate = predicate
+
+    @property
+    def columns(self) -> [str]:
+        return self.child.columns
+
+    def with_child(self, child: PlanNode) -> 'FilterNode':
+        return FilterNode(child, self.predicate)
+
+    def chunks(self) -> typing.Iterator[pd.DataFrame]:
+        for chunk in self.child.chunks():
+            yield chunk[self.predicate.mask(chunk)]
+
+    def empty(self) -> pd.DataFrame:
+        return self.child.empty()
+
+    def __str__(self):
+        return "{0} where {1}".format(self.child, self.predicate)
+
+
+class AggregateNode(UnaryNode):
+    """One row per distinct value of the key columns of the child, with
+    the aggregations of its columns.
+
+    `aggregations` are pairs with the position of a column and the name of
+    one of the groupby.AGGREGATIONS. Without keys there is a single row.
+    The rows of the child are aggregated chunk by chunk, see
+    groupby.GroupAggregator.
+    """
+
+    def __init__(self, child: PlanNode, keys: typing.Sequence[int],
+                 aggregations: typing.Sequence[typing.Tuple[int, str]]):
+        super().__init__(child)
+        n_columns = len(child.columns)
+        positions = list(keys) + [p for p, _ in aggregations]
+        if any(not 0 <= p < n_columns for p in positions):
+            raise IndexError("column index out of range for {0} columns"
+                             .format(n_columns))
+        for _, function in aggregations:
+            if function not in groupby.AGGREGATIONS:
+                raise ValueError("unknown aggregation '{0}'".format(function))
+        self.keys = list(keys)
+        self.aggregations = list(aggregations)
+
+    @property
+    def columns(self) -> [str]:
+        columns = self.child.columns
+        return [columns[k] for k in self.keys] + [
+            "{0}({1})".format(function, columns[p])
+            for p, function in self.aggregations]
+
+    def with_child(self, child: PlanNode) -> 'AggregateNode':
+        return AggregateNode(child, self.keys, self.aggregations)
+
+    def chunks(self) -> typing.Iterator[pd.DataFrame]:
+        yield self.collect()
+
+    def empty(self) -> pd.DataFrame:
+        return groupby.empty_result(self.child.empty(), self.keys,
+                                    self.aggregations) \
+            .set_axis(self.columns, axis=1)
+
+    def collect(self) -> pd.DataFrame:
+        aggregator = groupby.GroupAggregator(self.keys, self.aggregations)
+        n_chunks = 0
+        for chunk in self.child.chunks():
+            aggregator.add(chunk)
+            n_chunks += 1
+        if n_chunks == 0:
+            aggregator.add(self.child.empty())
+        return aggregator.result().set_axis(self.columns, axis=1)
+
+    def head(self, n_rows: int) -> pd.DataFrame:
+        return self.collect().head(n_rows)
+
+    def __str__(self):
+        return "aggregation of {0}".format(self.child)
+
+
+class ProfileNode(UnaryNode):
+    """Statistics of each column of the child, one row per column, see
+    profile.STATISTICS.
+
+    The statistics are computed in a single pass over the chunks of the
+    child, which may be reduced in parallel, see profile.FrameProfile.
+    """
+
+    @property
+    def columns(self) -> [str]:
+        return list(profile.STATISTICS)
+
+    def with_child(self, child: PlanNode) -> 'ProfileNode':
+        return ProfileNode(child)
+
+    def chunks(self) -> typing.Iterator[pd.DataFrame]:
+        yield self.collect()
+
+    def empty(self) -> pd.DataFrame:
+        return profile.FrameProfile(0).result([])
+
+    def collect(self) -> pd.DataFrame:
+        columns = self.child.columns
+        return self.child.reduce(functools.partial(
+            profile.FrameProfile, len(columns))).result(columns)
+
+    def head(self, n_rows: int) -> pd.DataFrame:
+        return self.collect().head(n_rows)
+
+    def count_rows(self) -> int:
+        return len(self.child.columns)
+
+    def estimate_rows(self) -> int:
+        return len(self.child.columns)
+
+    def __str__(self):
+        return "profile of {0}".format(self.child)
+
+
+class JoinNode(PlanNode):
+    """Rows of `left` and `right` with the same values in the key columns
+    at `left_keys` and `right_keys`, by position.
+
+    The columns are the ones of `left` followed by the ones of `right`
+    without its keys, the names present on both sides followed by the
+    join.SUFFIXES unless the `names` of the columns are given. `how` is
+    one of the join.JOIN_TYPES: "left" also keeps the rows of `left`
+    without a match and "outer" the rows of either side without a match,
+    with missing values for the columns of the other side, taking the
+    keys from `right` when `left` is missing. Missing keys match no row.
+
+    It is a hash join: the side estimated to have fewer rows is read into
+    a join.HashTable and the rows of the other side are streamed chunk by
+    chunk, looking up their keys in the table, so only the smaller side
+    is kept in memory. The rows are in the order of the streamed side,
+    followed by the rows without a match of the other side.
+    """
+
+    def __init__(self, left: PlanNode, right: PlanNode,
+                 left_keys: typing.Sequence[int],
+                 right_keys: typing.Sequence[int], how: str="inner",
+                 names: typing.Sequence[str]=None):
+        if how not in join.JOIN_TYPES:
+            raise ValueError("unknown join type '{0}'".format(how))
+        if not left_keys or len(left_keys) != len(right_keys):
+            raise ValueError("joins need the same number of keys on each"
+                             " side")
+        for node, keys in ((left, left_keys), (right, right_keys)):
+            n_columns = len(node.columns)
+            if any(not 0 <= k < n_columns for k in keys):
+                raise IndexError("column index out of range for {0} columns"
+                                 .format(n_columns))
+        self.left = left
+        self.right = right
+        self.left_keys = list(left_keys)
+        self.right_keys = list(right_keys)
+        self.how = how
+        self._names = None if names is None else list(names)
+
+    @property
+    def right_values(self) -> [int]:
+        """Positions of the columns of `right` that are not keys."""
+        return [i for i in range(len(self.right.columns))
+                if i not in self.right_keys]
+
+    @property
+    def columns(self) -> [str]:
+        if self._names is not None:
+            return list(self._names)
+        columns = self.right.columns
+        return join.column_names(self.left.columns,
+                                 [columns[i] for i in self.right_values])
+
+    def with_children(self, left: PlanNode, right: PlanNode) -> 'JoinNode':
+        return JoinNode(left, right, self.left_keys, self.right_keys,
+                        self.how, self._names)
+
+    def chunks(self) -> typing.Iterator[pd.DataFrame]:
+        build_left = self.left.estimate_rows() < self.right.estimate_rows()
+        if build_left:
+            build, build_keys = self.left, self.left_keys
+            probe, probe_keys = self.right, self.right_keys
+        else:
+            build, build_keys = self.right, self.right_keys
+            probe, probe_keys = self.left, self.left_keys
+        keep_probe = self.how == "outer" or \
+            self.how == "left" and not build_left
+        keep_build = self.how == "outer" or self.how == "left" and build_left
+
+        table = join.HashTable(build.collect(), build_keys)
+        for chunk in probe.chunks():
+            probe_rows, build_rows = table.probe(chunk, probe_keys,
+                                                 keep_probe)
+            yield self._combine(chunk, probe_rows, table.df, build_rows,
+                                build_left)
+        if keep_build:
+            build_rows = table.unmatched()
+            yield self._combine(probe.empty(), np.full(len(build_rows), -1),
+                                table.df, build_rows, build_left)
+
+    def empty(self) -> pd.DataFrame:
+        no_rows = np.zeros(0, int)
+        return self._combine(self.left.empty(), no_rows, self.right.empty(),
+                             no_rows, False)
+
+    def compacted(self) -> PlanNode:
+        return self.with_children(self.left.compacted(),
+                                  self.right.compacted())
+
+    def estimate_rows(self) -> int:
+        return max(self.left.estimate_rows(), self.right.estimate_rows())
+
+    def _combine(self, probe: pd.DataFrame, probe_rows: np.ndarray,
+                 build: pd.DataFrame, build_rows: np.ndarray,
+                 build_left: bool) -> pd.DataFrame:
+        if build_left:
+            left, left_rows, right, right_rows = \
+                build, build_rows, probe, probe_rows
+        else:
+            left, left_rows, right, right_rows = \
+                probe, probe_rows, build, build_rows
+
+        columns = join.take(left, left_rows, self.how == "outer")
+        if self.how == "outer":
+            right_keys = join.take(right.iloc[:, self.right_keys],
+                                   right_rows, True)
+            missing = left_rows < 0
+            for k, values in zip(self.left_keys, right_keys):
+                columns[k] = columns[k].mask(missing, values)
+        columns += join.take(right.iloc[:, self.right_values], right_rows,
+                             self.how != "inner")
+        return pd.concat(columns, axis=1).set_axis(self.columns, axis=1)
+
+    def __str__(self):
+        return "{0} join of {1} and {2}".format(self.how, self.left,
+                                                self.right)
+
+
+# Optimizer
+##############################################################################
+
+def optimize(node: PlanNode) -> PlanNode:
+    """Equivalent plan that reads less from the scans.
+
+    Consecutive projections are fused, and projections and filters are
+    pushed down into the scans, so only the columns used by the operations
+    above them are parsed and rows are filtered chunk by chunk as they are
+    read. Columns that no operation uses are dropped as early as possible.
+    """
+    if isinstance(node, ProjectNode):
+        return _project(optimize(node.child), node.indexes)
+    elif isinstance(node, FilterNode):
+        return _filter(optimize(node.child), node.predicate)
+    elif isinstance(node, AggregateNode):
+        used = sorted(set(node.keys + [p for p, _ in node.aggregations]))
+        child = optimize(node.child)
+        if used != list(range(len(child.columns))):
+            child = _project(child, used)
+        index = {p: i for i, p in enumerate(used)}
+        return AggregateNode(child, [index[k] for k in node.keys],
+                             [(index[p], f) for p, f in node.aggregations])
+    elif isinstance(node, JoinNode):
+        return node.with_children(optimize(node.left), optimize(node.right))
+    elif isinstance(node, UnaryNode):
+        return node.with_child(optimize(node.child))
+    return node
+
+
+def _project(child: PlanNode, indexes: [int]) -> PlanNode:
+    if indexes == list(range(len(child.columns))):
+        return child
+    elif isinstance(child, ProjectNode):
+        return _project(child.child, [child.indexes[i] for i in indexes])
+    elif isinstance(child, ScanNode) and child.predicate is None:
+        return ScanNode(child.scan.project(indexes))
+    elif isinstance(child, (ScanNode, FilterNode)):
+        # Keep the columns used by the predicate below the projection
+        used = sorted(set(indexes) | set(child.predicate.positions))
+        if len(used) == len(child.columns):
+            return ProjectNode(child, indexes)
+        index = {p: i for i, p in enumerate(used)}
+        if isinstance(child, ScanNode):
+            inner = ScanNode(child.scan.project(used))
+        else:
+            inner = _project(child.child, used)
+        return _project(_filter(inner, child.predicate.remap(index)),
+                        [index[i] for i in indexes])
+    elif isinstance(child, JoinNode):
+        return _project_join(child, indexes)
+    return ProjectNode(child, indexes)
+
+
+def _project_join(child: 'JoinNode', indexes: [int]) -> PlanNode:
+    # Read only the keys and the projected columns of each side
+    n_left = len(child.left.columns)
+    right_values = child.right_values
+    left_used = sorted(set(child.left_keys) |
+                       set(i for i in indexes if i < n_left))
+    right_used = sorted(set(child.right_keys) | set(
+        right_values[i - n_left] for i in indexes if i >= n_left))
+    if len(left_used) == n_left and \
+            len(right_used) == len(child.right.columns):
+        return ProjectNode(child, indexes)
+
+    left_index = {p: i for i, p in enumerate(left_used)}
+    right_index = {p: i for i, p in enumerate(right_used)}
+    right_keys = [right_index[k] for k in child.right_keys]
+    # Positions in the join of the columns kept, which keep their names
+    # even when the other side no longer has a column with the same one
+    kept = left_used + [n_left + right_values.index(p) for p in right_used
+                        if p not in child.right_keys]
+    columns = child.columns
+    node = JoinNode(_project(child.left, left_used),
+                    _project(child.right, right_used),
+                    [left_index[k] for k in child.left_keys], right_keys,
+                    child.how, [columns[i] for i in kept])
+    positions = {p: i for i, p in enumerate(kept)}
+    return _project(node, [positions[i] for i in indexes])
+
+
+def _filter(child: PlanNode, predicate: Predicate) -> PlanNode:
+    if isinstance(child, ScanNode):
+        if child.predicate is not None:
+            predicate = child.predicate.conjunction(predicate)
+        return ScanNode(child.scan, predicate)
+    elif isinstance(child, FilterNode):
+        return _filter(child.child, child.predicate.conjunction(predicate))
+    elif isinstance(child, JoinNode):
+        # Filter the rows of a side before the join when the predicate only
+        # uses its columns and the join does not add rows with missing
+        # values to that side
+        n_left = len(child.left.columns)
+        if all(p < n_left for p in predicate.positions) and \
+                child.how != "outer":
+            return child.with_children(_filter(child.left, predicate),
+                                       child.right)
+        elif all(p >= n_left for p in predicate.positions) and \
+                child.how == "inner":
+            right_values = child.right_values
+            return child.with_children(child.left, _filter(
+                child.right, predicate.remap(
+                    {p: right_values[p - n_left]
+                     for p in predicate.positions})))
+    return FilterNode(child, predicate)
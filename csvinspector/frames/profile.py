@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+import math
+import typing
+
+import numpy as np
+import pandas as pd
+
+
+#
+##############################################################################
+#
+# Column statistics computed in a single pass over the chunks of a frame,
+# in memory that does not grow with the number of rows. Every summary can
+# be merged with the summary of other chunks, so the chunks can also be
+# summarized in parallel and the results combined in any grouping:
+#
+#   * Counts, minimums and maximums are combined directly.
+#   * Means and variances are kept as counts, means and sums of squared
+#     differences to the mean (Welford), combined with the formula of Chan
+#     et al., which is exact and does not lose precision like sums of
+#     squares do.
+#   * Distinct values are estimated with a HyperLogLog sketch, whose
+#     registers are combined with their maximum.
+#   * Quantiles of numeric columns are estimated with a KLL sketch, whose
+#     levels are concatenated and compacted.
+
+STATISTICS = ["column", "dtype", "count", "nulls", "distinct", "min", "max",
+              "mean", "std", "p25", "p50", "p75"]
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+# Registers of the HyperLogLog sketches, as a power of 2, with a relative
+# error of about 1.04 / sqrt(2 ** HLL_PRECISION)
+HLL_PRECISION = 12
+
+# Distinct values counted exactly, from their hashes, before the count is
+# only estimated
+EXACT_DISTINCT = 4096
+
+# Items kept in the top level of the KLL sketches, with a rank error of
+# about 1.7 / KLL_K
+KLL_K = 200
+
+
+#
+##############################################################################
+
+class HyperLogLog(object):
+    """Approximate number of distinct values.
+
+    The hashes of the first `exact` distinct values are kept too, so small
+    numbers of distinct values are counted exactly, as in HyperLogLog++.
+    """
+
+    # Bits of the hashes used for the rank, the others choose the register
+    _RANK_BITS = 52
+
+    def __init__(self, precision: int=HLL_PRECISION,
+                 exact: int=EXACT_DISTINCT):
+        self._precision = precision
+        self._registers = np.zeros(2 ** precision, np.uint8)
+        self._exact = exact
+        self._hashes = np.zeros(0, np.uint64)
+
+    def add(self, values: pd.Series):
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        if self._hashes is not None:
+            self._add_hashes(pd.unique(hashes))
+        registers = (hashes >> np.uint64(64 - self._precision)) \
+            .astype(np.intp)
+        # The position of the first bit set, exact as the bits fit a double
+        rest = (hashes & np.uint64(2 ** self._RANK_BITS - 1)) \
+            .astype(np.float64)
+        ranks = self._RANK_BITS + 1 - np.frexp(rest)[1]
+        np.maximum.at(self._registers, registers, ranks.astype(np.uint8))
+
+    def merge(self, other: 'HyperLogLog'):
+        np.maximum(self._registers, other._registers, out=self._registers)
+        if other._hashes is None:
+            self._hashes = None
+        else:
+            self._add_hashes(other._hashes)
+
+    def estimate(self) -> int:
+        if self._hashes is not None:
+            return len(self._hashes)
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(
+            np.ldexp(1.0, -self._registers.astype(int)))
+        zeros = np.count_nonzero(self._registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for few values
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def _add_hashes(self, hashes: np.ndarray):
+        if self._hashes is None or len(hashes) > self._exact:
+            self._hashes = None
+        else:
+            self._hashes = np.union1d(self._hashes, hashes)
+            if len(self._hashes) > self._exact:
+                self._hashes = None
+
+
+class KllSketch(object):
+    """Approximate quantiles of numbers, from a KLL sketch (Karnin, Lang
+    and Liberty).
+
+    Items at level h stand for 2 ** h numbers. A level with more items
+    than its capacity is compacted: its items are sorted and every other
+    one, starting at random at the first or the second, is promoted to the
+    next level. Lower levels have smaller capacities, so the sketch keeps
+    O(k) items whatever the number of values added.
+    """
+
+    def __init__(self, k: int=KLL_K, seed: int=None):
+        self._k = k
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, values: np.ndarray):
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compact()
+
+    def merge(self, other: 'KllSketch'):
+        for h, items in enumerate(other._levels):
+            if h == len(self._levels):
+                self._levels.append(items)
+            else:
+                self._levels[h] = np.concatenate([self._levels[h], items])
+        self._compact()
+
+    def quantiles(self, fractions: typing.Sequence[float]) -> [float]:
+        items = np.concatenate(self._levels)
+        if not len(items):
+            return [math.nan] * len(fractions)
+        weights = np.concatenate([np.full(len(items), 2 ** h) for h, items
+                                  in enumerate(self._levels)])
+        order = np.argsort(items, kind="stable")
+        ranks = np.cumsum(weights[order])
+        positions = np.searchsorted(ranks, np.asarray(fractions) * ranks[-1])
+        return list(items[order][np.minimum(positions, len(items) - 1)])
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self._levels) - h - 1
+        return max(int(math.ceil(self._k * (2 / 3) ** depth)), 2)
+
+    def _compact(self):
+        while True:
+            full = [h for h, items in enumerate(self._levels)
+                    if len(items) > self._capacity(h)]
+            if not full:
+                return
+            h = full[0]
+            if h + 1 == len(self._levels):
+                self._levels.append(np.empty(0))
+            items = np.sort(self._levels[h])
+            # An odd item stays at its level
+            kept = items[:len(items) % 2]
+            promoted = items[len(kept) + self._rng.integers(2)::2]
+            self._levels[h] = kept
+            self._levels[h + 1] = np.concatenate([self._levels[h + 1],
+                                                  promoted])
+
+
+class ColumnProfile(object):
+    """Statistics of the values of a column."""
+
+    def __init__(self):
+        self.dtype = None
+        self.count = 0
+        self.nulls = 0
+        self.minimum = None
+        self.maximum = None
+        # Values of types that cannot be compared
+        self._mixed = False
+        # Moments and quantiles, while all the values are numbers
+        self._numeric = True
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._quantiles = KllSketch()
+        self._distinct = HyperLogLog()
+
+    def add(self, column: pd.Series):
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            column = column.astype(column.dtype.categories.dtype)
+        nulls = int(column.isna().sum())
+        self.nulls += nulls
+        if nulls == len(column):
+            return
+
+        chunk = ColumnProfile()
+        chunk.dtype = str(column.dtype)
+        chunk.count = len(column) - nulls
+        chunk._numeric = pd.api.types.is_numeric_dtype(column.dtype) and \
+            not pd.api.types.is_bool_dtype(column.dtype)
+        if chunk._numeric:
+            numbers = column.to_numpy(np.float64, na_value=np.nan)
+            numbers = numbers[~np.isnan(numbers)]
+            chunk.minimum, chunk.maximum = column.min(), column.max()
+            chunk._mean = numbers.mean()
+            chunk._m2 = float(np.sum((numbers - chunk._mean) ** 2))
+            if self._numeric:
+                self._quantiles.add(numbers)
+            # Integers and floats with the same value hash the same
+            self._distinct.add(pd.Series(numbers))
+        else:
+            # Strings are compared and hashed once per distinct value
+            values = pd.Series(column.unique()).dropna()
+            try:
+                chunk.minimum, chunk.maximum = values.min(), values.max()
+            except TypeError:
+                chunk._mixed = True
+            self._distinct.add(values)
+        self.merge(chunk, nulls=False)
+
+    def merge(self, other: 'ColumnProfile', nulls: bool=True):
+        if nulls:
+            self.nulls += other.nulls
+        if not other.count:
+            return
+        elif not self.count:
+            self.dtype = other.dtype
+        elif self.dtype != other.dtype:
+            # Chunks with missing values read integers as floats
+            self.dtype = "float64" if self._numeric and other._numeric \
+                else "object"
+
+        self._mixed = self._mixed or other._mixed
+        if not self._mixed:
+            try:
+                self.minimum = other.minimum if self.minimum is None \
+                    else min(self.minimum, other.minimum)
+                self.maximum = other.maximum if self.maximum is None \
+                    else max(self.maximum, other.maximum)
+            except TypeError:
+                self._mixed = True
+        if self._mixed:
+            self.minimum = self.maximum = None
+
+        self._numeric = self._numeric and other._numeric
+        if self._numeric:
+            count = self.count + other.count
+            delta = other._mean - self._mean
+            self._m2 += other._m2 + delta ** 2 * self.count * other.count / \
+                count
+            self._mean += delta * other.count / count
+            self._quantiles.merge(other._quantiles)
+        self.count += other.count
+        self._distinct.merge(other._distinct)
+
+    def statistics(self) -> list:
+        numeric = self._numeric and self.count > 0
+        mean = self._mean if numeric else math.nan
+        std = math.sqrt(self._m2 / (self.count - 1)) \
+            if numeric and self.count > 1 else math.nan
+        quantiles = self._quantiles.quantiles(QUANTILES) if numeric \
+            else [math.nan] * len(QUANTILES)
+        return [self.dtype or "", self.count, self.nulls,
+                self._distinct.estimate(), _scalar(self.minimum),
+                _scalar(self.maximum), mean, std] + quantiles
+
+
+class FrameProfile(object):
+    """Statistics of the columns of a frame read in chunks, by position.
+
+    Profiles of different chunks of the same columns can be merged, in any
+    order, to get the statistics of all of them.
+    """
+
+    def __init__(self, n_columns: int):
+        self.columns = [ColumnProfile() for _ in range(n_columns)]
+
+    def add(self, chunk: pd.DataFrame):
+        for i, profile in enumerate(self.columns):
+            profile.add(chunk.iloc[:, i])
+
+    def merge(self, other: 'FrameProfile'):
+        for profile, other_profile in zip(self.columns, other.columns):
+            profile.merge(other_profile)
+
+    def result(self, names: [str]) -> pd.DataFrame:
+        """Frame with a row of STATISTICS per column."""
+        rows = [[name] + profile.statistics()
+                for name, profile in zip(names, self.columns)]
+        df = pd.DataFrame(rows, columns=STATISTICS)
+        for name in ("min", "max"):
+            df[name] = df[name].astype(object)
+        return df
+
+
+def _scalar(value):
+    return value.item() if isinstance(value, np.generic) else value
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import logging
+import os
+import typing
+
+import pandas as pd
+
+from . import compact
+from .colcache import CacheEntry, ColumnCache
+from .memo import FrameMemo, file_key
+from .parallel import read_csv_parallel, reduce_parallel
+
+
+#
+##############################################################################
+
+# Rows parsed at a time when streaming a CSV file
+DEFAULT_CHUNK_SIZE = 100000
+
+# Bytes read from the start of a file to estimate its number of rows
+ESTIMATE_SAMPLE_BYTES = 64 * 1024
+
+# Variant of the frames memoized by compact scans
+COMPACT_VARIANT = "compact"
+
+_log = logging.getLogger("scan")
+
+
+#
+##############################################################################
+
+class CsvScan(object):
+    """Lazy description of the rows of a CSV file.
+
+    Only the header is read when the scan is created, the rows are parsed
+    in chunks of `chunk_size` rows every time they are iterated, so
+    operations that consume the chunks one at a time, like counting rows,
+    run in memory bounded by the chunk size and not by the file size.
+
+    Projections are pushed down into the reader: only the projected
+    columns are parsed, through `usecols`, and each chunk is then
+    reordered to the projected order, repeating columns if needed.
+
+    With a `cache`, the first pass over all the rows parses every column
+    and stores the chunks in the cache, later passes read the chunks from
+    the cache instead of parsing the file. With a `memo`, the frames
+    collected are kept in memory for later scans of the same file.
+
+    With `jobs` greater than one, collecting or reducing a large file that
+    is not cached yet splits it into byte ranges parsed by that many
+    processes.
+
+    A `compact` scan samples the first rows of the file to find the string
+    columns to store as categories or dates, and downcasts the numeric
+    columns, converting the chunks as they are read.
+    """
+
+    def __init__(self, file_path: str, chunk_size: int=DEFAULT_CHUNK_SIZE,
+                 cache: ColumnCache=None, memo: FrameMemo=None, jobs: int=1,
+                 compact: bool=False):
+        self._file_path = file_path
+        self._chunk_size = chunk_size
+        self._cache = cache
+        self._memo = memo
+        self._jobs = jobs
+        self._compact = compact
+        self._plan = None
+        self._header = list(pd.read_csv(file_path, nrows=0).columns)
+        self._positions = None
+        self._usecols = None
+        self._order = None
+
+    @property
+    def file_path(self) -> str:
+        return self._file_path
+
+    @property
+    def header(self) -> [str]:
+        """Names of all the columns of the file."""
+        return self._header
+
+    @property
+    def is_compact(self) -> bool:
+        return self._compact
+
+    @property
+    def columns(self) -> [str]:
+        """Names of the columns of the scanned rows."""
+        if self._positions is None:
+            return self._header
+        return [self._header[p] for p in self._positions]
+
+    def project(self, indexes: typing.Sequence[int]) -> 'CsvScan':
+        """Returns a scan of the columns at `indexes` of this one, which
+        may be negative, repeated or in any order."""
+        positions = list(range(len(self._header))) \
+            if self._positions is None else self._positions
+        try:
+            selected = [positions[i] for i in indexes]
+        except IndexError:
+            raise IndexError("column index out of range for {0} columns"
+                             .format(len(positions)))
+
+        # The reader returns the used columns in file order
+        usecols = sorted(set(selected))
+        scan = copy.copy(self)
+        scan._plan = None
+        scan._positions = selected
+        scan._usecols = usecols
+        if usecols != selected:
+            index = {position: i for i, position in enumerate(usecols)}
+            scan._order = [index[position] for position in selected]
+        else:
+            scan._order = None
+        return scan
+
+    def compacted(self) -> 'CsvScan':
+        """Returns a compact scan of the same columns as this one."""
+        scan = copy.copy(self)
+        scan._compact = True
+        return scan
+
+    def chunks(self) -> typing.Iterator[pd.DataFrame]:
+        for chunk in self._read_chunks():
+            yield self._project_chunk(self._compact_chunk(chunk))
+
+    def head(self, n_rows: int) -> pd.DataFrame:
+        entry = self._cache_entry()
+        if entry is not None and entry.n_rows > 0:
+            chunks, n_read = [], 0
+            for chunk in entry.chunks(self._usecols):
+                chunks.append(chunk)
+                n_read += len(chunk)
+                if n_read >= n_rows:
+                    break
+            return self._project_chunk(self._compact_chunk(
+                pd.concat(chunks).iloc[:n_rows]))
+
+        return self._project_chunk(self._compact_chunk(pd.read_csv(
+            self._file_path, nrows=n_rows, usecols=self._usecols)))
+
+    def count_rows(self) -> int:
+        entry = self._cache_entry()
+        if entry is not None:
+            return entry.n_rows
+        elif self._cache is not None:
+            return sum(len(chunk) for chunk in self._read_chunks())
+
+        # Any single column gives the number of rows
+        with self._reader([0] if self._header else None) as reader:
+            return sum(len(chunk) for chunk in reader)
+
+    def reduce(self, new_accumulator: typing.Callable):
+        """Adds all the chunks to an accumulator created by
+        `new_accumulator`, with add(chunk) and merge(other) methods.
+
+        A large file read by several jobs is split into byte ranges added
+        to an accumulator each, which are then merged.
+        """
+        if self._jobs > 1 and not self._compact and \
+                self._cache_entry() is None:
+            accumulator = reduce_parallel(
+                self._file_path, self._header, self._jobs, self._usecols,
+                self._order, self._chunk_size, new_accumulator)
+            if accumulator is not None:
+                return accumulator
+
+        accumulator = new_accumulator()
+        for chunk in self.chunks():
+            accumulator.add(chunk)
+        return accumulator
+
+    def estimate_rows(self) -> int:
+        """Approximate number of rows, from the size of the file and the
+        length of its first lines, without parsing it."""
+        entry = self._cache_entry()
+        if entry is not None:
+            return entry.n_rows
+
+        with open(self._file_path, "rb") as f:
+            sample = f.read(ESTIMATE_SAMPLE_BYTES)
+        lines = sample.count(b"\n")
+        if len(sample) < ESTIMATE_SAMPLE_BYTES:
+            # The whole file, without the header
+            return max(lines - 1 + (not sample.endswith(b"\n")), 0)
+        return os.path.getsize(self._file_path) * lines // len(sample)
+
+    def collect(self) -> pd.DataFrame:
+        """Reads all the rows into a single data frame."""
+        if self._memo is None:
+            return self._project_chunk(self._read_all())
+
+        key = file_key(self._file_path)
+        variant = COMPACT_VARIANT if self._compact else None
+        df = self._memo.get(key, self._usecols, variant)
+        if df is None:
+            df = self._read_all()
+            self._memo.put(key, self._usecols, df, variant)
+        return self._project_chunk(df)
+
+    def _read_chunks(self) -> typing.Iterator[pd.DataFrame]:
+        """Yields the chunks with the used columns in file order."""
+        entry = self._cache_entry()
+        if entry is not None:
+            yield from entry.chunks(self._usecols)
+        elif self._cache is not None:
+            yield from self._parse_and_cache()
+        else:
+            with self._reader(self._usecols) as reader:
+                yield from reader
+
+    def _read_all(self) -> pd.DataFrame:
+        df = None
+        if self._jobs > 1 and self._cache_entry() is None:
+            df = self._read_parallel()
+        if df is not None:
+            chunks = [self._compact_chunk(df)]
+        else:
+            chunks = [self._compact_chunk(c) for c in self._read_chunks()]
+
+        if not chunks:
+            return pd.read_csv(self._file_path, nrows=0,
+                               usecols=self._usecols)
+        elif self._compact:
+            return compact.concat_chunks(chunks)
+        return pd.concat(chunks, ignore_index=True)
+
+    def _read_parallel(self) -> pd.DataFrame or None:
+        if self._cache is None:
+            return read_csv_parallel(self._file_path, self._header,
+                                     self._jobs, self._usecols)
+
+        # The cache stores every column, in chunks like the ones streamed
+        df = read_csv_parallel(self._file_path, self._header, self._jobs)
+        if df is None:
+            return None
+        try:
+            writer = self._cache.writer(self._cache_key(), self._header)
+        except OSError as e:
+            _log.warning("Could not cache '%s': %s", self._file_path, e)
+        else:
+            for start in range(0, len(df), self._chunk_size):
+                writer.add(df.iloc[start:start + self._chunk_size])
+            writer.commit()
+        return df if self._usecols is None else df.iloc[:, self._usecols]
+
+    def _parse_and_cache(self) -> typing.Iterator[pd.DataFrame]:
+        try:
+            writer = self._cache.writer(self._cache_key(), self._header)
+        except OSError as e:
+            _log.warning("Could not cache '%s': %s", self._file_path, e)
+            writer = None
+
+        try:
+            with self._reader(None) as reader:
+                for chunk in reader:
+                    if writer is not None:
+                        writer.add(chunk)
+                    yield chunk if self._usecols is None \
+                        else chunk.iloc[:, self._usecols]
+        except BaseException:
+            # Including the consumer not reading all the chunks
+            if writer is not None:
+                writer.abort()
+            raise
+
+        if writer is not None:
+            writer.commit()
+
+    def _cache_entry(self) -> CacheEntry or None:
+        if self._cache is None:
+            return None
+        return self._cache.load(self._cache_key())
+
+    def _cache_key(self):
+        return self._cache.key(self._file_path, chunk_size=self._chunk_size)
+
+    def _reader(self, usecols: [int] or None):
+        return pd.read_csv(self._file_path, chunksize=self._chunk_size,
+                           usecols=usecols)
+
+    def _compact_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        if not self._compact:
+            return chunk
+        if self._plan is None:
+            self._plan = compact.infer_plan(pd.read_csv(
+                self._file_path, nrows=compact.SAMPLE_ROWS,
+                usecols=self._usecols))
+        return compact.compact_chunk(chunk, self._plan)
+
+    def _project_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        if self._order is None:
+            return chunk
+        return chunk.iloc[:, self._order]
+
+    def __str__(self):
+        return "{0}CSV scan of '{1}' ({2} columns)".format(
+            "compact " if self._compact else "", self._file_path,
+            len(self.columns))
@@ -1,20 +1,26 @@
 # -*- coding: utf-8 -*-
 
 import logging
+import os
 import readline  # TODO: Check if it works on Mac and Windows
+import sys
+import time
 
 from . import VERSION_STR
+from .frames.memo import FrameMemo
 from .lang.base import SExpression
 from .lang.exceptions import EvaluationException
 from .lang.environment import Environment
-from .lang.lexer import FileLexer, StrLexer, LexerException
+from .lang.lexer import FileLexer, StrLexer, StreamLexer, LexerException
 from .lang.parser import Parser, ParserException
 from .lang.symbol import SYM_NIL
+from .scriptcache import ScriptCache
 
 
 #
 ##############################################################################
 
+CACHE_CMD = ":cache"
 EXIT_CMD = ":exit"
 HELP_CMD = ":help"
 INFO_CMD = ":info"
@@ -26,13 +32,41 @@ _log = logging.getLogger('repl')
 #
 ##############################################################################
 
-def run_file(env: Environment, file_path: str):
+def evaluate(s_expr: SExpression, env: Environment) -> SExpression:
+    """Evaluates a top-level form."""
+    return s_expr.eval(env)
+
+
+def run_file(env: Environment, file_path: str, cache: ScriptCache=None):
     try:
-        lexer = FileLexer(file_path=file_path)
-        p = Parser(lexer)
-        while p.has_next():
-            s_expr = p.parse_next()
-            _ = s_expr.eval(env)
+        if cache is not None:
+            key = cache.key(file_path)
+            start = time.perf_counter()
+            cached = cache.load(key)
+            if cached is not None:
+                forms, parse_seconds = cached
+                load_seconds = time.perf_counter() - start
+                _log.info("Loaded %d forms of '%s' from cache in %.1f ms,"
+                          " %.1f ms faster than parsing them", len(forms),
+                          file_path, 1000 * load_seconds,
+                          1000 * (parse_seconds - load_seconds))
+                for s_expr in forms:
+                    _ = evaluate(s_expr, env)
+                return
+
+        forms, parse_seconds = [], 0.0
+        with FileLexer(file_path=file_path, use_mmap=True) as lexer:
+            p = Parser(lexer)
+            while p.has_next():
+                start = time.perf_counter()
+                s_expr = p.parse_next()
+                parse_seconds += time.perf_counter() - start
+                if cache is not None:
+                    forms.append(s_expr)
+                _ = evaluate(s_expr, env)
+
+        if cache is not None:
+            cache.store(key, forms, parse_seconds)
     except IOError as e:
         _log.critical(e)
     except (LexerException, ParserException) as e:
@@ -41,10 +75,48 @@ def run_file(env: Environment, file_path: str):
         _log.error("Evaluation error: %s", str(e))
 
 
+def run_stream(env: Environment, stream):
+    """Evaluates the forms read from `stream` as soon as each one is
+    complete.
+
+    Errors are logged and the following forms still run, since the stream
+    usually feeds a long-lived process: after a lexer or parser error the
+    rest of the line is skipped. Output is flushed after every top-level
+    form, so a slow reader blocks the evaluation instead of letting output
+    pile up, and the loop stops if the reader goes away.
+    """
+    p = Parser(StreamLexer(stream))
+    skip_line = False
+    try:
+        while True:
+            try:
+                if skip_line:
+                    skip_line = False
+                    p.skip_line()
+                if not p.has_next():
+                    break
+                s_expr = p.parse_next()
+            except (LexerException, ParserException) as e:
+                _log.error("Lexer/Parser error: %s", str(e))
+                skip_line = True
+                continue
+
+            try:
+                _ = evaluate(s_expr, env)
+            except EvaluationException as e:
+                _log.error("Evaluation error: %s", str(e))
+            sys.stdout.flush()
+    except BrokenPipeError:
+        _log.info("Output closed, stopping")
+        # Prevent another BrokenPipeError when flushing at exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+
 #
 ##############################################################################
 
-def run_repl(env: Environment):
+def run_repl(env: Environment, frame_memo: FrameMemo=None):
     show_banner()
 
     # TODO: Completion of language words
@@ -59,6 +131,8 @@ def run_repl(env: Environment):
             process_input_and_show_info(input_str[len(INFO_CMD):], env)
         elif VERSION_CMD == input_str:
             print(VERSION_STR)
+        elif CACHE_CMD == input_str:
+            show_cache_stats(frame_memo)
         else:
             process_input(input_str, env, show_result=True)
 
@@ -77,6 +151,22 @@ def show_banner():
     print("")
 
 
+def show_cache_stats(frame_memo: FrameMemo or None):
+    if frame_memo is None:
+        print("The data frame cache is disabled")
+        return
+
+    stats = frame_memo.stats()
+    lookups = stats.hits + stats.misses
+    print("Data frame cache:")
+    print("\t* {0} frames, {1:.1f} of {2:.1f} MiB".format(
+        stats.entries, stats.resident_bytes / 2 ** 20,
+        stats.max_bytes / 2 ** 20))
+    print("\t* {0} hits, {1} misses ({2:.0%} hit rate), {3} evictions".format(
+        stats.hits, stats.misses, stats.hits / lookups if lookups else 0,
+        stats.evictions))
+
+
 def show_help():
     print("This interpreter uses a lisp like syntax, some expressions you")
     print("can play with to get used to it are:")
@@ -90,6 +180,8 @@ def show_help():
     print("\t* {0}: prints information of any expression".format(INFO_CMD))
     print("\t* {0}: prints this message".format(HELP_CMD))
     print("\t* {0}: prints the system version".format(VERSION_CMD))
+    print("\t* {0}: prints the data frame cache statistics".format(
+        CACHE_CMD))
 
 
 def read_input():
@@ -130,9 +222,10 @@ def process_input(text: str, env: Environment, show_result: bool) \
         result = SYM_NIL
         while p.has_next():
             s_expr = p.parse_next()
-            result = s_expr.eval(env)
-        if show_result and SYM_NIL != result:
-            print(">>>>>", result)
+            result = evaluate(s_expr, env)
+        if show_result and result is not SYM_NIL:
+            # Lazy data frames are computed, and may fail, when formatted
+            print(">>>>>", str(result))
         return result
     except (EvaluationException, LexerException,
             ParserException) as e:
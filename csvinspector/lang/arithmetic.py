@@ -1,11 +1,22 @@
 # -*- coding: utf-8 -*-
 
-from .types import BaseNumber, Integer, Real
+import functools
+import math
+import operator
+import typing
+
+import numpy as np
+import pandas as pd
+
+from .exceptions import ArgumentsException, EvaluationException
+from .types import BaseNumber, DataFrame, Integer, Real
 
 
 #
 ##############################################################################
 
+Operand = typing.Union[BaseNumber, DataFrame]
+
 _BINARY_RESULT_TYPE = {(Integer, Integer): Integer,
                        (Integer, Real): Real,
                        (Real, Integer): Real,
@@ -14,27 +25,155 @@ _BINARY_RESULT_TYPE = {(Integer, Integer): Integer,
 
 #
 ##############################################################################
+#
+# Data frames with a single column are operated element-wise by pandas,
+# numbers being broadcast to every row. The result is a new single-column
+# data frame. Column division is always the true division.
 
-def add(op1: BaseNumber, op2: BaseNumber) -> BaseNumber:
+def add(op1: Operand, op2: Operand) -> Operand:
     types = (type(op1), type(op2))
+    if DataFrame in types:
+        return _column_fold(operator.add, "+", (op1, op2))
     return _BINARY_RESULT_TYPE[types](op1.value + op2.value)
 
 
-def subtract(op1: BaseNumber, op2: BaseNumber) -> BaseNumber:
+def subtract(op1: Operand, op2: Operand) -> Operand:
     types = (type(op1), type(op2))
+    if DataFrame in types:
+        return _column_fold(operator.sub, "-", (op1, op2))
     return _BINARY_RESULT_TYPE[types](op1.value - op2.value)
 
 
-def multiply(op1: BaseNumber, op2: BaseNumber) -> BaseNumber:
+def multiply(op1: Operand, op2: Operand) -> Operand:
     types = (type(op1), type(op2))
+    if DataFrame in types:
+        return _column_fold(operator.mul, "*", (op1, op2))
     return _BINARY_RESULT_TYPE[types](op1.value * op2.value)
 
 
-def divide(op1: BaseNumber, op2: BaseNumber) -> BaseNumber:
+def divide(op1: Operand, op2: Operand) -> Operand:
     types = (type(op1), type(op2))
+    if DataFrame in types:
+        return _column_fold(operator.truediv, "/", (op1, op2))
     return _BINARY_RESULT_TYPE[types](op1.value / op2.value)
 
 
-def power(op1: BaseNumber, op2: BaseNumber) -> BaseNumber:
+def power(op1: Operand, op2: Operand) -> Operand:
     types = (type(op1), type(op2))
+    if DataFrame in types:
+        return _column_fold(operator.pow, "^", (op1, op2))
     return _BINARY_RESULT_TYPE[types](op1.value ** op2.value)
+
+
+# Variadic operations
+##############################################################################
+#
+# The variadic versions unbox all the operands once, reduce the raw values
+# and box only the final result, which is an Integer if every operand is
+# an Integer and a Real otherwise, like folding the binary operations.
+
+def add_all(ops: typing.Sequence[Operand]) -> Operand:
+    types = set(map(type, ops))
+    if DataFrame in types:
+        return _column_fold(operator.add, "+", ops)
+    return _box(sum([op.value for op in ops]), Real not in types)
+
+
+def subtract_all(ops: typing.Sequence[Operand]) -> Operand:
+    if not ops:
+        return Integer(0)
+
+    types = set(map(type, ops))
+    if DataFrame in types:
+        return _column_fold(operator.sub, "-", ops)
+
+    values = [op.value for op in ops]
+    if Real not in types:
+        return Integer(values[0] - sum(values[1:]))
+
+    result = values[0]
+    for value in values[1:]:
+        result -= value
+    return Real(result)
+
+
+def multiply_all(ops: typing.Sequence[Operand]) -> Operand:
+    types = set(map(type, ops))
+    if DataFrame in types:
+        return _column_fold(operator.mul, "*", ops)
+    return _box(math.prod([op.value for op in ops]), Real not in types)
+
+
+def divide_all(ops: typing.Sequence[Operand]) -> Operand:
+    """Divides the first operand by the rest of them, the result of each
+    step is truncated to an integer as long as all the operands seen so far
+    are Integers. Raises ZeroDivisionError when dividing numbers by 0."""
+    if not ops:
+        return Integer(1)
+    elif DataFrame in map(type, ops):
+        return _column_fold(operator.truediv, "/", ops)
+
+    result = ops[0].value
+    integers = type(ops[0]) is Integer
+    for op in ops[1:]:
+        if integers and type(op) is Integer:
+            result = int(result / op.value)
+        else:
+            integers = False
+            result = result / op.value
+    return _box(result, integers)
+
+
+def _box(value: int or float, integer: bool) -> BaseNumber:
+    return Integer(value) if integer else Real(value)
+
+
+# Column operations
+##############################################################################
+
+def _column_fold(op: typing.Callable, symbol: str,
+                 ops: typing.Sequence[Operand]) -> DataFrame:
+    """Folds `ops` with the vectorized operation `op`, the resulting column
+    is named after the operation, e.g. 'price * qty'. Columns are combined
+    row by row, by position, and must have the same length."""
+    values, labels, lengths = [], [], set()
+    for operand in ops:
+        if type(operand) is DataFrame:
+            column = _single_column(operand)
+            values.append(column.reset_index(drop=True))
+            labels.append(str(column.name))
+            lengths.add(len(column))
+        else:
+            values.append(operand.value)
+            labels.append(str(operand.value))
+    if len(lengths) > 1:
+        raise EvaluationException(
+            "Cannot apply {0} to columns of different lengths: {1}".format(
+                symbol, ", ".join(map(str, sorted(lengths)))))
+
+    try:
+        result = functools.reduce(op, values)
+    except (TypeError, OverflowError) as e:
+        raise EvaluationException("Cannot apply {0} to the columns: {1}"
+                                  .format(symbol, e))
+    name = " {0} ".format(symbol).join(labels)
+    return DataFrame(pd.DataFrame({name: result}))
+
+
+def _single_column(df: DataFrame) -> pd.Series:
+    n_columns = len(df.columns)
+    if n_columns != 1:
+        raise ArgumentsException("Arithmetic expected data frames with a"
+                                 " single column but got {0} columns".format(
+                                  n_columns))
+    return _widen(df.data_frame.iloc[:, 0])
+
+
+def _widen(column: pd.Series) -> pd.Series:
+    # Compact frames downcast numbers to the narrowest type holding their
+    # values, results could overflow it or lose precision
+    dtype = column.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iuf" and \
+            dtype.itemsize < 8:
+        return column.astype(np.float64 if dtype.kind == "f" else np.int64)
+    return column
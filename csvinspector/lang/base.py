@@ -2,8 +2,6 @@
 
 import abc
 
-from .exceptions import SymbolLockedException
-
 
 # Interfaces
 ##############################################################################
@@ -11,6 +9,8 @@ from .exceptions import SymbolLockedException
 
 class SExpression(metaclass=abc.ABCMeta):
 
+    __slots__ = ()
+
     @property
     @abc.abstractmethod
     def info(self) -> str:
@@ -28,6 +28,8 @@ class SExpression(metaclass=abc.ABCMeta):
 
 class CallableSExpression(SExpression):
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def process_arguments(self, args: SExpression,
                           env: 'Environment') -> SExpression:
@@ -49,16 +51,18 @@ class Environment(metaclass=abc.ABCMeta):
         def lock(self):
             self._env.lock(self._sym)
 
-    def __init__(self):
-        self._locked = set()
+    class Slot(object):
+        """Storage of a binding, shared by everything that resolved it."""
 
-    def lock(self, symbol: SExpression):
-        self._locked.add(symbol)
+        __slots__ = ('value', 'locked')
 
-    def check_locked(self, symbol: SExpression):
-        if symbol in self._locked:
-            raise SymbolLockedException("Symbol {0} cannot be defined".format(
-                symbol))
+        def __init__(self, value: SExpression):
+            self.value = value
+            self.locked = False
+
+    @abc.abstractclassmethod
+    def lock(self, symbol: SExpression):
+        raise NotImplementedError("Abstract method")
 
     @abc.abstractclassmethod
     def bind(self, symbol: SExpression, value: SExpression) \
@@ -74,6 +78,16 @@ class Environment(metaclass=abc.ABCMeta):
     def find(self, symbol: SExpression) -> SExpression:
         raise NotImplementedError("Abstract method")
 
+    @abc.abstractclassmethod
+    def find_slot(self, symbol: SExpression) -> Slot:
+        raise NotImplementedError("Abstract method")
+
+    @abc.abstractclassmethod
+    def is_constant(self, symbol: SExpression) -> bool:
+        """Whether finding `symbol` from this environment will always
+        return the same value."""
+        raise NotImplementedError("Abstract method")
+
     @abc.abstractclassmethod
     def extend(self) -> 'Environment':
         raise NotImplementedError("Abstract method")
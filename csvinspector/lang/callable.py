@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import abc
 import typing
 
+from . import listops
 from .base import CallableSExpression, Environment, SExpression
 from .exceptions import EvaluationException
+from .signature import Signature
 from .symbol import SYM_NIL
 from .types import ConsCell
 
@@ -26,9 +29,9 @@ class Function(CallableSExpression):
 
     def process_arguments(self, args: SExpression,
                           env: Environment) -> SExpression:
-        if SYM_NIL == args:
+        if args is SYM_NIL:
             return args
-        if isinstance(args, ConsCell):
+        if type(args) is ConsCell:
             cc_args = typing.cast(ConsCell, args)
             head = cc_args.car.eval(env)
             tail = self.process_arguments(cc_args.cdr, env)
@@ -36,6 +39,15 @@ class Function(CallableSExpression):
 
         raise EvaluationException("Arguments must be NIL or a ConsCell")
 
+    def call(self, args: typing.Sequence[SExpression],
+             env: Environment) -> SExpression:
+        """Applies the function to a sequence of evaluated arguments.
+
+        Functions implemented over cons lists get the arguments converted
+        by this adapter, VectorFunction overrides it to avoid the list.
+        """
+        return self.apply(listops.from_list(args), env)
+
     def eval(self, env: Environment) -> SExpression:
         return self
 
@@ -43,6 +55,30 @@ class Function(CallableSExpression):
         return "<function {0}>".format(self._name)
 
 
+class VectorFunction(Function):
+    """Function implemented over a tuple of evaluated arguments.
+
+    Subclasses declare how they must be called through the `signature`
+    class attribute. call() checks the arguments against it once, before
+    handing them to apply_vector().
+    """
+
+    signature = Signature(rest=SExpression)
+
+    def apply(self, args: SExpression, env: Environment) -> SExpression:
+        return self.call(tuple(listops.iterate(args)), env)
+
+    def call(self, args: typing.Sequence[SExpression],
+             env: Environment) -> SExpression:
+        self.signature.check(self._name, args)
+        return self.apply_vector(args, env)
+
+    @abc.abstractmethod
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        raise NotImplementedError("Abstract method")
+
+
 class Special(CallableSExpression):
 
     def __init__(self, name):
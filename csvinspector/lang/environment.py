@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from .base import Environment, SExpression
-from .exceptions import SymbolNotDefinedException
+from .exceptions import SymbolLockedException, SymbolNotDefinedException
 
 
 # Nested && Null Environments
@@ -16,9 +16,11 @@ class NullEnvironment(Environment):
     """
 
     def __init__(self, child_env: Environment):
-        super().__init__()
         self._child_env = child_env
 
+    def lock(self, symbol: SExpression):
+        raise NotImplementedError("NullEnvironment cannot lock symbols")
+
     def bind(self, symbol: SExpression, value: SExpression) \
             -> Environment.BindSymbolHandler:
         raise NotImplementedError("NullEnvironment cannot bind symbols")
@@ -31,21 +33,59 @@ class NullEnvironment(Environment):
         raise SymbolNotDefinedException(
             "Symbol {0} is not defined".format(symbol))
 
+    def find_slot(self, symbol: SExpression) -> Environment.Slot:
+        raise SymbolNotDefinedException(
+            "Symbol {0} is not defined".format(symbol))
+
+    def is_constant(self, symbol: SExpression) -> bool:
+        return False
+
     def extend(self) -> Environment:
         raise NotImplementedError("NullEnvironment is not extensible")
 
 
 class NestedEnvironment(Environment):
+    """Environment that binds symbols to slots and delegates the symbols
+    it does not bind to its parent.
+
+    Symbols locked in the outermost environment, like the primitives, are
+    also registered in a table shared by all the environments nested in
+    it. They are found with a single lookup from any depth and cannot be
+    bound again anywhere.
+    """
 
     def __init__(self, parent_env: Environment=None):
-        super().__init__()
         self._parent_env = parent_env or NullEnvironment(self)
-        self._mapped_symbols = {}
+        self._slots = {}
+        if isinstance(parent_env, NestedEnvironment):
+            self._constants = parent_env._constants
+        else:
+            self._constants = {}
+        self._is_outermost = parent_env is None
+
+    def lock(self, symbol: SExpression):
+        slot = self._slots[symbol]
+        slot.locked = True
+        if self._is_outermost:
+            self._constants[symbol] = slot
+
+    def check_locked(self, symbol: SExpression):
+        slot = self._slots.get(symbol)
+        if symbol in self._constants or slot is not None and slot.locked:
+            raise SymbolLockedException("Symbol {0} cannot be defined".format(
+                symbol))
 
     def bind(self, symbol: SExpression, value: SExpression) \
             -> Environment.BindSymbolHandler:
-        self.check_locked(symbol)
-        self._mapped_symbols[symbol] = value
+        slot = self._slots.get(symbol)
+        if slot is None:
+            if symbol in self._constants:
+                self.check_locked(symbol)
+            self._slots[symbol] = Environment.Slot(value)
+        elif slot.locked:
+            self.check_locked(symbol)
+        else:
+            slot.value = value
         return Environment.BindSymbolHandler(self, symbol)
 
     def bind_global(self, symbol: SExpression, value: SExpression) \
@@ -53,10 +93,24 @@ class NestedEnvironment(Environment):
         return self._parent_env.bind_global(symbol, value)
 
     def find(self, symbol: SExpression) -> SExpression:
-        if symbol in self._mapped_symbols:
-            return self._mapped_symbols[symbol]
-
-        return self._parent_env.find(symbol)
+        return self.find_slot(symbol).value
+
+    def find_slot(self, symbol: SExpression) -> Environment.Slot:
+        slot = self._constants.get(symbol)
+        if slot is not None:
+            return slot
+
+        env = self
+        while isinstance(env, NestedEnvironment):
+            slot = env._slots.get(symbol)
+            if slot is not None:
+                return slot
+            env = env._parent_env
+        return env.find_slot(symbol)
+
+    def is_constant(self, symbol: SExpression) -> bool:
+        slot = self._constants.get(symbol) or self._slots.get(symbol)
+        return slot is not None and slot.locked
 
     def extend(self) -> Environment:
         return NestedEnvironment(self)
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
-import abc
+import codecs
 import collections
 import enum
+import io
+import mmap
+import re
 
 from .exceptions import LexerException
 
@@ -46,151 +49,179 @@ def new_string(text: str) -> Token:
     return Token(TokenType.STRING, text)
 
 
-#
+# Token patterns
 ##############################################################################
 
-_NUM_SIGNS = frozenset(['-', '+'])
-OPERANDS = frozenset(['=', '+', '-', '*', '/', '^', '.', '$'])
+OPERANDS = frozenset(['=', '+', '-', '*', '/', '^', '.', '$', '<', '>', '!'])
+
+# One compiled pattern recognises every token, including the whitespace in
+# front of it, so the lexer performs a single match call per token.
+#   * Atoms start with a letter or an operand (optionally preceded by a
+#     number sign) and continue with letters, digits or '_'. The
+#     comparison operands '<', '>' and '!' may be followed by '='.
+#   * Numbers are digits with at most one full stop, optionally signed.
+#   * Atoms and numbers must be followed by whitespace, ')' or the end of
+#     the input, anything else is captured by TRAIL and rejected.
+#   * Strings are delimited by '"' and use '\' to escape any character.
+_TOKEN_PATTERN = r"""
+    \s*
+    (?:
+        (?P<LPAREN>\()
+      | (?P<RPAREN>\))
+      | (?:
+            (?P<ATOM>(?:[-+](?!\d)[=+\-*/^.$]?|[<>!]=?|[=*/^.$]|{alpha}){word}*)
+          | (?P<REAL>[-+]?\d+\.\d*)
+          | (?P<INTEGER>[-+]?\d+)
+        )
+        (?P<TRAIL>[^\s)])?
+      | (?P<STRING>"(?:[^"\\]|\\.)*")
+      | (?P<CLINE>\#)
+      | (?P<EOF>\Z)
+    )
+"""
+
+_TOKEN_RE = re.compile(
+    _TOKEN_PATTERN.format(alpha=r"[^\W\d_]", word=r"\w"),
+    re.VERBOSE | re.DOTALL)
+
+# Same grammar over UTF-8 encoded bytes, where every non-ASCII byte is
+# considered part of a letter.
+_BYTES_TOKEN_RE = re.compile(
+    _TOKEN_PATTERN.format(alpha=r"[a-zA-Z\x80-\xff]",
+                          word=r"[\w\x80-\xff]").encode("ascii"),
+    re.VERBOSE | re.DOTALL)
+
+_WHITESPACE_RE = re.compile(r"\s*")
+_BYTES_WHITESPACE_RE = re.compile(br"\s*")
+_ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+
+_FIXED_TOKENS = {"LPAREN": TOKEN_LPAREN,
+                 "RPAREN": TOKEN_RPAREN,
+                 "CLINE": TOKEN_CLINE,
+                 "EOF": TOKEN_EOF}
+
+_TEXT_TOKEN_TYPES = {"ATOM": TokenType.ATOM,
+                     "REAL": TokenType.REAL,
+                     "INTEGER": TokenType.INTEGER}
+
+# Matches that may continue if the buffer is extended with more input
+_OPEN_ENDED = frozenset(["ATOM", "REAL", "INTEGER", "EOF"])
+
+
+#
+##############################################################################
 
+class Lexer(object):
+    """Tokenizer over an in-memory buffer.
 
-class Lexer(metaclass=abc.ABCMeta):
+    Tokens are recognised with a single compiled regular expression that
+    is matched at the current position of the buffer, so the cost per token
+    does not depend on the number of characters it spans.
+    """
 
     EOF = None
 
-    def __init__(self):
-        self._ch = None
+    def __init__(self, text: str):
+        self._text = text
+        self._pos = 0
+        self._token_re = _TOKEN_RE
+        self._whitespace_re = _WHITESPACE_RE
+        self._decode = None
 
     @property
     def current_character(self):
-        return self._ch
+        if self._pos < len(self._text):
+            if self._decode is None:
+                return self._text[self._pos]
+            # A UTF-8 encoded character spans at most 4 bytes
+            raw = self._text[self._pos:self._pos + 4]
+            return raw.decode('utf-8', 'replace')[0]
+        return Lexer.EOF
 
-    @current_character.setter
-    def current_character(self, character):
-        if character is not Lexer.EOF and len(character) != 1:
-            raise ValueError("Only one character is accepted")
-        self._ch = character
-
-    @abc.abstractmethod
     def consume(self):
-        raise NotImplementedError("Abstract method!")
+        if self._pos < len(self._text):
+            self._pos += 1
 
     def is_eof(self):
-        return self._ch is Lexer.EOF
-
-    def is_whitespace(self):
-        return not self.is_eof() and self._ch.isspace()
-
-    def is_alnum(self):
-        return not self.is_eof() and self._ch.isalnum()
-
-    def is_alpha(self):
-        return not self.is_eof() and self._ch.isalpha()
-
-    def is_number(self):
-        return not self.is_eof() and self._ch.isnumeric()
-
-    def is_full_stop(self):
-        return not self.is_eof() and self._ch == '.'
-
-    def is_operand(self):
-        return self._ch in OPERANDS
-
-    def is_number_sign(self):
-        return self._ch in _NUM_SIGNS
+        return self._pos >= len(self._text)
 
     def next_token(self) -> Token:
-        while not self.is_eof():
-            if self._ch.isspace():
-                self.skip_whitespace()
-            elif self._ch == '(':
-                self.consume()
-                return TOKEN_LPAREN
-            elif self._ch == ')':
-                self.consume()
-                return TOKEN_RPAREN
-            elif self._ch == '#':
-                self.consume()
-                return TOKEN_CLINE
-            elif self._ch == '"':
-                return self.parse_string()
-            elif self.is_number_sign():
-                return self.parse_atom_or_number("")
-            elif self.is_alpha() or self.is_operand():
-                return self.parse_atom("")
-            elif self.is_number():
-                return self.parse_number("")
-            else:
-                self.raise_invalid_character()
-
-        return TOKEN_EOF
-
-    def parse_string(self):
-        if self._ch != '"':
-            self.raise_expected_character('"')
-
-        self.consume()
-        buf, escape = "", False
-        while not self.is_eof() and (escape or self._ch != '"'):
-            if escape or self._ch != '\\':
-                buf += self._ch
-                escape = False
-            else:
-                escape = True
-            self.consume()
-
-        if self._ch == '"':
-            self.consume()
-            return new_string(buf)
-
-        self.raise_expected_character('"')
-
-    def parse_atom_or_number(self, buf):
-        if self.is_number_sign():
-            buf += self._ch
-            self.consume()
-
-        if self.is_number():
-            return self.parse_number(buf)
-        else:
-            return self.parse_atom(buf)
-
-    def parse_atom(self, buf):
-        if self.is_operand():
-            buf += self._ch
-            self.consume()
-
-        while self.is_alnum() or self._ch == '_':
-            buf += self._ch
-            self.consume()
-
-        if self.is_eof() or self.is_whitespace() or self._ch == ')':
-            return new_atom(buf)
-
-        self.raise_invalid_character()
-
-    def parse_number(self, buf):
-        is_decimal = False
-        while self.is_number() or (self.is_full_stop() and not is_decimal):
-            if self.is_full_stop():
-                is_decimal = True
-            buf += self._ch
-            self.consume()
-
-        if self.is_eof() or self.is_whitespace() or self._ch == ')':
-            return new_real(buf) if is_decimal else new_integer(buf)
-
-        self.raise_invalid_character()
-
-    def skip_whitespace(self):
-        while self.is_whitespace():
-            self.consume()
+        match = self._token_re.match(self._text, self._pos)
+        while self._may_continue(match) and self._fill():
+            match = self._token_re.match(self._text, self._pos)
+
+        if match is None:
+            self._pos = self._whitespace_re.match(self._text, self._pos).end()
+            self._raise_unexpected_start()
+
+        kind = match.lastgroup
+        self._pos = match.end()
+
+        token = _FIXED_TOKENS.get(kind)
+        if token is not None:
+            return token
+
+        if kind == "TRAIL":
+            self._pos = match.start(kind)
+            self.raise_invalid_character()
+
+        text = match.group(kind)
+        if self._decode is not None:
+            text = self._decode(text)
+
+        if kind == "STRING":
+            text = text[1:-1]
+            if "\\" in text:
+                text = _ESCAPE_RE.sub(r"\1", text)
+            return Token(TokenType.STRING, text)
+
+        return Token(_TEXT_TOKEN_TYPES[kind], text)
+
+    def skip_line(self):
+        """Drops the input up to the end of the current line, to resume
+        after an error."""
+        newline = "\n" if self._decode is None else b"\n"
+        while True:
+            end = self._text.find(newline, self._pos)
+            if end != -1:
+                self._pos = end + 1
+                return
+            self._pos = len(self._text)
+            if not self._fill():
+                return
+
+    def _may_continue(self, match) -> bool:
+        """Whether more input may change the token matched at the end of
+        the buffer."""
+        if match is None:
+            # Only an unterminated string may still become a token, any
+            # other text without a match is invalid whatever follows it
+            start = self._whitespace_re.match(self._text, self._pos).end()
+            return self._text[start:start + 1] in ('"', b'"')
+        return match.end() == len(self._text) and \
+            match.lastgroup in _OPEN_ENDED
+
+    def _fill(self) -> bool:
+        """Extends the buffer with more input, returns False if there is
+        nothing left to read.
+        """
+        return False
 
     def raise_expected_character(self, expected):
+        ch = self.current_character
         raise LexerException("Expected '{0}' but found '{1}'".format(
-            expected, "EOF" if self._ch is Lexer.EOF else self._ch))
+            expected, "EOF" if ch is Lexer.EOF else ch))
 
     def raise_invalid_character(self):
-        raise LexerException("Invalid character '{0}'".format(self._ch))
+        raise LexerException("Invalid character '{0}'".format(
+            self.current_character))
+
+    def _raise_unexpected_start(self):
+        if self.current_character == '"':
+            # An opening quote that never gets closed
+            self._pos = len(self._text)
+            self.raise_expected_character('"')
+        self.raise_invalid_character()
 
 
 #
@@ -199,25 +230,98 @@ class Lexer(metaclass=abc.ABCMeta):
 class StrLexer(Lexer):
 
     def __init__(self, str_input: str):
-        super().__init__()
-        self._input = str_input or " "
-        self._index = 0
-        self.current_character = self._input[self._index]
-
-    def consume(self):
-        self._index += 1
-        self.current_character = self._input[self._index] \
-            if self._index < len(self._input) else Lexer.EOF
-
+        super().__init__(str_input or "")
 
 
 class FileLexer(Lexer):
-
-    def __init__(self, file_path: str):
-        super().__init__()
-        self._input = open(file_path, 'r')
-        self.consume()
-
-    def consume(self):
-        ch = self._input.read(1)
-        self.current_character = ch if ch else Lexer.EOF
+    """Lexer for script files.
+
+    By default the whole file is read into memory. With `use_mmap` the
+    file is memory mapped instead and the mapped bytes are scanned in
+    place, only the text of each token is decoded from UTF-8. The file
+    stays open until `close()` is called, so prefer using the lexer as a
+    context manager.
+    """
+
+    def __init__(self, file_path: str, use_mmap: bool=False):
+        self._file = None
+        self._mmap = None
+        if use_mmap:
+            self._file = open(file_path, 'rb')
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Empty files and special files cannot be mapped
+                self._file.close()
+                self._file = None
+
+        if self._mmap is not None:
+            super().__init__(self._mmap)
+            self._token_re = _BYTES_TOKEN_RE
+            self._whitespace_re = _BYTES_WHITESPACE_RE
+            self._decode = _decode_utf8
+        else:
+            with open(file_path, 'r') as input_file:
+                super().__init__(input_file.read())
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap, self._file = None, None
+            self._text = b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class StreamLexer(Lexer):
+    """Lexer for non-seekable streams such as pipes or the standard input.
+
+    The input is read in chunks of at most `chunk_size` and only when the
+    token being recognised needs more characters, so tokens are available
+    as soon as their text has arrived. Consumed input is dropped from the
+    buffer on every read.
+    """
+
+    def __init__(self, stream, chunk_size: int=64 * 1024):
+        super().__init__("")
+        self._chunk_size = chunk_size
+        self._decoder = None
+        self._exhausted = False
+
+        # Read binary streams with read1(), which returns whatever is
+        # available instead of waiting for a whole chunk
+        stream = getattr(stream, "buffer", stream)
+        if isinstance(stream, io.TextIOBase):
+            self._read = stream.read
+        else:
+            self._read = getattr(stream, "read1", stream.read)
+            self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def _fill(self) -> bool:
+        if self._exhausted:
+            return False
+
+        data = self._read(self._chunk_size)
+        self._exhausted = not data
+        if self._decoder is not None:
+            try:
+                data = self._decoder.decode(data, final=self._exhausted)
+            except UnicodeDecodeError as e:
+                raise LexerException("Invalid UTF-8 sequence: {0}".format(e))
+
+        self._text = self._text[self._pos:] + data
+        self._pos = 0
+        return True
+
+
+def _decode_utf8(raw: bytes) -> str:
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError as e:
+        raise LexerException("Invalid UTF-8 sequence: {0}".format(e))
@@ -36,7 +36,7 @@ def concat(s_expr_list1: SExpression, s_expr_list2: SExpression):
 def iterate(s_expr_list: SExpression, start=0, stop=None):
     i, index = 0, s_expr_list
 
-    while index != SYM_NIL and (stop is None or i < stop):
+    while index is not SYM_NIL and (stop is None or i < stop):
         if i >= start:
             cc_index = typing.cast(ConsCell, index)
             index = cc_index.cdr
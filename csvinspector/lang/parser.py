@@ -1,9 +1,8 @@
 # -*- coding: utf-8 -*-
 
-from . import listops
 from .exceptions import ParserException
-from .lexer import Lexer, TokenType
-from .symbol import Symbol
+from .lexer import Lexer, Token, TokenType
+from .symbol import SYM_NIL, Symbol
 from .types import ConsCell, Integer, Real, String, SExpression
 
 
@@ -11,67 +10,94 @@ from .types import ConsCell, Integer, Real, String, SExpression
 ##############################################################################
 
 class Parser(object):
+    """Builds s-expressions from the tokens of a lexer.
+
+    Lists are parsed iteratively with an explicit stack of the lists that
+    are still open, so the nesting depth of a form is not limited by the
+    Python recursion limit.
+
+    The lookahead token is only requested from the lexer when needed, so
+    parse_next() returns as soon as the last token of a form is read, which
+    matters when the lexer reads from an interactive stream.
+    """
 
     def __init__(self, lexer: Lexer):
         self._lexer = lexer
         self._lookahead = None
-        self._consume()
 
     def has_next(self):
-        return self._lookahead.type is not TokenType.EOF
+        return self._peek().type is not TokenType.EOF
 
     def parse_next(self) -> SExpression:
-        if self._lookahead.type is TokenType.ATOM:
-            return self._atom()
-        elif self._lookahead.type is TokenType.REAL:
-            return self._real()
-        elif self._lookahead.type is TokenType.INTEGER:
-            return self._integer()
-        elif self._lookahead.type is TokenType.STRING:
-            return self._string()
-        elif self._lookahead.type is TokenType.LPAREN:
+        token = self._peek()
+        if token.type is TokenType.LPAREN:
             return self._list()
 
-        raise ParserException("Expected Atom, Real, Integer or List,"
-                              " found {0}".format(self._lookahead.type.name))
-
-    def _atom(self) -> Symbol:
-        self._match(TokenType.ATOM)
-        s_expr = Symbol(self._lookahead.text)
+        s_expr = self._literal(token)
         self._consume()
         return s_expr
 
-    def _real(self) -> Real:
-        self._match(TokenType.REAL)
-        s_expr = Real(float(self._lookahead.text))
-        self._consume()
-        return s_expr
-
-    def _integer(self) -> Integer:
-        self._match(TokenType.INTEGER)
-        s_expr = Integer(int(self._lookahead.text))
-        self._consume()
-        return s_expr
-
-    def _string(self) -> String:
-        self._match(TokenType.STRING)
-        s_expr = String(self._lookahead.text)
-        self._consume()
-        return s_expr
+    def skip_line(self):
+        """Drops the rest of the current line of input, and the form being
+        parsed, to resume parsing after an error."""
+        self._lookahead = None
+        self._lexer.skip_line()
 
     def _list(self) -> ConsCell:
-        elements = []
         self._match_and_consume(TokenType.LPAREN)
-        while self._lookahead.type != TokenType.RPAREN:
-            elements.append(self.parse_next())
-        self._match_and_consume(TokenType.RPAREN)
-        return listops.from_list(elements)
+
+        # Every open list is kept as its first and last cells, new elements
+        # are linked after the last cell as soon as they are parsed
+        open_lists = []
+        head = tail = None
+        while True:
+            token = self._peek()
+            if token.type is TokenType.LPAREN:
+                open_lists.append((head, tail))
+                head = tail = None
+                self._consume()
+                continue
+            elif token.type is TokenType.RPAREN:
+                self._consume()
+                element = SYM_NIL if head is None else head
+                if not open_lists:
+                    return element
+                head, tail = open_lists.pop()
+            else:
+                element = self._literal(token)
+                self._consume()
+
+            cell = ConsCell(element, SYM_NIL)
+            if head is None:
+                head = cell
+            else:
+                tail.cdr = cell
+            tail = cell
+
+    @staticmethod
+    def _literal(token: Token) -> SExpression:
+        if token.type is TokenType.ATOM:
+            return Symbol.intern(token.text)
+        elif token.type is TokenType.INTEGER:
+            return Integer(int(token.text))
+        elif token.type is TokenType.REAL:
+            return Real(float(token.text))
+        elif token.type is TokenType.STRING:
+            return String(token.text)
+
+        raise ParserException("Expected Atom, Real, Integer or List,"
+                              " found {0}".format(token.type.name))
+
+    def _peek(self) -> Token:
+        if self._lookahead is None:
+            self._lookahead = self._lexer.next_token()
+        return self._lookahead
 
     def _consume(self) -> None:
-        self._lookahead = self._lexer.next_token()
+        self._lookahead = None
 
     def _match(self, token_type: TokenType) -> None:
-        if self._lookahead.type is not token_type:
+        if self._peek().type is not token_type:
             raise ParserException('Expected {0}, found {1}'.format(
                 token_type.name, self._lookahead.type.name))
 
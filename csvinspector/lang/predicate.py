@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import operator
+import typing
+
+import numpy as np
+import pandas as pd
+
+from ..frames.plan import Predicate, describe_value, is_condition
+from . import listops
+from .base import Environment, SExpression
+from .exceptions import ArgumentsException, EvaluationException, \
+    SymbolNotDefinedException
+from .symbol import SYM_FALSE, SYM_TRUE, Symbol
+from .types import ConsCell, Integer, Real, String
+
+
+#
+##############################################################################
+#
+# Predicates are compiled once into a tree of closures over whole columns,
+# so evaluating them on a chunk runs a vectorized pandas operation per node
+# of the expression instead of evaluating the expression once per row.
+#
+#   * Symbols naming a column of the frame refer to that column, any
+#     other symbol is evaluated in the environment and must be a number,
+#     a string, true or false.
+#   * Comparisons (= != < <= > >=) take two operands, arithmetic
+#     operations (+ - * /) one or more, 'and' and 'or' one or more
+#     conditions and 'not' or '!' a single one.
+
+VectorExpression = typing.Callable[[typing.Sequence[pd.Series]], typing.Any]
+
+_COMPARISONS = {"=": operator.eq,
+                "!=": operator.ne,
+                "<": operator.lt,
+                "<=": operator.le,
+                ">": operator.gt,
+                ">=": operator.ge}
+
+_ARITHMETIC = {"+": operator.add,
+               "-": operator.sub,
+               "*": operator.mul,
+               "/": operator.truediv}
+
+_LOGICAL = {"and": operator.and_,
+            "or": operator.or_}
+
+_NEGATIONS = frozenset(["not", "!"])
+
+_LITERALS = (Integer, Real, String)
+
+
+#
+##############################################################################
+
+def compile_predicate(s_expr: SExpression, columns: [str],
+                      env: Environment) -> Predicate:
+    """Compiles `s_expr` into a predicate on frames with `columns`."""
+    positions = {}
+    function = _compile(s_expr, columns, positions, env)
+    text = to_text(s_expr)
+
+    def predicate(*values: pd.Series):
+        try:
+            mask = function(values)
+            if not is_condition(mask):
+                raise TypeError("{0} is not a condition".format(
+                    describe_value(mask)))
+            return mask
+        except (TypeError, ValueError) as e:
+            raise EvaluationException("Cannot evaluate {0}: {1}".format(
+                text, e))
+    return Predicate(list(positions), predicate, text)
+
+
+def to_text(s_expr: SExpression) -> str:
+    if type(s_expr) is ConsCell:
+        return "({0})".format(" ".join(to_text(e) for e in s_expr))
+    elif type(s_expr) is String:
+        return '"{0}"'.format(s_expr.value.replace('"', '\\"'))
+    return str(s_expr)
+
+
+def _compile(s_expr: SExpression, columns: [str],
+             positions: typing.Dict[int, int],
+             env: Environment) -> VectorExpression:
+    if type(s_expr) is Symbol:
+        return _compile_symbol(s_expr, columns, positions, env)
+    elif type(s_expr) in _LITERALS:
+        return _constant(s_expr.value)
+    elif type(s_expr) is not ConsCell or type(s_expr.car) is not Symbol:
+        raise ArgumentsException("Invalid condition {0}".format(
+            to_text(s_expr)))
+
+    name = s_expr.car.name
+    operands = [_compile(e, columns, positions, env)
+                for e in listops.iterate(s_expr.cdr)]
+    if name in _COMPARISONS:
+        _check_operands(name, operands, 2, 2)
+        compare = _COMPARISONS[name]
+        left, right = operands
+        return lambda values: compare(left(values), right(values))
+    elif name in _ARITHMETIC or name in _LOGICAL:
+        _check_operands(name, operands, 1)
+        fold = functools.partial(functools.reduce,
+                                 _ARITHMETIC.get(name) or _LOGICAL[name])
+        return lambda values: fold([operand(values) for operand in operands])
+    elif name in _NEGATIONS:
+        _check_operands(name, operands, 1, 1)
+        operand = operands[0]
+        return lambda values: _negate(operand(values))
+
+    raise ArgumentsException("Unknown operation '{0}' in condition {1}"
+                             .format(name, to_text(s_expr)))
+
+
+def _compile_symbol(symbol: Symbol, columns: [str],
+                    positions: typing.Dict[int, int],
+                    env: Environment) -> VectorExpression:
+    if symbol.name in columns:
+        position = columns.index(symbol.name)
+        slot = positions.setdefault(position, len(positions))
+        return operator.itemgetter(slot)
+    elif symbol is SYM_TRUE or symbol is SYM_FALSE:
+        return _constant(symbol is SYM_TRUE)
+
+    try:
+        value = symbol.eval(env)
+    except SymbolNotDefinedException:
+        value = None
+    if type(value) not in _LITERALS:
+        raise ArgumentsException(
+            "'{0}' is not a column nor a number or string".format(symbol))
+    return _constant(value.value)
+
+
+def _negate(value):
+    if isinstance(value, pd.Series) and \
+            pd.api.types.is_bool_dtype(value.dtype):
+        return ~value
+    elif isinstance(value, (bool, np.bool_)):
+        return not value
+    raise TypeError("cannot negate {0}, it is not a condition".format(
+        describe_value(value)))
+
+
+def _constant(value) -> VectorExpression:
+    return lambda values: value
+
+
+def _check_operands(name: str, operands: list, min_operands: int,
+                    max_operands: int=None):
+    if len(operands) < min_operands or \
+            max_operands is not None and len(operands) > max_operands:
+        raise ArgumentsException("'{0}' received {1} operands".format(
+            name, len(operands)))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import typing
+
+from .base import SExpression
+from .exceptions import ArgumentsException
+
+
+#
+##############################################################################
+
+# Upper bound on the argument type combinations remembered per signature,
+# variadic functions could otherwise grow the cache without limit
+MAX_CACHED_TYPES = 256
+
+
+class Signature(object):
+    """Declares the arity and argument types of a function.
+
+    The positional types give the type of each leading argument and `rest`
+    the type of any argument after them, None meaning that no more
+    arguments are accepted. By default all the positional arguments are
+    required, `min_args` allows making the trailing ones optional. Types
+    may also be tuples of types, as in isinstance().
+
+    check() remembers the combinations of argument types it has already
+    accepted, so calling a function again with arguments of the same types
+    costs a single set lookup.
+    """
+
+    def __init__(self, *types: type, rest: type=None, min_args: int=None):
+        self._types = types
+        self._rest = rest
+        self._min_args = len(types) if min_args is None else min_args
+        self._max_args = len(types) if rest is None else None
+        self._accepted = set()
+
+    @property
+    def min_args(self) -> int:
+        return self._min_args
+
+    @property
+    def max_args(self) -> int or None:
+        return self._max_args
+
+    def check(self, name: str, args: typing.Sequence[SExpression]):
+        key = tuple(map(type, args))
+        if key not in self._accepted:
+            self._check_arity(name, len(args))
+            self._check_types(args)
+            if len(self._accepted) < MAX_CACHED_TYPES:
+                self._accepted.add(key)
+
+    def _check_arity(self, name: str, n_args: int):
+        if self._min_args == self._max_args != n_args:
+            raise ArgumentsException("{0} expected {1} but received {2}"
+                                     " arguments".format(
+                                      name, self._min_args, n_args))
+        elif n_args < self._min_args:
+            raise ArgumentsException("{0} expected at least {1} but received"
+                                     " {2} arguments".format(
+                                      name, self._min_args, n_args))
+        elif self._max_args is not None and n_args > self._max_args:
+            raise ArgumentsException("{0} expected at most {1} but received"
+                                     " {2} arguments".format(
+                                      name, self._max_args, n_args))
+
+    def _check_types(self, args: typing.Sequence[SExpression]):
+        n_types = len(self._types)
+        for i, arg in enumerate(args):
+            expected = self._types[i] if i < n_types else self._rest
+            if not isinstance(arg, expected):
+                raise ArgumentsException("Argument index {0} expected type"
+                                         " {1} but got {2}".format(
+                                          i, _type_name(expected),
+                                          type(arg)))
+
+
+def _type_name(expected: type or tuple) -> str:
+    if isinstance(expected, tuple):
+        return " or ".join(map(str, expected))
+    return str(expected)
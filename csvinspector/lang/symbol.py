@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+import threading
+
 from .base import Environment, SExpression
 
 
@@ -7,9 +9,38 @@ from .base import Environment, SExpression
 ##############################################################################
 
 class Symbol(SExpression):
+    """Named atom of the language.
+
+    Symbols are interned: creating a symbol returns the one instance that
+    exists for its name, so symbols compare and hash by identity, which
+    is what dictionary lookups in environments and `is SYM_NIL` checks
+    rely on. Interned symbols are never released.
+    """
+
+    __slots__ = ('_name',)
+
+    _table = {}
+    _table_lock = threading.Lock()
 
-    def __init__(self, name: str):
-        self.name = name
+    def __new__(cls, name: str):
+        symbol = cls._table.get(name)
+        if symbol is None:
+            with cls._table_lock:
+                symbol = cls._table.get(name)
+                if symbol is None:
+                    symbol = super().__new__(cls)
+                    symbol._name = name
+                    cls._table[name] = symbol
+        return symbol
+
+    @classmethod
+    def intern(cls, name: str) -> 'Symbol':
+        """Returns the symbol for `name`, creating it the first time."""
+        return cls._table.get(name) or cls(name)
+
+    @property
+    def name(self) -> str:
+        return self._name
 
     @property
     def info(self) -> str:
@@ -18,11 +49,8 @@ class Symbol(SExpression):
     def eval(self, env: Environment):
         return env.find(self)
 
-    def __eq__(self, other):
-        return isinstance(other, Symbol) and self.name == other.name
-
-    def __hash__(self):
-        return hash(self.name)
+    def __reduce__(self):
+        return Symbol, (self.name,)
 
     def __repr__(self):
         return "Symbol(name={0})".format(self.name)
@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 
 import abc
+import math
 import pandas as pd
 import typing
 
+from ..frames.colcache import ColumnCache
+from ..frames.memo import FrameMemo
+from ..frames.plan import AggregateNode, FilterNode, FrameNode, JoinNode, \
+    PlanNode, Predicate, ProfileNode, ProjectNode, ScanNode, optimize
+from ..frames.scan import CsvScan
 from .base import CallableSExpression, Environment, SExpression
 from .exceptions import EvaluationException
 from .symbol import SYM_NIL
@@ -14,68 +20,110 @@ from .symbol import SYM_NIL
 
 class BaseNumber(metaclass=abc.ABCMeta):
 
+    __slots__ = ()
+
     @property
     @abc.abstractclassmethod
     def value(self):
         raise NotImplementedError("Abstract property")
 
 
+# Instances are immutable, so the most common values are shared instead of
+# allocated every time they are parsed or computed
+_SMALL_INTEGERS_RANGE = range(-5, 257)
+_COMMON_REALS = (-1.0, 0.0, 0.5, 1.0, 2.0, 10.0, 100.0)
+
+
 class Integer(BaseNumber, SExpression):
 
-    def __init__(self, value: int):
-        self._value = int(value)
+    __slots__ = ('_value',)
 
-    @property
-    def info(self) -> str:
-        return "Integer expression with value {0}".format(self._value)
+    _small = ()
+
+    def __new__(cls, value: int):
+        value = int(value)
+        if value in _SMALL_INTEGERS_RANGE and cls._small:
+            return cls._small[value - _SMALL_INTEGERS_RANGE.start]
+        integer = super().__new__(cls)
+        integer._value = value
+        return integer
 
     @property
-    def value(self):
+    def value(self) -> int:
         return self._value
 
+    @property
+    def info(self) -> str:
+        return "Integer expression with value {0}".format(self.value)
+
     def eval(self, env: Environment) -> SExpression:
         return self
 
     def __eq__(self, other):
-        return isinstance(other, Integer) and self.value == other.value
+        return self is other or \
+            (type(other) is Integer and self.value == other.value)
 
     def __hash__(self):
-        return hash(self._value)
+        return hash(self.value)
+
+    def __reduce__(self):
+        return Integer, (self.value,)
 
     def __repr__(self):
-        return "Integer({0})".format(self._value)
+        return "Integer({0})".format(self.value)
 
     def __str__(self):
-        return str(self._value)
+        return str(self.value)
+
+
+Integer._small = tuple(Integer(i) for i in _SMALL_INTEGERS_RANGE)
 
 
 class Real(BaseNumber, SExpression):
 
-    def __init__(self, value: float):
-        self._value = float(value)
+    __slots__ = ('_value',)
 
-    @property
-    def info(self) -> str:
-        return "Real expression with value {0}".format(self._value)
+    _common = {}
+
+    def __new__(cls, value: float):
+        value = float(value)
+        real = cls._common.get(value)
+        # -0.0 is equal to 0.0 but must keep its sign
+        if real is not None and (value or math.copysign(1.0, value) > 0):
+            return real
+        real = super().__new__(cls)
+        real._value = value
+        return real
 
     @property
-    def value(self):
+    def value(self) -> float:
         return self._value
 
+    @property
+    def info(self) -> str:
+        return "Real expression with value {0}".format(self.value)
+
     def eval(self, env: Environment) -> SExpression:
         return self
 
     def __eq__(self, other):
-        return isinstance(other, Real) and self.value == other.value
+        return self is other or \
+            (type(other) is Real and self.value == other.value)
 
     def __hash__(self):
-        return hash(self._value)
+        return hash(self.value)
+
+    def __reduce__(self):
+        return Real, (self.value,)
 
     def __repr__(self):
-        return "Integer({0})".format(self._value)
+        return "Integer({0})".format(self.value)
 
     def __str__(self):
-        return str(self._value)
+        return str(self.value)
+
+
+Real._common = {r: Real(r) for r in _COMMON_REALS}
 
 
 # String
@@ -83,31 +131,30 @@ class Real(BaseNumber, SExpression):
 
 class String(SExpression):
 
+    __slots__ = ('value',)
+
     def __init__(self, value: str):
-        self._value = value
+        self.value = value
 
     @property
     def info(self) -> str:
-        return 'String expression: "{0}"'.format(self._value)
-
-    @property
-    def value(self):
-        return self._value
+        return 'String expression: "{0}"'.format(self.value)
 
     def eval(self, env: Environment) -> SExpression:
         return self
 
     def __eq__(self, other):
-        return isinstance(other, String) and self.value == other.value
+        return self is other or \
+            (type(other) is String and self.value == other.value)
 
     def __hash__(self):
-        return hash(self._value)
+        return hash(self.value)
 
     def __repr__(self):
-        return '"{0}"'.format(self._value)
+        return '"{0}"'.format(self.value)
 
     def __str__(self):
-        return str(self._value)
+        return str(self.value)
 
 
 # ConsCell
@@ -115,28 +162,22 @@ class String(SExpression):
 
 class ConsCell(SExpression):
 
+    __slots__ = ('car', 'cdr')
+
     def __init__(self, car: SExpression, cdr: SExpression):
         #assert isinstance(car, SExpression), "expected SExpression"
         #assert isinstance(cdr, SExpression), "expected SExpression"
-        self._car = car
-        self._cdr = cdr
+        self.car = car
+        self.cdr = cdr
 
     @property
     def info(self) -> str:
         return "ConsCell expression with value {0} that it is {1} the end" \
-               " of a list".format(self._car,
-                                   "" if self._cdr is SYM_NIL else "not")
-
-    @property
-    def car(self) -> SExpression:
-        return self._car
-
-    @property
-    def cdr(self) -> SExpression:
-        return self._cdr
+               " of a list".format(self.car,
+                                   "" if self.cdr is SYM_NIL else "not")
 
     def eval(self, env: Environment):
-        car_eval = self._car.eval(env)
+        car_eval = self.car.eval(env)
         if isinstance(car_eval, CallableSExpression):
             cs_expr = typing.cast(CallableSExpression, car_eval)
             return cs_expr.apply(cs_expr.process_arguments(self.cdr, env), env)
@@ -146,7 +187,7 @@ class ConsCell(SExpression):
                 "s-expression".format(self.car))
 
     def __eq__(self, other):
-        return isinstance(other, ConsCell) and self.car == other.car \
+        return type(other) is ConsCell and self.car == other.car \
                and self.cdr == other.cdr
 
     def __hash__(self):
@@ -154,7 +195,7 @@ class ConsCell(SExpression):
 
     def __iter__(self):
         cons_cell = self
-        while cons_cell != SYM_NIL:
+        while cons_cell is not SYM_NIL:
             yield cons_cell.car
             cons_cell = cons_cell.cdr
 
@@ -170,22 +211,109 @@ class ConsCell(SExpression):
 ##############################################################################
 
 class DataFrame(SExpression):
+    """Binding to a Pandas DataFrame.
+
+    Data frames are lazy: operations on them build a plan of the
+    operations to run, from a scan of a CSV file or a frame in memory, and
+    the plan is optimized and run only when its result is needed, like
+    when printing it, which only computes its first rows. `data_frame`
+    computes all the rows, and force() keeps them in memory.
+    """
+
+    # Rows shown when printing a lazy data frame
+    DISPLAY_ROWS = 10
 
     @staticmethod
-    def from_csv_file(file_path: str):
-        return DataFrame(pd.read_csv(file_path))
+    def from_csv_file(file_path: str, cache: ColumnCache=None,
+                      memo: FrameMemo=None, jobs: int=1,
+                      compact_types: bool=False):
+        return DataFrame(plan=ScanNode(CsvScan(
+            file_path, cache=cache, memo=memo, jobs=jobs,
+            compact=compact_types)))
 
     @property
     def info(self):
         return "Expression that is a binding to a Pandas DataFrame object"
 
-    def __init__(self, df: pd.DataFrame):
+    def __init__(self, df: pd.DataFrame=None, plan: PlanNode=None):
         self._df = df
+        self._plan = plan
+        self._optimized_plan = None
 
     @property
-    def data_frame(self):
+    def is_lazy(self) -> bool:
+        return self._df is None
+
+    @property
+    def plan(self) -> PlanNode:
+        if self._df is None:
+            return self._plan
+        return FrameNode(self._df)
+
+    @property
+    def optimized_plan(self) -> PlanNode:
+        if self._optimized_plan is None:
+            self._optimized_plan = optimize(self.plan)
+        return self._optimized_plan
+
+    @property
+    def data_frame(self) -> pd.DataFrame:
+        if self._df is None:
+            return self.optimized_plan.collect()
         return self._df
 
+    @property
+    def columns(self) -> [str]:
+        return self.plan.columns
+
+    def project(self, indexes: typing.Sequence[int]) -> 'DataFrame':
+        """Data frame with the columns at positions `indexes`."""
+        return DataFrame(plan=ProjectNode(self.plan, indexes))
+
+    def filter(self, predicate: Predicate) -> 'DataFrame':
+        """Data frame with the rows that match `predicate`."""
+        return DataFrame(plan=FilterNode(self.plan, predicate))
+
+    def aggregate(self, keys: typing.Sequence[int],
+                  aggregations: typing.Sequence[typing.Tuple[int, str]]) \
+            -> 'DataFrame':
+        """Data frame with the `aggregations` of each group of rows with
+        the same values in the `keys` columns."""
+        return DataFrame(plan=AggregateNode(self.plan, keys, aggregations))
+
+    def join(self, other: 'DataFrame', left_keys: typing.Sequence[int],
+             right_keys: typing.Sequence[int], how: str="inner") \
+            -> 'DataFrame':
+        """Data frame with the rows of this one and `other` with the same
+        values in the `left_keys` and `right_keys` columns."""
+        return DataFrame(plan=JoinNode(self.plan, other.plan, left_keys,
+                                       right_keys, how))
+
+    def profile(self) -> 'DataFrame':
+        """Data frame with the statistics of each column of this one."""
+        return DataFrame(plan=ProfileNode(self.plan))
+
+    def compacted(self) -> 'DataFrame':
+        """Data frame with categories for low cardinality strings, dates
+        for ISO 8601 strings and downcast numbers."""
+        return DataFrame(plan=self.plan.compacted())
+
+    def force(self) -> 'DataFrame':
+        """Data frame with all the rows computed and kept in memory."""
+        if self._df is None:
+            return DataFrame(self.data_frame)
+        return self
+
+    def head(self, n_rows: int) -> pd.DataFrame:
+        if self._df is None:
+            return self.optimized_plan.head(n_rows)
+        return self._df.head(n_rows)
+
+    def count_rows(self) -> int:
+        if self._df is None:
+            return self.optimized_plan.count_rows()
+        return len(self._df)
+
     def eval(self, env: Environment) -> SExpression:
         return self
 
@@ -196,7 +324,13 @@ class DataFrame(SExpression):
         return hash(self._df)
 
     def __repr__(self):
+        if self._df is None:
+            return "DataFrame({0})".format(self.optimized_plan)
         return repr(self._df)
 
     def __str__(self):
+        if self._df is None:
+            return "{0}\n[at most {1} rows of {2}]".format(
+                self.head(self.DISPLAY_ROWS), self.DISPLAY_ROWS,
+                self.optimized_plan)
         return str(self._df)
@@ -1,17 +1,22 @@
 # -*- coding: utf-8 -*-
 
-import itertools
 import logging
 import typing
 
+from .frames.colcache import ColumnCache
+from .frames import compact, multi
+from .frames.join import JOIN_TYPES
+from .frames.memo import FrameMemo
 from .lang import listops
 from .lang.base import Environment, SExpression
-from .lang.callable import Function, Special
+from .lang.callable import Function, Special, VectorFunction
 from .lang.exceptions import EvaluationException, ArgumentsException
+from .lang.signature import Signature
 from .lang.symbol import SYM_NIL, SYM_FALSE, SYM_TRUE, Symbol
-from .lang.types import BaseNumber, DataFrame, Integer, String
+from .lang.types import BaseNumber, ConsCell, DataFrame, Integer, String
 
 from .lang import arithmetic
+from .lang.predicate import compile_predicate
 
 #
 ##############################################################################
@@ -22,46 +27,50 @@ _log = logging.getLogger("predicates")
 # Basic functions
 ##############################################################################
 
-class FunctionCompose(Function):
+class FunctionCompose(VectorFunction):
 
-    def apply(self, args: SExpression, env: Environment) -> SExpression:
-        check_exact_number_of_arguments(args, 2, self.name)
-        match_types(args, itertools.repeat(Function))
+    signature = Signature(Function, Function)
+
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
 
-        class ComposedFunction(Function):
+        class ComposedFunction(VectorFunction):
 
             def __init__(self, f: Function, g: Function):
                 super().__init__("{0}∘{1}".format(f.name, g.name))
                 self._f = f
                 self._g = g
 
-            def apply(self, a: SExpression, e: Environment) -> SExpression:
-                g_res = self._g.apply(self._g.process_arguments(a, e), e)
-                f_args = listops.from_args(g_res)
-                return self._f.apply(self._g.process_arguments(f_args, e), e)
+            def apply_vector(self, a: typing.Sequence[SExpression],
+                             e: Environment) -> SExpression:
+                return self._f.call((self._g.call(a, e),), e)
 
-        return ComposedFunction(typing.cast(Function, listops.nth(args, 0)),
-                                typing.cast(Function, listops.nth(args, 1)))
+        return ComposedFunction(typing.cast(Function, args[0]),
+                                typing.cast(Function, args[1]))
 
 
-class FunctionPrint(Function):
+class FunctionPrint(VectorFunction):
 
-    def apply(self, args: SExpression, env: Environment) -> SExpression:
-        print(*list(listops.iterate(args)), end="")
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        print(*args, end="")
         return SYM_NIL
 
 
-class FunctionPrintLn(Function):
+class FunctionPrintLn(VectorFunction):
 
-    def apply(self, args: SExpression, env: Environment) -> SExpression:
-        print(*list(listops.iterate(args)))
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        print(*args)
         return SYM_NIL
 
 
 # Arithmetic Functions
 ##############################################################################
 
-class FunctionAdd(Function):
+class FunctionAdd(VectorFunction):
+
+    signature = Signature(rest=(BaseNumber, DataFrame))
 
     @property
     def info(self) -> str:
@@ -70,17 +79,18 @@ class FunctionAdd(Function):
             "This function receive as parameters a variadic amount\n" \
             "of numbers and return the result of adding them.\n\n" \
             "In case no parameter is provided it just returns the\n" \
-            "identity element 0."
+            "identity element 0.\n\n" \
+            "Data frames with a single column are added element-wise,\n" \
+            "numbers being added to every row."
+
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        return arithmetic.add_all(args)
 
-    def apply(self, args: SExpression, env: Environment) -> SExpression:
-        match_types(args, itertools.repeat(BaseNumber))
-        base = Integer(0)
-        for arg in listops.iterate(args):
-            base = arithmetic.add(base, arg)
-        return base
 
+class FunctionSubtract(VectorFunction):
 
-class FunctionSubtract(Function):
+    signature = Signature(rest=(BaseNumber, DataFrame))
 
     @property
     def info(self) -> str:
@@ -90,20 +100,18 @@ class FunctionSubtract(Function):
                "of numbers and return the result of subtracting from the\n" \
                "first one the rest of them.\n\n" \
                "In case no parameter is provided it just returns the\n" \
-               "identity element 0."
+               "identity element 0.\n\n" \
+               "Data frames with a single column are subtracted\n" \
+               "element-wise, numbers being subtracted from every row."
 
-    def apply(self, args: SExpression, env: Environment) -> SExpression:
-        match_types(args, itertools.repeat(BaseNumber))
-        if SYM_NIL == args:
-            return Integer(0)
-        values = listops.iterate(args)
-        base = next(values)
-        for v in values:
-            base = arithmetic.subtract(base, v)
-        return base
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        return arithmetic.subtract_all(args)
 
 
-class FunctionMultiply(Function):
+class FunctionMultiply(VectorFunction):
+
+    signature = Signature(rest=(BaseNumber, DataFrame))
 
     @property
     def info(self) -> str:
@@ -112,17 +120,18 @@ class FunctionMultiply(Function):
                "This function receive as parameters a variadic amount\n" \
                "of numbers and return the result of multiplying them.\n\n" \
                "In case no parameter is provided it just returns the\n" \
-               "identity element 1."
+               "identity element 1.\n\n" \
+               "Data frames with a single column are multiplied\n" \
+               "element-wise, numbers multiplying every row."
 
-    def apply(self, args: SExpression, env: Environment) -> SExpression:
-        match_types(args, itertools.repeat(BaseNumber))
-        base = Integer(1)
-        for arg in listops.iterate(args):
-            base = arithmetic.multiply(base, arg)
-        return base
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        return arithmetic.multiply_all(args)
 
 
-class FunctionDivide(Function):
+class FunctionDivide(VectorFunction):
+
+    signature = Signature(rest=(BaseNumber, DataFrame))
 
     @property
     def info(self) -> str:
@@ -132,16 +141,14 @@ class FunctionDivide(Function):
            "of numbers and return the result of dividing the\n" \
            "first one by rest of them.\n\n" \
            "In case no parameter is provided it just returns the\n" \
-           "identity element 1."
+           "identity element 1.\n\n" \
+           "Data frames with a single column are divided element-wise,\n" \
+           "numbers dividing every row, always with true division."
 
-    def apply(self, args: SExpression, env: Environment) -> SExpression:
-        match_types(args, itertools.repeat(BaseNumber))
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
         try:
-            values = listops.iterate(args)
-            base = Integer(1) if SYM_NIL == args else next(values)
-            for v in values:
-                base = arithmetic.divide(base, v)
-            return base
+            return arithmetic.divide_all(args)
         except ZeroDivisionError:
             raise EvaluationException("Trying to divide by 0!")
 
@@ -149,62 +156,185 @@ class FunctionDivide(Function):
 # Data frame IO functions
 ##############################################################################
 
-class FunctionReadCSV(Function):
+class FunctionReadCSV(VectorFunction):
+    """Function that reads a CSV file lazily, the chunks of the file are
+    stored in `cache` the first time they are all parsed and the frames
+    loaded are kept in `memo`. Large files are parsed by `jobs` processes
+    when all their rows are read. With `compact_types` the frames read use
+    compact column types, see df_compact."""
+
+    signature = Signature(String)
+
+    def __init__(self, name: str, cache: ColumnCache=None,
+                 memo: FrameMemo=None, jobs: int=None,
+                 compact_types: bool=False):
+        super().__init__(name)
+        self._cache = cache
+        self._memo = memo
+        self._jobs = jobs or 1
+        self._compact_types = compact_types
+
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        csv_path = typing.cast(String, args[0])
+        return DataFrame.from_csv_file(csv_path.value, self._cache,
+                                       self._memo, self._jobs,
+                                       self._compact_types)
+
+
+class FunctionReadCSVs(VectorFunction):
+    """Function that reads all the CSV files matched by some glob patterns,
+    in parallel, into a single data frame. `cache`, `memo` and
+    `compact_types` are used for each file as in FunctionReadCSV."""
+
+    signature = Signature(rest=String, min_args=1)
+
+    def __init__(self, name: str, cache: ColumnCache=None,
+                 memo: FrameMemo=None, jobs: int=None,
+                 compact_types: bool=False):
+        super().__init__(name)
+        self._cache = cache
+        self._memo = memo
+        self._jobs = jobs
+        self._compact_types = compact_types
+
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        return self.read([typing.cast(String, a).value for a in args])
+
+    def read(self, patterns: [str], source_column: str=None) -> DataFrame:
+        paths = multi.expand_globs(patterns)
+        if not paths:
+            raise ArgumentsException("{0}: no files match {1}".format(
+                self.name, ", ".join(patterns)))
+        try:
+            return DataFrame(multi.read_csv_files(
+                paths, self._jobs, source_column, self._cache,
+                memo=self._memo, compact=self._compact_types))
+        except ValueError as e:
+            raise ArgumentsException("{0}: {1}".format(self.name, e))
+
+
+class FunctionReadCSVGlob(FunctionReadCSVs):
+    """Function that reads the CSV files matched by a glob pattern, adding
+    a column, if named, with the file each row comes from."""
+
+    signature = Signature(String, String, min_args=1)
+
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        source_column = typing.cast(String, args[1]).value \
+            if len(args) > 1 else None
+        return self.read([typing.cast(String, args[0]).value], source_column)
+
+
+# Data frame memory
+##############################################################################
+
+class FunctionCompact(VectorFunction):
+    """Function that converts the low cardinality string columns of a data
+    frame to categories and the ISO 8601 ones to dates, and downcasts its
+    numeric columns. Lazy data frames are converted as they are read."""
+
+    signature = Signature(DataFrame)
+
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        return typing.cast(DataFrame, args[0]).compacted()
+
+
+class FunctionForce(VectorFunction):
+    """Function that runs the plan of a lazy data frame and returns a data
+    frame with its rows in memory."""
+
+    signature = Signature(DataFrame)
+
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        return typing.cast(DataFrame, args[0]).force()
+
+
+class FunctionMemoryUsage(VectorFunction):
+    """Function that returns the bytes taken by each column of a data
+    frame, and their total, reading lazy data frames."""
+
+    signature = Signature(DataFrame)
+
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        df = typing.cast(DataFrame, args[0])
+        return DataFrame(compact.memory_usage(df.data_frame))
 
-    def apply(self, args: SExpression, env: Environment) -> SExpression:
-        check_exact_number_of_arguments(args, 1, self.name)
-        match_types(args, [String])
 
-        csv_path = typing.cast(String, listops.nth(args, 0))
-        return DataFrame.from_csv_file(csv_path.value)
+class FunctionProfile(VectorFunction):
+    """Function that returns statistics of each column of a data frame:
+    counts of values and missing values, approximate distinct values,
+    minimum, maximum, mean, standard deviation and approximate quartiles.
+    Lazy data frames are read once, chunk by chunk."""
+
+    signature = Signature(DataFrame)
+
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        return typing.cast(DataFrame, args[0]).profile()
 
 
 # Data frame indexing
 ##############################################################################
 
-class FunctionGetColHeader(Function):
+class FunctionGetColHeader(VectorFunction):
 
-    def apply(self, args: SExpression, env: Environment) -> SExpression:
-        check_exact_number_of_arguments(args, 1, self.name)
-        df = listops.nth(args, 0)
-        if not isinstance(df, DataFrame):
-            raise ArgumentsException("expected a DataFrame")
+    signature = Signature(DataFrame)
 
-        header = [String(h) for h in df.data_frame]
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        df = typing.cast(DataFrame, args[0])
+        header = [String(h) for h in df.columns]
         return listops.from_list(header)
 
 
-class FunctionGetIndexCol(Function):
+class FunctionCountRows(VectorFunction):
+    """Function that counts the rows of a data frame, reading lazy data
+    frames in chunks."""
+
+    signature = Signature(DataFrame)
+
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        df = typing.cast(DataFrame, args[0])
+        return Integer(df.count_rows())
+
+
+class FunctionGetIndexCol(VectorFunction):
     """Function that extracts columns indexes from a data frame."""
 
-    def apply(self, args: SExpression, env: Environment) -> SExpression:
-        n_args = check_has_at_least_x_arguments(args, 1, self.name)
-        if not listops.is_list_of(args, Integer, n_args - 1):
+    signature = Signature(rest=(Integer, DataFrame), min_args=1)
+
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        indexes, last_arg = args[:-1], args[-1]
+        if not all(isinstance(i, Integer) for i in indexes):
             raise ArgumentsException("First arguments must be integers")
 
-        last_arg = listops.nth(args, n_args - 1)
         if isinstance(last_arg, DataFrame):
-            indexes = [s.value for s in
-                       listops.iterate(args, start=0, stop=n_args-1)]
-            n_df = last_arg.data_frame[last_arg.data_frame.columns[indexes]]
-            return DataFrame(n_df)
-        elif isinstance(last_arg, Integer):
+            try:
+                return last_arg.project([i.value for i in indexes])
+            except IndexError as e:
+                raise ArgumentsException(str(e))
+        else:
             name = "{0} {1}...".format(self.name, " ".join(map(str, args)))
             return FunctionPartialGetIndexCol(name, args)
-        else:
-            raise ArgumentsException("If no data frame is provided all"
-                                     " arguments must be integers")
 
 
 class FunctionPartialGetIndexCol(FunctionGetIndexCol):
 
     def __init__(self, name, p_args):
         super().__init__(name)
-        self._partial_args = p_args
+        self._partial_args = tuple(p_args)
 
-    def apply(self, args: SExpression, env: Environment) -> SExpression:
-        complete_args = listops.concat(self._partial_args, args)
-        return super().apply(complete_args, env)
+    def apply_vector(self, args: typing.Sequence[SExpression],
+                     env: Environment) -> SExpression:
+        return super().apply_vector(self._partial_args + tuple(args), env)
 
 
 # Special symbols
@@ -222,15 +352,136 @@ class SpecialLet(Special):
         return SYM_NIL
 
 
+class SpecialWhere(Special):
+    """Special form that filters the rows of a data frame with a condition
+    on its columns, which is compiled into vectorized operations instead
+    of being evaluated (see lang.predicate)."""
+
+    def apply(self, args: SExpression, env: Environment) -> SExpression:
+        check_exact_number_of_arguments(args, 2, self.name)
+        return self._where(listops.nth(args, 0),
+                           listops.nth(args, 1).eval(env), env)
+
+    def _where(self, condition: SExpression, df: SExpression,
+               env: Environment) -> DataFrame:
+        if not isinstance(df, DataFrame):
+            raise ArgumentsException("{0}: the second argument must be a"
+                                     " data frame".format(self.name))
+        return df.filter(compile_predicate(condition, df.columns, env))
+
+
+class SpecialGroupBy(Special):
+    """Special form that aggregates the groups of rows of a data frame
+    with the same values in some key columns, like in
+    (df_groupby (STATUS COUNTRY) ((count id) (mean price)) df).
+
+    The keys are a column or a list of columns, nil aggregating all the
+    rows, and the aggregations a list of (aggregation column) pairs or a
+    single pair. Lazy data frames are aggregated chunk by chunk as they
+    are read.
+    """
+
+    def apply(self, args: SExpression, env: Environment) -> SExpression:
+        check_exact_number_of_arguments(args, 3, self.name)
+        return self._group_by(listops.nth(args, 0), listops.nth(args, 1),
+                              listops.nth(args, 2).eval(env))
+
+    def _group_by(self, keys: SExpression, aggregations: SExpression,
+                  df: SExpression) -> DataFrame:
+        if not isinstance(df, DataFrame):
+            raise ArgumentsException("{0}: the third argument must be a"
+                                     " data frame".format(self.name))
+        columns = df.columns
+        if isinstance(keys, Symbol) and keys is not SYM_NIL:
+            keys = listops.from_args(keys)
+        key_positions = [column_position(k, columns, self.name)
+                         for k in listops.iterate(keys)]
+
+        if isinstance(aggregations, ConsCell) and \
+                isinstance(aggregations.car, Symbol):
+            aggregations = listops.from_args(aggregations)
+        pairs = []
+        for aggregation in listops.iterate(aggregations):
+            if not isinstance(aggregation, ConsCell) or \
+                    listops.length(aggregation) != 2 or \
+                    not isinstance(aggregation.car, Symbol):
+                raise ArgumentsException(
+                    "{0}: aggregations must be (aggregation column) pairs"
+                    .format(self.name))
+            pairs.append((column_position(listops.nth(aggregation, 1),
+                                          columns, self.name),
+                          aggregation.car.name))
+
+        try:
+            return df.aggregate(key_positions, pairs)
+        except ValueError as e:
+            raise ArgumentsException("{0}: {1}".format(self.name, e))
+
+
+class SpecialJoin(Special):
+    """Special form that joins the rows of two data frames with the same
+    values in some key columns, like in (df_join (ID) left right) or
+    (df_join left ((CI_CHANGEBY LOGINID)) os users).
+
+    The keys are a column or a list of columns with the same name in both
+    data frames, or (left_column right_column) pairs. The optional first
+    argument is the type of join, inner, left or outer, inner by default.
+    The smaller data frame is read into memory and the other is streamed
+    chunk by chunk.
+    """
+
+    def apply(self, args: SExpression, env: Environment) -> SExpression:
+        how, args = self._join_type(args)
+        check_exact_number_of_arguments(args, 3, self.name)
+        return self._join(how, listops.nth(args, 0),
+                          listops.nth(args, 1).eval(env),
+                          listops.nth(args, 2).eval(env))
+
+    def _join_type(self, args: SExpression) -> (str, SExpression):
+        if listops.length(args) == 4:
+            how = listops.nth(args, 0)
+            if not isinstance(how, Symbol) or how.name not in JOIN_TYPES:
+                raise ArgumentsException("{0}: the join type must be one of"
+                                         " {1}".format(self.name,
+                                                       ", ".join(JOIN_TYPES)))
+            return how.name, args.cdr
+        return "inner", args
+
+    def _join(self, how: str, keys: SExpression, left: SExpression,
+              right: SExpression) -> DataFrame:
+        if not isinstance(left, DataFrame) or \
+                not isinstance(right, DataFrame):
+            raise ArgumentsException("{0}: the joined arguments must be data"
+                                     " frames".format(self.name))
+        if isinstance(keys, Symbol) and keys is not SYM_NIL:
+            keys = listops.from_args(keys)
+        left_keys, right_keys = [], []
+        for key in listops.iterate(keys):
+            if isinstance(key, ConsCell) and listops.length(key) == 2:
+                left_key, right_key = listops.nth(key, 0), listops.nth(key, 1)
+            else:
+                left_key, right_key = key, key
+            left_keys.append(column_position(left_key, left.columns,
+                                             self.name))
+            right_keys.append(column_position(right_key, right.columns,
+                                              self.name))
+
+        try:
+            return left.join(right, left_keys, right_keys, how)
+        except ValueError as e:
+            raise ArgumentsException("{0}: {1}".format(self.name, e))
+
+
 # Utilities
 ##############################################################################
 
-def match_types(args_list: SExpression, types: [type]):
-    args = listops.iterate(args_list)
-    for i, (arg, t) in enumerate(zip(args, types)):
-        if not isinstance(arg, t):
-            raise ArgumentsException("Argument index {0} expected type {1}"
-                                     " but got {2}".format(i, t, type(arg)))
+def column_position(column: SExpression, columns: [str],
+                    symbol_name: str) -> int:
+    """Position of the first column named by the symbol `column`."""
+    if not isinstance(column, Symbol) or column.name not in columns:
+        raise ArgumentsException("{0}: {1} is not a column".format(
+            symbol_name, column))
+    return columns.index(column.name)
 
 
 def check_exact_number_of_arguments(args, expected_len, symbol_name):
@@ -241,24 +492,19 @@ def check_exact_number_of_arguments(args, expected_len, symbol_name):
                                   symbol_name, expected_len, length))
 
 
-def check_has_at_least_x_arguments(args, expected_len, symbol_name):
-    length = listops.length(args)
-    if length < expected_len:
-        raise ArgumentsException("{0} expected at least {1} but received {2}"
-                                 " arguments".format(
-                                  symbol_name, expected_len, length))
-    return length
-
-
 # Module functions
 ##############################################################################
 
-def load_all(env: Environment):
+def load_all(env: Environment, csv_cache: ColumnCache=None,
+             frame_memo: FrameMemo=None, jobs: int=None,
+             compact_types: bool=False):
     _log.debug("Loading all system primitives")
     load_default_symbols(env)
     load_basic_functions(env)
     load_arithmetic_functions(env)
-    load_data_frame_io_functions(env)
+    load_data_frame_io_functions(env, csv_cache, frame_memo, jobs,
+                                 compact_types)
+    load_data_frame_memory_functions(env)
     load_data_frame_indexing_functions(env)
     load_special_operations(env)
 
@@ -286,15 +532,40 @@ def load_arithmetic_functions(env: Environment):
     env.bind_global(Symbol("/"), FunctionDivide("/")).lock()
 
 
-def load_data_frame_io_functions(env: Environment):
+def load_data_frame_io_functions(env: Environment,
+                                 csv_cache: ColumnCache=None,
+                                 frame_memo: FrameMemo=None,
+                                 jobs: int=None, compact_types: bool=False):
     _log.debug("Loading data frame IO functions")
-    env.bind_global(Symbol("read_csv"), FunctionReadCSV("read_csv")).lock()
+    env.bind_global(Symbol("read_csv"),
+                    FunctionReadCSV("read_csv", csv_cache, frame_memo,
+                                    jobs, compact_types)).lock()
+    env.bind_global(Symbol("read_csvs"),
+                    FunctionReadCSVs("read_csvs", csv_cache, frame_memo,
+                                     jobs, compact_types)).lock()
+    env.bind_global(Symbol("read_csv_glob"),
+                    FunctionReadCSVGlob("read_csv_glob", csv_cache,
+                                        frame_memo, jobs,
+                                        compact_types)).lock()
+
+
+def load_data_frame_memory_functions(env: Environment):
+    _log.debug("Loading data frame memory functions")
+    env.bind_global(Symbol("df_compact"),
+                    FunctionCompact("df_compact")).lock()
+    env.bind_global(Symbol("df_memory"),
+                    FunctionMemoryUsage("df_memory")).lock()
+    env.bind_global(Symbol("df_force"), FunctionForce("df_force")).lock()
+    env.bind_global(Symbol("df_profile"),
+                    FunctionProfile("df_profile")).lock()
 
 
 def load_data_frame_indexing_functions(env: Environment):
     _log.debug("Loading data frame Indexing functions")
     env.bind_global(Symbol("df_header"),
                     FunctionGetColHeader("df_header")).lock()
+    env.bind_global(Symbol("df_nrows"),
+                    FunctionCountRows("df_nrows")).lock()
 
     icol_fn = FunctionGetIndexCol("df_icol")
     env.bind_global(Symbol("df_icol"), icol_fn).lock()
@@ -304,3 +575,7 @@ def load_data_frame_indexing_functions(env: Environment):
 def load_special_operations(env: Environment):
     _log.debug("Loading special operations")
     env.bind_global(Symbol("let"), SpecialLet("let")).lock()
+    env.bind_global(Symbol("df_where"), SpecialWhere("df_where")).lock()
+    env.bind_global(Symbol("df_groupby"),
+                    SpecialGroupBy("df_groupby")).lock()
+    env.bind_global(Symbol("df_join"), SpecialJoin("df_join")).lock()
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+import collections
+import hashlib
+import logging
+import marshal
+import os
+import tempfile
+
+from . import VERSION_STR
+from .lang.base import SExpression
+from .lang.symbol import Symbol
+from .lang.types import ConsCell, Integer, Real, String
+
+
+#
+##############################################################################
+
+# Bump whenever the layout of the cached forms changes
+FORMAT_VERSION = 1
+
+CACHE_DIR_NAME = "__csvicache__"
+CACHE_SUFFIX = ".formc"
+
+_SYMBOL, _INTEGER, _REAL, _STRING, _CONS = range(5)
+
+_log = logging.getLogger("scriptcache")
+
+
+#
+##############################################################################
+
+CacheKey = collections.namedtuple(
+    "CacheKey", ["path", "mtime_ns", "size", "version"])
+
+
+class ScriptCache(object):
+    """On-disk cache of the forms parsed from script files.
+
+    The forms of a script are stored in a compact marshal encoding, either
+    in a `__csvicache__` directory next to the script or, when `cache_dir`
+    is given, in that directory. Entries are only used if the path,
+    modification time and size of the script and the interpreter version
+    match the ones recorded when the entry was written.
+    """
+
+    def __init__(self, cache_dir: str=None):
+        self._cache_dir = cache_dir
+
+    def key(self, file_path: str) -> CacheKey:
+        stat = os.stat(file_path)
+        return CacheKey(os.path.abspath(file_path), stat.st_mtime_ns,
+                        stat.st_size,
+                        "{0}/{1}".format(VERSION_STR, FORMAT_VERSION))
+
+    def cache_path(self, key: CacheKey) -> str:
+        if self._cache_dir is None:
+            script_dir, script_name = os.path.split(key.path)
+            return os.path.join(script_dir, CACHE_DIR_NAME,
+                                script_name + CACHE_SUFFIX)
+
+        digest = hashlib.sha1(key.path.encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_dir, digest + CACHE_SUFFIX)
+
+    def load(self, key: CacheKey) -> ([SExpression], float) or None:
+        """Returns the cached forms and the seconds it took to parse them
+        originally, or None if there is no valid entry for `key`.
+        """
+        try:
+            with open(self.cache_path(key), "rb") as f:
+                stored_key, parse_seconds, codes = marshal.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError) as e:
+            _log.warning("Ignoring unreadable cache entry for '%s': %s",
+                         key.path, e)
+            return None
+
+        if tuple(stored_key) != tuple(key):
+            _log.debug("Stale cache entry for '%s'", key.path)
+            return None
+
+        return decode_forms(codes), parse_seconds
+
+    def store(self, key: CacheKey, forms: [SExpression],
+              parse_seconds: float):
+        cache_path = self.cache_path(key)
+        try:
+            data = marshal.dumps((tuple(key), parse_seconds,
+                                  encode_forms(forms)))
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(cache_path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, ValueError) as e:
+            _log.warning("Could not write cache entry for '%s': %s",
+                         key.path, e)
+
+
+# Encoding
+##############################################################################
+
+def encode_forms(forms: [SExpression]) -> list:
+    """Encodes each form as a flat list of (opcode, value) tuples in
+    postfix order, so neither encoding nor decoding recurse.
+    """
+    codes = []
+    for form in forms:
+        # Visiting node, cdr, car and reversing the output yields the
+        # postfix order car, cdr, node
+        form_codes, stack = [], [form]
+        while stack:
+            node = stack.pop()
+            node_type = type(node)
+            if node_type is ConsCell:
+                form_codes.append((_CONS,))
+                stack.append(node.car)
+                stack.append(node.cdr)
+            elif node_type is Symbol:
+                form_codes.append((_SYMBOL, node.name))
+            elif node_type is Integer:
+                form_codes.append((_INTEGER, node.value))
+            elif node_type is Real:
+                form_codes.append((_REAL, node.value))
+            elif node_type is String:
+                form_codes.append((_STRING, node.value))
+            else:
+                raise ValueError("cannot encode {0!r}".format(node))
+        form_codes.reverse()
+        codes.append(form_codes)
+    return codes
+
+
+def decode_forms(codes: list) -> [SExpression]:
+    forms = []
+    for form_codes in codes:
+        stack = []
+        for code in form_codes:
+            op = code[0]
+            if op == _CONS:
+                cdr = stack.pop()
+                stack.append(ConsCell(stack.pop(), cdr))
+            elif op == _SYMBOL:
+                stack.append(Symbol.intern(code[1]))
+            elif op == _INTEGER:
+                stack.append(Integer(code[1]))
+            elif op == _REAL:
+                stack.append(Real(code[1]))
+            else:
+                stack.append(String(code[1]))
+        forms.append(stack.pop())
+    return forms
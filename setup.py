@@ -25,7 +25,14 @@ with open('README.md') as f:
 
 # Requirements
 with open('requirements.txt') as f:
-    requirements = f.read().splitlines()
+    requirements = [line for line in f.read().splitlines()
+                    if line and not line.startswith('#')]
+
+# Optional requirements
+extras = {
+    # Column cache in feather (Arrow IPC) files instead of .npy files
+    'feather': ['pyarrow'],
+}
 
 
 # Additional keyword arguments
@@ -35,6 +42,7 @@ if have_setuptools:
             'console_scripts': ['csvi = csvinspector.__main__:main']
         },
         'install_requires': requirements,
+        'extras_require': extras,
     }
 else:
     pass
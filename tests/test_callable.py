@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from csvinspector.lang import listops
+from csvinspector.lang.base import SExpression
+from csvinspector.lang.callable import Function, VectorFunction
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.exceptions import ArgumentsException
+from csvinspector.lang.signature import Signature
+from csvinspector.lang.types import BaseNumber, Integer, Real, String
+
+
+#
+##############################################################################
+
+class ConsLength(Function):
+
+    def apply(self, args, env):
+        return Integer(listops.length(args))
+
+
+class Pair(VectorFunction):
+
+    signature = Signature(String, BaseNumber)
+
+    def apply_vector(self, args, env):
+        return listops.from_list(args)
+
+
+class AtLeastOne(VectorFunction):
+
+    signature = Signature(rest=SExpression, min_args=1)
+
+    def apply_vector(self, args, env):
+        return args[0]
+
+
+#
+##############################################################################
+
+class TestFunctionCall(unittest.TestCase):
+
+    def setUp(self):
+        self.env = NestedEnvironment()
+
+    def test_cons_function_through_adapter(self):
+        result = ConsLength("len").call((Integer(1), Integer(2)), self.env)
+        self.assertEqual(result, Integer(2))
+
+    def test_vector_function_through_apply(self):
+        args = listops.from_args(String("a"), Integer(1))
+        self.assertEqual(Pair("pair").apply(args, self.env), args)
+
+    def test_exact_arity(self):
+        with self.assertRaisesRegex(ArgumentsException,
+                                    "pair expected 2 but received 1"):
+            Pair("pair").call((String("a"),), self.env)
+
+    def test_minimum_arity(self):
+        with self.assertRaisesRegex(ArgumentsException,
+                                    "one expected at least 1 but received 0"):
+            AtLeastOne("one").call((), self.env)
+
+    def test_leading_argument_type(self):
+        with self.assertRaisesRegex(ArgumentsException, "index 0"):
+            Pair("pair").call((Integer(1), Integer(2)), self.env)
+
+    def test_rest_argument_type(self):
+        with self.assertRaisesRegex(ArgumentsException, "index 1"):
+            Pair("pair").call((String("a"), String("b")), self.env)
+
+    def test_any_type_by_default(self):
+        self.assertIsInstance(
+            AtLeastOne("one").call((String("a"),), self.env), SExpression)
+
+
+class TestSignature(unittest.TestCase):
+
+    def test_optional_arguments(self):
+        signature = Signature(String, Integer, min_args=1)
+        signature.check("f", (String("a"),))
+        signature.check("f", (String("a"), Integer(1)))
+        with self.assertRaisesRegex(ArgumentsException, "at most 2"):
+            signature.check("f", (String("a"), Integer(1), Integer(2)))
+
+    def test_alternative_types(self):
+        signature = Signature(rest=(Integer, String))
+        signature.check("f", (Integer(1), String("a")))
+        with self.assertRaisesRegex(ArgumentsException, "index 2"):
+            signature.check("f", (Integer(1), String("a"), Real(1.0)))
+
+    def test_accepted_types_are_cached(self):
+        signature = Signature(rest=BaseNumber)
+        signature.check("f", (Integer(1), Real(2.0)))
+        signature._check_types = None  # Would fail if called again
+        signature.check("f", (Integer(3), Real(4.0)))
+
+    def test_rejected_types_are_not_cached(self):
+        signature = Signature(String)
+        for _ in range(2):
+            with self.assertRaises(ArgumentsException):
+                signature.check("f", (Integer(1),))
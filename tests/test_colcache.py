@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from csvinspector.frames import colcache
+from csvinspector.frames.colcache import ColumnCache
+from csvinspector.frames.scan import CsvScan
+
+from .test_frames import CsvFileTestCase, write_csv
+
+
+#
+##############################################################################
+
+class ColumnCacheTestMixin(object):
+
+    use_arrow = False
+
+    def setUp(self):
+        super().setUp()
+        write_csv(self.csv_path, 2500, missing_qty=True)
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.cache = ColumnCache(self.cache_dir, use_arrow=self.use_arrow)
+
+    def scan(self, file_path: str=None) -> CsvScan:
+        return CsvScan(file_path or self.csv_path, chunk_size=1000,
+                       cache=self.cache)
+
+    def entries(self) -> [str]:
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return sorted(os.listdir(self.cache_dir))
+
+    def test_cached_chunks_match_parsed_ones(self):
+        expected = list(CsvScan(self.csv_path, chunk_size=1000).chunks())
+        self.assertEqual(self.entries(), [])
+        for _ in range(2):
+            chunks = list(self.scan().chunks())
+            self.assertEqual(len(self.entries()), 1)
+            self.assertEqual(len(chunks), len(expected))
+            for chunk, expected_chunk in zip(chunks, expected):
+                pd.testing.assert_frame_equal(chunk, expected_chunk)
+
+    def test_cached_projection(self):
+        self.scan().count_rows()
+        full = pd.read_csv(self.csv_path)
+        for indexes in ([1], [3, 0, 3], [-1, 2]):
+            projected = self.scan().project(indexes)
+            with mock.patch("pandas.read_csv") as read_csv:
+                pd.testing.assert_frame_equal(projected.collect(),
+                                              full.iloc[:, indexes])
+                pd.testing.assert_frame_equal(projected.head(1500),
+                                              full.iloc[:1500, indexes])
+                self.assertEqual(projected.count_rows(), 2500)
+            read_csv.assert_not_called()
+
+    def test_modified_file_is_parsed_again(self):
+        self.scan().count_rows()
+        write_csv(self.csv_path, 10, offset=5000, missing_qty=True)
+        os.utime(self.csv_path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        self.assertEqual(list(self.scan().collect()["id"]),
+                         list(range(5000, 5010)))
+
+    def test_partial_read_is_not_cached(self):
+        next(iter(self.scan().chunks()))
+        self.assertEqual(self.entries(), [])
+
+    def test_least_recently_used_entries_are_evicted(self):
+        paths = []
+        for i in range(3):
+            paths.append(os.path.join(self.tmp_dir, "{0}.csv".format(i)))
+            write_csv(paths[-1], 2000, missing_qty=True)
+        self.scan(paths[0]).count_rows()
+        entry_size = colcache._directory_size(
+            os.path.join(self.cache_dir, self.entries()[0]))
+
+        self.cache = ColumnCache(self.cache_dir, 2.5 * entry_size,
+                                 use_arrow=self.use_arrow)
+        self.scan(paths[1]).count_rows()
+        time.sleep(0.01)
+        self.scan(paths[0]).count_rows()  # Now the most recently used
+        self.scan(paths[2]).count_rows()
+
+        cached = {self.cache.entry_path(self.cache.key(p, chunk_size=1000))
+                  for p in paths}
+        remaining = {os.path.join(self.cache_dir, e) for e in self.entries()}
+        self.assertEqual(len(remaining), 2)
+        self.assertEqual(cached - remaining, {self.cache.entry_path(
+            self.cache.key(paths[1], chunk_size=1000))})
+
+
+class TestNumpyColumnCache(ColumnCacheTestMixin, CsvFileTestCase):
+    pass
+
+
+@unittest.skipIf(colcache.feather is None, "pyarrow is not installed")
+class TestArrowColumnCache(ColumnCacheTestMixin, CsvFileTestCase):
+
+    use_arrow = True
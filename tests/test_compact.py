@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from csvinspector.frames import compact
+from csvinspector.frames.memo import FrameMemo
+from csvinspector.frames.scan import CsvScan
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.types import DataFrame
+from csvinspector.primitives import FunctionCompact, FunctionMemoryUsage
+
+from .test_frames import CsvFileTestCase
+
+
+#
+##############################################################################
+
+def write_users(file_path: str, n_rows: int):
+    with open(file_path, "w") as f:
+        f.write("id,status,country,score,created,name\n")
+        for i in range(n_rows):
+            f.write("{0},{1},{2},{3},2020-01-{4:02d}T10:00:00+02:00,"
+                    "user{0}\n".format(i, ("ACTIVE", "INACTIVE")[i % 2],
+                                       ("ES", "FR", "US")[i % 3], i % 4 / 2,
+                                       i % 28 + 1))
+
+
+class TestCompactChunk(unittest.TestCase):
+
+    def test_infer_plan(self):
+        sample = pd.DataFrame({
+            "status": ["A", "B", "A", "A"],
+            "name": ["a", "b", "c", "d"],
+            "day": ["2020-01-01", "2021-02-03", None, "2020-01-01"],
+            "stamp": ["2020-01-01T10:00:00Z"] * 3 + ["2020-01-01 10:00+01:00"],
+            "mixed": ["A", "2020-01-01", "A", "A"],
+            "number": [1, 2, 3, 4]})
+        self.assertEqual(compact.infer_plan(sample), {
+            "status": compact.CATEGORY, "day": compact.DATETIME,
+            "stamp": compact.DATETIME_UTC, "mixed": compact.CATEGORY})
+
+    def test_downcast_numbers(self):
+        df = compact.compact_chunk(pd.DataFrame({
+            "small": [1, -2, 3], "large": [1, 2, 2 ** 40],
+            "half": [0.5, np.nan, 2.25], "precise": [0.1, 0.2, 0.3]}), {})
+        self.assertEqual(list(df.dtypes), [np.int8, np.int64, np.float32,
+                                           np.float64])
+        self.assertEqual(list(df["half"][[0, 2]]), [0.5, 2.25])
+
+    def test_repeated_column_names(self):
+        df = pd.DataFrame([[1, 2]], columns=["a", "a"])
+        self.assertEqual(list(compact.compact_chunk(df, {}).columns),
+                         ["a", "a"])
+
+    def test_concat_unifies_categories(self):
+        chunks = [compact.compact_chunk(pd.DataFrame({"s": values, "n": n}),
+                                        {"s": compact.CATEGORY})
+                  for values, n in ((["a", "b"], [1, 2]),
+                                    (["c", "a"], [1000, 2]))]
+        df = compact.concat_chunks(chunks)
+        self.assertIsInstance(df["s"].dtype, pd.CategoricalDtype)
+        self.assertEqual(list(df["s"]), ["a", "b", "c", "a"])
+        self.assertEqual(df["n"].dtype, np.int16)
+
+    def test_memory_usage(self):
+        df = pd.DataFrame({"a": np.arange(10, dtype=np.int8)})
+        usage = compact.memory_usage(df)
+        self.assertEqual(list(usage["column"]), ["a", "(total)"])
+        self.assertEqual(list(usage["bytes"]), [10, 10])
+
+
+class TestCompactScan(CsvFileTestCase):
+
+    csv_name = "users.csv"
+
+    def setUp(self):
+        super().setUp()
+        write_users(self.csv_path, 1000)
+        self.env = NestedEnvironment()
+
+    def test_collect(self):
+        df = CsvScan(self.csv_path, chunk_size=300, compact=True).collect()
+        expected = pd.read_csv(self.csv_path)
+        self.assertEqual(
+            [str(t) for t in df.dtypes],
+            ["int16", "category", "category", "float32",
+             "datetime64[us, UTC]", "str"])
+        self.assertEqual(list(df["status"]), list(expected["status"]))
+        self.assertEqual(list(df["score"]), list(expected["score"]))
+        self.assertEqual(df["created"][0],
+                         pd.Timestamp("2020-01-01T08:00:00Z"))
+        self.assertLess(df.memory_usage(deep=True).sum(),
+                        expected.memory_usage(deep=True).sum() / 2)
+
+    def test_projected_head(self):
+        scan = CsvScan(self.csv_path, compact=True).project([2, 0])
+        head = scan.head(5)
+        self.assertEqual(list(head.columns), ["country", "id"])
+        self.assertEqual([str(t) for t in head.dtypes], ["category", "int8"])
+
+    def test_memo_keeps_variants_apart(self):
+        memo = FrameMemo()
+        plain = CsvScan(self.csv_path, memo=memo).collect()
+        compacted = CsvScan(self.csv_path, memo=memo).compacted().collect()
+        self.assertEqual(plain["status"].dtype, "str")
+        self.assertEqual(compacted["status"].dtype, "category")
+        self.assertEqual(memo.stats().entries, 2)
+
+    def test_primitives(self):
+        df = DataFrame.from_csv_file(self.csv_path)
+        compacted = FunctionCompact("df_compact").call((df,), self.env)
+        self.assertTrue(compacted.is_lazy)
+        self.assertIn("compact CSV scan", str(compacted))
+
+        memory = FunctionMemoryUsage("df_memory")
+        before = memory.call((df,), self.env).data_frame
+        after = memory.call((compacted,), self.env).data_frame
+        self.assertEqual(list(after["column"]), list(df.columns) + ["(total)"])
+        self.assertLess(after["bytes"].iloc[-1], before["bytes"].iloc[-1])
+
+        eager = FunctionCompact("df_compact").call(
+            (DataFrame(df.data_frame),), self.env)
+        pd.testing.assert_frame_equal(eager.data_frame,
+                                      compacted.data_frame)
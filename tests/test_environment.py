@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.exceptions import SymbolLockedException, \
+    SymbolNotDefinedException
+from csvinspector.lang.symbol import Symbol
+from csvinspector.lang.types import Integer
+
+
+#
+##############################################################################
+
+A = Symbol("a")
+CONSTANT = Symbol("constant")
+
+
+class TestNestedEnvironment(unittest.TestCase):
+
+    def setUp(self):
+        self.root = NestedEnvironment()
+        self.root.bind_global(CONSTANT, Integer(0)).lock()
+
+    def nested(self, depth):
+        env = self.root
+        for _ in range(depth):
+            env = env.extend()
+        return env
+
+    def test_find_from_deep_environment(self):
+        self.root.bind(A, Integer(1))
+        self.assertEqual(self.nested(2000).find(A), Integer(1))
+
+    def test_find_undefined_symbol(self):
+        with self.assertRaises(SymbolNotDefinedException):
+            self.nested(3).find(A)
+
+    def test_inner_binding_shadows_outer_one(self):
+        self.root.bind(A, Integer(1))
+        env = self.nested(2)
+        env.bind(A, Integer(2))
+        self.assertEqual(env.find(A), Integer(2))
+        self.assertEqual(self.root.find(A), Integer(1))
+
+    def test_locked_outermost_symbols_cannot_be_bound_anywhere(self):
+        for env in (self.root, self.nested(3)):
+            with self.assertRaises(SymbolLockedException):
+                env.bind(CONSTANT, Integer(1))
+            self.assertTrue(env.is_constant(CONSTANT))
+
+    def test_locked_inner_symbol(self):
+        env = self.nested(1)
+        env.bind(A, Integer(1)).lock()
+        with self.assertRaises(SymbolLockedException):
+            env.bind(A, Integer(2))
+        self.root.bind(A, Integer(3))
+        self.assertFalse(self.root.is_constant(A))
+
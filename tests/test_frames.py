@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from csvinspector import interpreter
+from csvinspector.frames.plan import ScanNode
+from csvinspector.frames.scan import CsvScan
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.exceptions import ArgumentsException
+from csvinspector.lang.lexer import StrLexer
+from csvinspector.lang.parser import Parser
+from csvinspector.lang.symbol import Symbol
+from csvinspector.lang.types import DataFrame, Integer
+from csvinspector.primitives import load_all
+
+
+#
+##############################################################################
+
+def write_csv(file_path: str, n_rows: int, offset: int=0,
+              missing_qty: bool=False):
+    """Writes `n_rows` rows with ids from `offset`, leaving the qty of every
+    11th row empty if `missing_qty`."""
+    with open(file_path, "w") as f:
+        f.write("id,price,qty,name\n")
+        for i in range(offset, offset + n_rows):
+            qty = "" if missing_qty and i % 11 == 0 else i % 7
+            f.write("{0},{1}.5,{2},item{0}\n".format(i, i % 100, qty))
+
+
+class CsvFileTestCase(unittest.TestCase):
+    """Base of the tests on files in a temporary directory `tmp_dir`, removed
+    after each test. `csv_path` is the path of its `csv_name` file, written
+    by write_csv with `n_rows` rows unless `n_rows` is None."""
+
+    csv_name = "data.csv"
+    n_rows = None
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.tmp_dir, self.csv_name)
+        if self.n_rows is not None:
+            write_csv(self.csv_path, self.n_rows)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+
+class CsvFrameTestCase(CsvFileTestCase):
+    """Base of the tests running scripts on a data frame `df` read from the
+    file of `n_rows` rows, lazily by read_csv or, if `chunk_size` is set, by
+    a scan of chunks of that many rows."""
+
+    n_rows = 30
+    chunk_size = None
+
+    def setUp(self):
+        super().setUp()
+        self.expected = pd.read_csv(self.csv_path)
+        self.env = NestedEnvironment()
+        load_all(self.env)
+        if self.chunk_size is None:
+            df = DataFrame.from_csv_file(self.csv_path)
+        else:
+            df = DataFrame(plan=ScanNode(CsvScan(
+                self.csv_path, chunk_size=self.chunk_size)))
+        self.env.bind(Symbol("df"), df)
+
+    def run_script(self, script: str):
+        return interpreter.evaluate(Parser(StrLexer(script)).parse_next(),
+                                    self.env)
+
+
+def count_rows_peak_memory(file_path: str) -> int:
+    scan = CsvScan(file_path, chunk_size=1000)
+    tracemalloc.start()
+    try:
+        scan.count_rows()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class TestCsvScan(CsvFileTestCase):
+
+    n_rows = 2500
+
+    def test_header(self):
+        scan = CsvScan(self.csv_path)
+        self.assertEqual(scan.header, ["id", "price", "qty", "name"])
+        self.assertEqual(scan.columns, scan.header)
+
+    def test_chunks(self):
+        scan = CsvScan(self.csv_path, chunk_size=1000)
+        self.assertEqual([len(c) for c in scan.chunks()], [1000, 1000, 500])
+        self.assertEqual(scan.count_rows(), 2500)
+
+    def test_project(self):
+        scan = CsvScan(self.csv_path, chunk_size=1000).project([3, 0, 3])
+        self.assertEqual(scan.columns, ["name", "id", "name"])
+        df = scan.collect()
+        self.assertEqual(df.shape, (2500, 3))
+        self.assertEqual(list(df.iloc[1]), ["item1", 1, "item1"])
+
+    def test_projection_matches_full_read(self):
+        full = pd.read_csv(self.csv_path)
+        for indexes in ([1], [2, 0], [3, 1, 3], [-1, 0]):
+            scan = CsvScan(self.csv_path, chunk_size=1000).project(indexes)
+            expected = full.iloc[:, indexes]
+            pd.testing.assert_frame_equal(scan.collect(), expected)
+            pd.testing.assert_frame_equal(scan.head(5), expected.head(5))
+            self.assertEqual(scan.count_rows(), 2500)
+
+    def test_projection_parses_only_selected_columns(self):
+        scan = CsvScan(self.csv_path).project([2, 0])
+        with mock.patch("pandas.read_csv", wraps=pd.read_csv) as read_csv:
+            scan.head(1)
+        self.assertEqual(read_csv.call_args.kwargs["usecols"], [0, 2])
+
+    def test_project_of_projection(self):
+        scan = CsvScan(self.csv_path).project([1, 2]).project([-1])
+        self.assertEqual(scan.columns, ["qty"])
+        self.assertEqual(list(scan.head(3)["qty"]), [0, 1, 2])
+
+    def test_project_out_of_range(self):
+        with self.assertRaises(IndexError):
+            CsvScan(self.csv_path).project([4])
+
+    def test_collect_empty_file(self):
+        empty_path = os.path.join(self.tmp_dir, "empty.csv")
+        write_csv(empty_path, 0)
+        df = CsvScan(empty_path).project([1]).collect()
+        self.assertEqual(list(df.columns), ["price"])
+        self.assertEqual(len(df), 0)
+
+    def test_count_rows_in_bounded_memory(self):
+        # The peak grows with the first chunks while the parser buffers
+        # warm up, then stays flat however large the file is
+        small_path = os.path.join(self.tmp_dir, "small.csv")
+        large_path = os.path.join(self.tmp_dir, "large.csv")
+        write_csv(small_path, 20000)
+        write_csv(large_path, 100000)
+        small_peak = count_rows_peak_memory(small_path)
+        large_peak = count_rows_peak_memory(large_path)
+        self.assertLess(large_peak, 1.5 * small_peak)
+
+
+class TestLazyDataFrame(CsvFrameTestCase):
+
+    def test_read_csv_is_lazy(self):
+        df = DataFrame.from_csv_file(self.csv_path)
+        self.assertTrue(df.is_lazy)
+        self.assertEqual(df.columns, ["id", "price", "qty", "name"])
+        self.assertEqual(df.data_frame.shape, (30, 4))
+
+    def test_projection_stays_lazy(self):
+        df = self.run_script("($ 2 1 df)")
+        self.assertTrue(df.is_lazy)
+        self.assertEqual(df.columns, ["qty", "price"])
+
+    def test_count_rows(self):
+        self.assertEqual(self.run_script("(df_nrows ($ 0 df))"), Integer(30))
+
+    def test_str_shows_head(self):
+        df = DataFrame.from_csv_file(self.csv_path)
+        lines = str(df).splitlines()
+        self.assertEqual(len(lines), DataFrame.DISPLAY_ROWS + 2)
+        self.assertIn("item9", lines[-2])
+
+    def test_project_out_of_range(self):
+        with self.assertRaises(ArgumentsException):
+            self.run_script("($ 7 df)")
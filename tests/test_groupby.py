@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from csvinspector.frames.groupby import GroupAggregator
+from csvinspector.frames.plan import AggregateNode, FrameNode, ScanNode
+from csvinspector.frames.scan import CsvScan
+from csvinspector.lang.exceptions import ArgumentsException
+
+from .test_frames import CsvFrameTestCase
+
+
+#
+##############################################################################
+
+class TestGroupAggregator(unittest.TestCase):
+
+    def setUp(self):
+        rnd = np.random.default_rng(1)
+        size = 1000
+        self.df = pd.DataFrame({
+            "key": np.array(["a", "b", "c", None], dtype=object)[
+                rnd.integers(0, 4, size)],
+            "number": rnd.integers(0, 5, size),
+            "value": np.where(rnd.random(size) < 0.1, np.nan,
+                              rnd.integers(0, 20, size).astype(float))})
+
+    def aggregate(self, keys, aggregations, chunk_size: int) -> pd.DataFrame:
+        aggregator = GroupAggregator(keys, aggregations)
+        for start in range(0, len(self.df), chunk_size):
+            aggregator.add(self.df.iloc[start:start + chunk_size])
+        return aggregator.result()
+
+    def test_chunks_are_combined(self):
+        aggregations = [(2, f) for f in ("count", "sum", "mean", "min",
+                                         "max", "nunique")]
+        result = self.aggregate([0, 1], aggregations, 77)
+        self.assertEqual(result.shape[1], 8)
+
+        groups = self.df.groupby(["key", "number"], dropna=False)["value"]
+        expected = groups.agg(["count", "sum", "mean", "min", "max",
+                               "nunique"]).reset_index()
+        expected.columns = range(8)
+        expected[2] = expected[2].astype(np.int64)
+        expected[7] = expected[7].astype(np.int64)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+        pd.testing.assert_frame_equal(
+            result, self.aggregate([0, 1], aggregations, len(self.df)))
+
+    def test_without_keys(self):
+        result = self.aggregate([], [(2, "mean"), (0, "nunique")], 100)
+        self.assertEqual(len(result), 1)
+        self.assertAlmostEqual(result[0][0], self.df["value"].mean())
+        self.assertEqual(result[1][0], 3)
+
+    def test_categorical_keys_stay_categorical(self):
+        self.df["key"] = self.df["key"].astype("category")
+        result = self.aggregate([0], [(1, "count")], 300)
+        self.assertIsInstance(result[0].dtype, pd.CategoricalDtype)
+        self.assertEqual(result[1].sum(), len(self.df))
+
+
+class TestGroupBy(CsvFrameTestCase):
+
+    n_rows = 300
+    chunk_size = 40
+
+    def test_groupby(self):
+        df = self.run_script("(df_groupby qty ((count id) (mean price)) df)")
+        self.assertTrue(df.is_lazy)
+        self.assertEqual(df.columns, ["qty", "count(id)", "mean(price)"])
+        groups = self.expected.groupby("qty")
+        self.assertEqual(list(df.data_frame["count(id)"]),
+                         list(groups["id"].count()))
+        self.assertEqual(list(df.data_frame["mean(price)"]),
+                         list(groups["price"].mean()))
+
+    def test_groupby_without_keys(self):
+        df = self.run_script("(df_groupby () (nunique qty) df)")
+        self.assertEqual(list(df.data_frame["nunique(qty)"]), [7])
+
+    def test_empty_does_not_read_rows(self):
+        df = self.run_script(
+            "(df_groupby (qty) ((count id) (mean id) (max price)) df)")
+        with mock.patch.object(CsvScan, "chunks") as chunks:
+            empty = df.plan.empty()
+        chunks.assert_not_called()
+        self.assertEqual(list(empty.columns), df.columns)
+        self.assertEqual(len(empty), 0)
+
+        # The types are the ones of the result when the child's are known
+        plan = df.plan.with_child(FrameNode(self.expected))
+        pd.testing.assert_series_equal(plan.empty().dtypes,
+                                       plan.collect().dtypes)
+
+    def test_filter_is_pushed_below_the_aggregation(self):
+        df = self.run_script(
+            "(df_groupby (qty) ((max price)) (df_where (< id 100) df))")
+        plan = df.optimized_plan
+        self.assertIsInstance(plan, AggregateNode)
+        scan = plan.child.child
+        self.assertIsInstance(scan, ScanNode)
+        self.assertEqual(scan.columns, ["id", "price", "qty"])
+        self.assertEqual(str(scan.predicate), "(< id 100)")
+        expected = self.expected[self.expected["id"] < 100]
+        self.assertEqual(list(df.data_frame["max(price)"]),
+                         list(expected.groupby("qty")["price"].max()))
+
+    def test_groupby_arguments(self):
+        for script in ("(df_groupby qty (count id))",
+                       "(df_groupby qty (count id) 3)",
+                       "(df_groupby size (count id) df)",
+                       "(df_groupby qty (count size) df)",
+                       "(df_groupby qty (median id) df)",
+                       "(df_groupby qty ((count)) df)"):
+            with self.assertRaises(ArgumentsException, msg=script):
+                self.run_script(script)
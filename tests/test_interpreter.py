@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import contextlib
+import io
+import unittest
+
+from csvinspector import interpreter
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.symbol import Symbol
+from csvinspector.lang.types import Integer
+from csvinspector.primitives import load_all
+
+
+#
+##############################################################################
+
+class LineStream(io.RawIOBase):
+    """Binary stream that hands out one line per read and records what had
+    been written to `output` when each read happened."""
+
+    def __init__(self, lines, output=None):
+        self._lines = [line.encode("utf-8") for line in lines]
+        self._output = output
+        self.output_at_reads = []
+
+    def readable(self):
+        return True
+
+    def read1(self, size=-1):
+        if self._output is not None:
+            self.output_at_reads.append(self._output.getvalue())
+        return self._lines.pop(0) if self._lines else b""
+
+
+class TestRunStream(unittest.TestCase):
+
+    def setUp(self):
+        self.env = NestedEnvironment()
+        load_all(self.env)
+
+    def test_forms_are_evaluated_in_order(self):
+        stream = LineStream(["(let a 3) (let b\n", " (+ a 4))\n", "(let c b)"])
+        interpreter.run_stream(self.env, stream)
+        self.assertEqual(self.env.find(Symbol("c")), Integer(7))
+
+    def test_evaluation_errors_do_not_stop_the_stream(self):
+        stream = LineStream(["(+ undefined 1)\n", "(let a 1)\n"])
+        interpreter.run_stream(self.env, stream)
+        self.assertEqual(self.env.find(Symbol("a")), Integer(1))
+
+    def test_syntax_errors_do_not_stop_the_stream(self):
+        # An invalid character, an unexpected ')' and a string spanning
+        # lines, which is not an error
+        stream = LineStream(["(let a 1)\n", "(let @ 2)\n", ")\n",
+                             '(let s "x\n', '")\n', "(let b 3)\n"])
+        interpreter.run_stream(self.env, stream)
+        self.assertEqual(self.env.find(Symbol("b")), Integer(3))
+        self.assertEqual(self.env.find(Symbol("s")).value, "x\n")
+
+    def test_form_is_evaluated_when_closed(self):
+        output = io.StringIO()
+        stream = LineStream(['(println "one")', '(println "two")'], output)
+        with contextlib.redirect_stdout(output):
+            interpreter.run_stream(self.env, stream)
+        self.assertEqual(stream.output_at_reads,
+                         ["", "one\n", "one\ntwo\n"])
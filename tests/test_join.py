@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from csvinspector.frames.plan import FrameNode, JoinNode, Predicate, \
+    ProjectNode, ScanNode, optimize
+from csvinspector.frames.scan import CsvScan
+from csvinspector.lang.exceptions import ArgumentsException
+from csvinspector.lang.symbol import Symbol
+from csvinspector.lang.types import DataFrame
+
+from .test_frames import CsvFileTestCase, CsvFrameTestCase, write_csv
+
+
+#
+##############################################################################
+
+def sorted_rows(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(list(df.columns), ignore_index=True)
+
+
+class TestJoinNode(unittest.TestCase):
+
+    def setUp(self):
+        rnd = np.random.default_rng(2)
+        self.left = pd.DataFrame({
+            "k1": rnd.integers(0, 20, 200).astype(float),
+            "k2": np.array(["a", "b"], dtype=object)[
+                rnd.integers(0, 2, 200)],
+            "x": np.arange(200)})
+        self.left.loc[::17, "k1"] = np.nan
+        self.right = pd.DataFrame({
+            "k1": rnd.integers(10, 30, 50),
+            "y": np.arange(50),
+            "k2": np.array(["a", "b"], dtype=object)[
+                rnd.integers(0, 2, 50)]})
+
+    def chunked(self, df: pd.DataFrame, chunk_size: int=30) -> FrameNode:
+        node = FrameNode(df)
+        node.chunks = lambda: (df.iloc[i:i + chunk_size]
+                               for i in range(0, len(df), chunk_size))
+        return node
+
+    def expected(self, how: str) -> pd.DataFrame:
+        right = self.right.rename(columns={"k1": "r1", "k2": "r2"})
+        merged = pd.merge(self.left, right, left_on=["k1", "k2"],
+                          right_on=["r1", "r2"], how=how)
+        merged["k1"] = merged["k1"].fillna(merged["r1"])
+        merged["k2"] = merged["k2"].fillna(merged["r2"])
+        return sorted_rows(merged.drop(columns=["r1", "r2"]))
+
+    def test_joins_match_pandas(self):
+        for how in ("inner", "left", "outer"):
+            for left_rows in (10, 1000):
+                left = self.chunked(self.left)
+                left.estimate_rows = lambda: left_rows
+                node = JoinNode(left, self.chunked(self.right), [0, 1],
+                                [0, 2], how)
+                self.assertEqual(node.columns, ["k1", "k2", "x", "y"])
+                with self.subTest(how=how, left_rows=left_rows):
+                    pd.testing.assert_frame_equal(
+                        sorted_rows(node.collect()), self.expected(how),
+                        check_dtype=False)
+
+    def test_missing_rows_have_the_same_types(self):
+        node = JoinNode(self.chunked(self.left), self.chunked(self.right),
+                        [0], [0], "left")
+        dtypes = [list(chunk.dtypes) for chunk in node.chunks()]
+        self.assertEqual(dtypes[0], list(node.empty().dtypes))
+        self.assertTrue(all(d == dtypes[0] for d in dtypes))
+
+    def test_no_matches(self):
+        right = self.right.assign(k1=self.right["k1"] + 100)
+        node = JoinNode(FrameNode(self.left), FrameNode(right), [0], [0])
+        self.assertEqual(node.count_rows(), 0)
+        self.assertEqual(list(node.collect().columns),
+                         ["k1", "k2_x", "x", "y", "k2_y"])
+
+    def test_columns_on_both_sides_get_suffixes(self):
+        node = JoinNode(FrameNode(self.left), FrameNode(self.right), [0], [0])
+        self.assertEqual(node.columns, ["k1", "k2_x", "x", "y", "k2_y"])
+        expected = pd.merge(self.left, self.right, on="k1")
+        pd.testing.assert_frame_equal(sorted_rows(node.collect()),
+                                      sorted_rows(expected[node.columns]),
+                                      check_dtype=False)
+
+        # Projections keep the names when only one of the columns is read
+        projected = ProjectNode(node, [4, 2])
+        self.assertEqual(optimize(projected).columns, ["k2_y", "x"])
+        pd.testing.assert_frame_equal(optimize(projected).collect(),
+                                      projected.collect())
+
+    def test_missing_keys_do_not_match(self):
+        left = FrameNode(pd.DataFrame({"k": [np.nan, 1.0], "x": [1, 2]}))
+        right = FrameNode(pd.DataFrame({"k": [1.0, np.nan], "y": [3, 4]}))
+        self.assertEqual(list(JoinNode(left, right, [0], [0]).collect()["x"]),
+                         [2])
+        self.assertEqual(JoinNode(left, right, [0], [0], "outer")
+                         .count_rows(), 3)
+
+    def test_invalid_joins(self):
+        left, right = FrameNode(self.left), FrameNode(self.right)
+        with self.assertRaises(ValueError):
+            JoinNode(left, right, [0], [0], "cross")
+        with self.assertRaises(ValueError):
+            JoinNode(left, right, [0, 1], [0])
+        with self.assertRaises(IndexError):
+            JoinNode(left, right, [0], [3])
+
+
+class TestJoinScans(CsvFileTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.large_path = os.path.join(self.tmp_dir, "large.csv")
+        write_csv(self.large_path, 500)
+        self.small_path = os.path.join(self.tmp_dir, "small.csv")
+        with open(self.small_path, "w") as f:
+            f.write("qty,label,weight\n")
+            for i in range(0, 7, 2):
+                f.write("{0},q{0},{1}\n".format(i, i * 10))
+        self.large = ScanNode(CsvScan(self.large_path, chunk_size=60))
+        self.small = ScanNode(CsvScan(self.small_path))
+
+    def test_larger_side_is_streamed(self):
+        node = JoinNode(self.large, self.small, [2], [0])
+        with mock.patch.object(CsvScan, "collect",
+                               autospec=True,
+                               side_effect=CsvScan.collect) as collect:
+            rows = node.count_rows()
+        self.assertEqual([c.args[0].file_path for c in collect.mock_calls],
+                         [self.small_path])
+        expected = pd.read_csv(self.large_path)
+        self.assertEqual(rows, expected["qty"].isin([0, 2, 4, 6]).sum())
+
+        swapped = JoinNode(self.small, self.large, [0], [2], "left")
+        self.assertEqual(swapped.count_rows(), rows)
+        self.assertEqual(list(swapped.head(3)["label"]), ["q0", "q2", "q4"])
+
+    def test_only_used_columns_are_read(self):
+        node = ProjectNode(JoinNode(self.large, self.small, [2], [0]),
+                           [3, 4])
+        optimized = optimize(node)
+        join = optimized.child
+        self.assertIsInstance(join, JoinNode)
+        self.assertEqual(join.left.columns, ["qty", "name"])
+        self.assertEqual(join.right.columns, ["qty", "label"])
+        pd.testing.assert_frame_equal(sorted_rows(optimized.collect()),
+                                      sorted_rows(node.collect()))
+
+    def test_filters_are_pushed_into_the_scans(self):
+        node = DataFrame(plan=JoinNode(self.large, self.small, [2], [0]))
+        node = node.filter(Predicate([0], lambda c: c < 100, "left")) \
+            .filter(Predicate([5], lambda c: c > 10, "right"))
+        join = node.optimized_plan
+        self.assertEqual(str(join.left.predicate), "left")
+        self.assertEqual(str(join.right.predicate), "right")
+        self.assertEqual(list(node.data_frame["weight"].unique()),
+                         [20, 40, 60])
+
+
+class TestJoinPrimitive(CsvFrameTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.env.bind(Symbol("orders"), DataFrame(pd.DataFrame({
+            "id": [1, 2, 3, 4], "customer": ["a", "b", "a", "c"]})))
+        self.env.bind(Symbol("customers"), DataFrame(pd.DataFrame({
+            "name": ["a", "b", "d"], "country": ["ES", "FR", "US"]})))
+
+    def test_join(self):
+        df = self.run_script("(df_join ((customer name)) orders customers)")
+        self.assertEqual(df.columns, ["id", "customer", "country"])
+        self.assertEqual(sorted(df.data_frame["id"]), [1, 2, 3])
+        df = self.run_script(
+            "(df_join outer ((customer name)) orders customers)")
+        self.assertEqual(sorted(df.data_frame["customer"]),
+                         ["a", "a", "b", "c", "d"])
+
+    def test_join_on_columns_with_the_same_name(self):
+        self.env.bind(Symbol("ids"), DataFrame(pd.DataFrame({"id": [2, 4]})))
+        df = self.run_script("(df_join left id ids orders)")
+        self.assertEqual(list(df.data_frame["customer"]), ["b", "c"])
+
+    def test_join_with_shared_column_names(self):
+        self.env.bind(Symbol("returns"), DataFrame(pd.DataFrame({
+            "id": [2, 3], "customer": ["b", "z"]})))
+        df = self.run_script("(df_join id orders returns)")
+        self.assertEqual(df.columns, ["id", "customer_x", "customer_y"])
+        self.assertEqual(list(df.data_frame["customer_y"]), ["b", "z"])
+
+    def test_join_arguments(self):
+        for script in ("(df_join id orders)",
+                       "(df_join cross id orders customers)",
+                       "(df_join id orders customers)",
+                       "(df_join () orders customers)",
+                       "(df_join ((customer name)) orders 3)"):
+            with self.assertRaises(ArgumentsException, msg=script):
+                self.run_script(script)
@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 
+import io
+import os
+import tempfile
+import tracemalloc
 import unittest
 
-from csvinspector.lang.lexer import LexerException, StrLexer, TOKEN_EOF, \
-    new_atom, new_integer, new_real, new_string
+from csvinspector.lang.lexer import FileLexer, LexerException, StrLexer, \
+    StreamLexer, \
+    TOKEN_EOF, TOKEN_LPAREN, TOKEN_RPAREN, new_atom, new_integer, new_real, \
+    new_string
 
 
 #
@@ -35,20 +41,143 @@ class LexerText(unittest.TestCase):
     def test_operand_assign(self):
         self.assert_tokens("=", new_atom("="))
 
+    def test_comparison_operands(self):
+        self.assert_tokens("< <= > >= ! != (<= a 1)",
+                           new_atom("<"), new_atom("<="), new_atom(">"),
+                           new_atom(">="), new_atom("!"), new_atom("!="),
+                           TOKEN_LPAREN, new_atom("<="), new_atom("a"),
+                           new_integer("1"), TOKEN_RPAREN)
+        self.assertEqual(run_lexer(StreamLexer(io.BytesIO(b"(>= a 1)"), 2)),
+                         (TOKEN_LPAREN, new_atom(">="), new_atom("a"),
+                          new_integer("1"), TOKEN_RPAREN))
+
     def test_atom_with_operand_in_between(self):
         with self.assertRaises(LexerException):
             self.assert_tokens("h=i")
 
+    def test_signed_numbers_and_atoms(self):
+        self.assert_tokens("-5 +2.5 - -a --1",
+                           new_integer("-5"), new_real("+2.5"),
+                           new_atom("-"), new_atom("-a"), new_atom("--1"))
+
+    def test_list_expression(self):
+        self.assert_tokens('(let df ($ 1 2 (read_csv "a.csv")))',
+                           TOKEN_LPAREN, new_atom("let"), new_atom("df"),
+                           TOKEN_LPAREN, new_atom("$"), new_integer("1"),
+                           new_integer("2"), TOKEN_LPAREN,
+                           new_atom("read_csv"), new_string("a.csv"),
+                           TOKEN_RPAREN, TOKEN_RPAREN, TOKEN_RPAREN)
+
+    def test_number_followed_by_letter(self):
+        with self.assertRaisesRegex(LexerException, "'a'"):
+            self.assert_tokens("12a")
+
+    def test_real_with_two_full_stops(self):
+        with self.assertRaisesRegex(LexerException, "'.'"):
+            self.assert_tokens("1.2.3")
+
+    def test_unterminated_string(self):
+        with self.assertRaisesRegex(LexerException, "EOF"):
+            self.assert_tokens('"open \\"')
+
+    def test_invalid_character(self):
+        with self.assertRaisesRegex(LexerException, "'@'"):
+            self.assert_tokens("(a @)")
+
+    def test_file_lexer(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "script.cl")
+            with open(path, "w") as f:
+                f.write('(println "hi")\n')
+            self.assertEqual(run_lexer(FileLexer(path)),
+                             (TOKEN_LPAREN, new_atom("println"),
+                              new_string("hi"), TOKEN_RPAREN))
+
+    def test_mmap_file_lexer(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "script.cl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('(println "h\\"é" -1.5 café)\n')
+            with FileLexer(path, use_mmap=True) as lexer:
+                self.assertEqual(run_lexer(lexer),
+                                 (TOKEN_LPAREN, new_atom("println"),
+                                  new_string('h"é'), new_real("-1.5"),
+                                  new_atom("café"), TOKEN_RPAREN))
+
+    def test_mmap_file_lexer_flat_memory(self):
+        form = '(println "{0}" 12 3.5 symbol)\n'.format("x" * 1000)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            small_peak = lex_file_peak_memory(tmp_dir, form * 1000)
+            large_peak = lex_file_peak_memory(tmp_dir, form * 4000)
+
+        self.assertLess(large_peak, small_peak + 64 * 1024)
+        self.assertLess(large_peak, len(form) * 4000 // 8)
+
+    def test_stream_lexer_tokens_split_across_chunks(self):
+        text = '(let total (+ 12.75 -3 "a \\"quoted\\" é")) # symbol'
+        expected = run_lexer(StrLexer(text))
+        for chunk_size in (1, 2, 3, 7):
+            stream = io.BytesIO(text.encode("utf-8"))
+            self.assertEqual(run_lexer(StreamLexer(stream, chunk_size)),
+                             expected)
+            self.assertEqual(
+                run_lexer(StreamLexer(io.StringIO(text), chunk_size)),
+                expected)
+
+    def test_stream_lexer_reads_only_what_it_needs(self):
+        stream = io.BytesIO(b"(a) b")
+        lexer = StreamLexer(stream, chunk_size=3)
+        for token in (TOKEN_LPAREN, new_atom("a"), TOKEN_RPAREN):
+            self.assertEqual(lexer.next_token(), token)
+        self.assertEqual(stream.tell(), 3)
+
+    def test_stream_lexer_unterminated_string(self):
+        with self.assertRaisesRegex(LexerException, "EOF"):
+            run_lexer(StreamLexer(io.BytesIO(b'"never closed'), 4))
+
+    def test_stream_lexer_rejects_invalid_characters_at_once(self):
+        stream = io.BytesIO(b"(a @ b)\n" + b"(c)\n" * 1000)
+        lexer = StreamLexer(stream, chunk_size=8)
+        for token in (TOKEN_LPAREN, new_atom("a")):
+            self.assertEqual(lexer.next_token(), token)
+        with self.assertRaisesRegex(LexerException, "'@'"):
+            lexer.next_token()
+        self.assertEqual(stream.tell(), 8)
+
+        lexer.skip_line()
+        self.assertEqual(run_lexer(lexer)[:3],
+                         (TOKEN_LPAREN, new_atom("c"), TOKEN_RPAREN))
+
     def assert_tokens(self, text, *tokens):
-        lexer_tokens = run_lexer(text)
+        lexer_tokens = run_lexer(StrLexer(text))
         self.assertEqual(lexer_tokens, tokens)
 
 
-def run_lexer(text):
-    lexer = StrLexer(text)
+def run_lexer(lexer):
     token = lexer.next_token()
     tokens = []
     while token != TOKEN_EOF:
         tokens.append(token)
         token = lexer.next_token()
     return tuple(tokens)
+
+
+def count_tokens(lexer):
+    n_tokens = 0
+    while lexer.next_token() != TOKEN_EOF:
+        n_tokens += 1
+    return n_tokens
+
+
+def lex_file_peak_memory(tmp_dir, text):
+    path = os.path.join(tmp_dir, "big.cl")
+    with open(path, "w") as f:
+        f.write(text)
+
+    tracemalloc.start()
+    try:
+        with FileLexer(path, use_mmap=True) as lexer:
+            count_tokens(lexer)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+import contextlib
+import io
+import os
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from csvinspector import interpreter
+from csvinspector.frames.memo import FileKey, FrameMemo, file_key
+from csvinspector.frames.scan import CsvScan
+
+from .test_frames import CsvFileTestCase
+
+
+#
+##############################################################################
+
+def frame(n_rows: int) -> pd.DataFrame:
+    return pd.DataFrame({"a": range(n_rows), "b": [1.5] * n_rows,
+                         "c": ["x"] * n_rows})
+
+
+class TestFrameMemo(unittest.TestCase):
+
+    def setUp(self):
+        self.memo = FrameMemo()
+        self.key = FileKey("/data/a.csv", 1, 100)
+
+    def test_hits_and_misses(self):
+        self.assertIsNone(self.memo.get(self.key, None))
+        self.memo.put(self.key, None, frame(10))
+        pd.testing.assert_frame_equal(self.memo.get(self.key, None),
+                                      frame(10))
+        stats = self.memo.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.entries), (1, 1, 1))
+        self.assertGreater(stats.resident_bytes, 0)
+
+    def test_modifying_results_does_not_modify_the_cache(self):
+        df = frame(10)
+        self.memo.put(self.key, None, df)
+        df.loc[0, "a"] = -1
+        cached = self.memo.get(self.key, None)
+        cached.loc[1, "a"] = -1
+        subset = self.memo.get(self.key, [0])
+        subset.loc[2, "a"] = -1
+        pd.testing.assert_frame_equal(self.memo.get(self.key, None),
+                                      frame(10))
+
+    def test_all_columns_serve_any_subset(self):
+        self.memo.put(self.key, None, frame(10))
+        pd.testing.assert_frame_equal(self.memo.get(self.key, [0, 2]),
+                                      frame(10).iloc[:, [0, 2]])
+        self.memo.put(self.key, [1], frame(10).iloc[:, [1]])
+        self.assertIsNone(self.memo.get(FileKey("/data/b.csv", 1, 100), [1]))
+
+    def test_least_recently_used_frames_are_evicted(self):
+        size = int(frame(1000).memory_usage(deep=True).sum())
+        self.memo.max_bytes = int(2.5 * size)
+        keys = [FileKey("/data/{0}.csv".format(i), 1, 100) for i in range(3)]
+        self.memo.put(keys[0], None, frame(1000))
+        self.memo.put(keys[1], None, frame(1000))
+        self.memo.get(keys[0], None)
+        self.memo.put(keys[2], None, frame(1000))
+        self.assertIsNone(self.memo.get(keys[1], None))
+        self.assertIsNotNone(self.memo.get(keys[0], None))
+        self.assertEqual(self.memo.stats().evictions, 1)
+
+    def test_frames_larger_than_the_budget_are_not_kept(self):
+        self.memo.max_bytes = 10
+        self.memo.put(self.key, None, frame(1000))
+        self.assertEqual(self.memo.stats().entries, 0)
+
+    def test_new_versions_of_a_file_replace_old_ones(self):
+        self.memo.put(self.key, None, frame(10))
+        self.memo.put(self.key._replace(mtime_ns=2), [0], frame(5))
+        self.assertIsNone(self.memo.get(self.key, None))
+        self.assertEqual(self.memo.stats().entries, 1)
+
+    def test_repl_stats(self):
+        self.memo.put(self.key, None, frame(10))
+        self.memo.get(self.key, None)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            interpreter.show_cache_stats(self.memo)
+        self.assertIn("1 frames", output.getvalue())
+        self.assertIn("1 hits, 0 misses", output.getvalue())
+
+
+class TestMemoizedScan(CsvFileTestCase):
+
+    def setUp(self):
+        super().setUp()
+        frame(50).to_csv(self.csv_path, index=False)
+        self.memo = FrameMemo()
+
+    def test_collect_reads_the_file_once(self):
+        expected = CsvScan(self.csv_path).project([2, 0]).collect()
+        scans = [CsvScan(self.csv_path, memo=self.memo) for _ in range(3)]
+        pd.testing.assert_frame_equal(scans[0].collect(), frame(50))
+        with mock.patch("pandas.read_csv") as read_csv:
+            pd.testing.assert_frame_equal(
+                scans[1].project([2, 0]).collect(), expected)
+            pd.testing.assert_frame_equal(scans[2].collect(), frame(50))
+        read_csv.assert_not_called()
+
+    def test_modified_file_is_read_again(self):
+        CsvScan(self.csv_path, memo=self.memo).collect()
+        key = file_key(self.csv_path)
+        frame(3).to_csv(self.csv_path, index=False)
+        os.utime(self.csv_path, ns=(key.mtime_ns, key.mtime_ns + 10 ** 9))
+        self.assertEqual(len(CsvScan(self.csv_path, memo=self.memo)
+                             .collect()), 3)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pandas as pd
+
+from csvinspector.frames import multi
+from csvinspector.frames.memo import FrameMemo
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.exceptions import ArgumentsException
+from csvinspector.lang.types import String
+from csvinspector.primitives import FunctionReadCSVGlob, FunctionReadCSVs
+
+from .test_frames import CsvFileTestCase
+
+
+#
+##############################################################################
+
+class TestReadCsvFiles(CsvFileTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.paths = []
+        for day in range(4):
+            path = os.path.join(self.tmp_dir, "day{0}.csv".format(day))
+            pd.DataFrame({"day": [day] * (day + 1),
+                          "value": range(day + 1)}).to_csv(path, index=False)
+            self.paths.append(path)
+        self.expected = pd.concat([pd.read_csv(p) for p in self.paths],
+                                  ignore_index=True)
+        self.env = NestedEnvironment()
+
+    def test_expand_globs(self):
+        pattern = os.path.join(self.tmp_dir, "day*.csv")
+        self.assertEqual(multi.expand_globs([self.paths[2], pattern]),
+                         [self.paths[2]] + self.paths[:2] + self.paths[3:])
+
+    def test_sequential_and_parallel_reads_match(self):
+        for jobs, use_threads in ((1, False), (3, True), (2, False)):
+            df = multi.read_csv_files(self.paths, jobs,
+                                      use_threads=use_threads)
+            pd.testing.assert_frame_equal(df, self.expected)
+
+    def test_source_column(self):
+        df = multi.read_csv_files(self.paths, 2, source_column="file")
+        self.assertEqual(df["file"].dtype, "category")
+        self.assertEqual(list(df["file"]),
+                         [p for i, p in enumerate(self.paths)
+                          for _ in range(i + 1)])
+
+    def test_memo(self):
+        for jobs, use_threads in ((1, False), (3, True), (2, False)):
+            memo = FrameMemo()
+            for _ in range(2):
+                df = multi.read_csv_files(self.paths, jobs, memo=memo,
+                                          use_threads=use_threads)
+                pd.testing.assert_frame_equal(df, self.expected)
+            stats = memo.stats()
+            self.assertEqual((stats.hits, stats.misses, stats.entries),
+                             (4, 4, 4), (jobs, use_threads))
+
+    def test_compact(self):
+        for jobs in (1, 2):
+            df = multi.read_csv_files(self.paths, jobs, compact=True)
+            self.assertEqual(df["day"].dtype, "int8")
+            self.assertEqual(list(df["value"]), list(self.expected["value"]))
+
+    def test_read_csvs_primitive(self):
+        pattern = os.path.join(self.tmp_dir, "*.csv")
+        df = FunctionReadCSVs("read_csvs", jobs=2).call(
+            (String(pattern),), self.env)
+        pd.testing.assert_frame_equal(df.data_frame, self.expected)
+
+        memo = FrameMemo()
+        function = FunctionReadCSVs("read_csvs", None, memo, 2, True)
+        for _ in range(2):
+            df = function.call((String(pattern),), self.env)
+            self.assertEqual(df.data_frame["day"].dtype, "int8")
+        self.assertEqual(memo.stats().hits, 4)
+
+    def test_read_csv_glob_primitive(self):
+        pattern = os.path.join(self.tmp_dir, "day[12].csv")
+        df = FunctionReadCSVGlob("read_csv_glob", jobs=2).call(
+            (String(pattern), String("source")), self.env)
+        self.assertEqual(list(df.data_frame["source"].unique()),
+                         self.paths[1:3])
+
+    def test_no_matches(self):
+        pattern = os.path.join(self.tmp_dir, "*.tsv")
+        with self.assertRaises(ArgumentsException):
+            FunctionReadCSVGlob("read_csv_glob").call((String(pattern),),
+                                                      self.env)
+
+    def test_existing_source_column(self):
+        with self.assertRaises(ArgumentsException):
+            FunctionReadCSVGlob("read_csv_glob").call(
+                (String(self.paths[0]), String("day")), self.env)
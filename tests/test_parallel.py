@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+import os
+from unittest import mock
+
+import pandas as pd
+
+from csvinspector.frames import parallel
+from csvinspector.frames.colcache import ColumnCache
+from csvinspector.frames.scan import CsvScan
+
+from .test_frames import CsvFileTestCase
+
+
+#
+##############################################################################
+
+class TestReadCsvParallel(CsvFileTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.csv_path = self.write("data.csv", [
+            "{0},{1},{2},item{0}".format(i, i / 4, i % 3) for i in range(500)])
+        # Every file is large enough to be split
+        patcher = mock.patch.object(parallel, "MIN_PARALLEL_BYTES", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, name: str, rows: [str], header: str="id,x,k,name") -> str:
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "w") as f:
+            f.write("\n".join([header] + rows) + "\n")
+        return path
+
+    def read(self, path: str, jobs: int=3, usecols: [int]=None):
+        names = list(pd.read_csv(path, nrows=0).columns)
+        return parallel.read_csv_parallel(path, names, jobs, usecols)
+
+    def test_split_ranges_at_line_boundaries(self):
+        with open(self.csv_path, "rb") as f:
+            data = f.read()
+        ranges = parallel.split_ranges(self.csv_path, 7)
+        self.assertLessEqual(len(ranges), 7)
+        self.assertEqual(ranges[0][0], data.index(b"\n") + 1)
+        self.assertEqual(ranges[-1][1], len(data))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(data[end - 1:end], b"\n")
+
+    def test_matches_sequential_read(self):
+        pd.testing.assert_frame_equal(self.read(self.csv_path),
+                                      pd.read_csv(self.csv_path))
+
+    def test_usecols(self):
+        pd.testing.assert_frame_equal(
+            self.read(self.csv_path, usecols=[1, 3]),
+            pd.read_csv(self.csv_path, usecols=[1, 3]))
+
+    def test_types_are_unified(self):
+        # Integers in the first range, missing values and strings later on
+        rows = ["{0},{0},{0},a".format(i) for i in range(300)] + \
+            [",1.5,x,b"] + ["{0},{0},{0},c".format(i) for i in range(300)]
+        path = self.write("mixed.csv", rows)
+        df = self.read(path, jobs=4)
+        pd.testing.assert_frame_equal(df, pd.read_csv(path))
+        self.assertEqual(df["id"].dtype, "float64")
+        self.assertEqual(df["k"][0], "0")
+
+    def test_booleans_with_missing_values(self):
+        # Missing values only in the last range of "id", the first range of
+        # "x" only has missing values, and "k" mixes booleans and numbers
+        flags = ["True", "False"]
+        rows = ["{0},{1},{2},n".format(
+            "" if i >= 2500 else flags[i % 2],
+            "" if i < 1000 else flags[i % 3 % 2],
+            flags[i % 2] if i < 1500 else i) for i in range(3000)]
+        path = self.write("flags.csv", rows)
+        df = self.read(path)
+        expected = pd.read_csv(path)
+        pd.testing.assert_frame_equal(df, expected)
+        self.assertEqual(df["id"].dtype, object)
+        self.assertIs(df["id"][0], True)
+        self.assertEqual(df["k"][0], "True")
+
+    def test_quoted_files_are_not_split(self):
+        path = self.write("quoted.csv", ['1,2,3,"multi\nline"'])
+        self.assertIsNone(parallel.split_ranges(path, 2))
+        self.assertIsNone(self.read(path))
+
+    def test_small_files_are_not_split(self):
+        with mock.patch.object(parallel, "MIN_PARALLEL_BYTES", 2 ** 20):
+            self.assertIsNone(self.read(self.csv_path))
+        self.assertIsNone(self.read(self.csv_path, jobs=1))
+
+    def test_no_rows(self):
+        path = self.write("empty.csv", [])
+        self.assertIsNone(self.read(path))
+        self.assertEqual(len(CsvScan(path, jobs=2).collect()), 0)
+
+    def test_scan_collect(self):
+        scan = CsvScan(self.csv_path, jobs=2).project([3, 0, 0])
+        pd.testing.assert_frame_equal(
+            scan.collect(),
+            pd.read_csv(self.csv_path).iloc[:, [3, 0, 0]])
+
+    def test_scan_collect_fills_cache(self):
+        cache = ColumnCache(os.path.join(self.tmp_dir, "cache"))
+        scan = CsvScan(self.csv_path, chunk_size=128, cache=cache, jobs=2)
+        pd.testing.assert_frame_equal(scan.project([2]).collect(),
+                                      pd.read_csv(self.csv_path, usecols=[2]))
+
+        entry = cache.load(cache.key(self.csv_path, chunk_size=128))
+        self.assertEqual([len(c) for c in entry.chunks()], [128] * 3 + [116])
+        pd.testing.assert_frame_equal(scan.collect(),
+                                      pd.read_csv(self.csv_path))
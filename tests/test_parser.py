@@ -3,9 +3,10 @@
 import unittest
 
 from csvinspector.lang import listops
+from csvinspector.lang.exceptions import ParserException
 from csvinspector.lang.lexer import StrLexer
 from csvinspector.lang.parser import Parser
-from csvinspector.lang.symbol import Symbol
+from csvinspector.lang.symbol import SYM_NIL, Symbol
 from csvinspector.lang.types import Integer, Real, String
 
 
@@ -77,3 +78,24 @@ class TestParser(unittest.TestCase):
         left = listops.from_args(INTEGER)
         right = listops.from_args(SYMBOL)
         self.assertEqual(listops.from_args(left, right), s_expr)
+
+    def test_empty_list(self):
+        s_expr = Parser(StrLexer("()")).parse_next()
+        self.assertEqual(s_expr, SYM_NIL)
+
+    def test_deeply_nested_list(self):
+        depth = 20000
+        text = "(" * depth + "SYMBOL" + ")" * depth
+        s_expr = Parser(StrLexer(text)).parse_next()
+        for _ in range(depth):
+            self.assertEqual(s_expr.cdr, SYM_NIL)
+            s_expr = s_expr.car
+        self.assertEqual(s_expr, SYMBOL)
+
+    def test_wide_list(self):
+        s_expr = Parser(StrLexer("(" + "1234 " * 10000 + ")")).parse_next()
+        self.assertEqual(listops.to_list(s_expr), [INTEGER] * 10000)
+
+    def test_unbalanced_list(self):
+        with self.assertRaises(ParserException):
+            Parser(StrLexer("(1234 (SYMBOL)")).parse_next()
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+from unittest import mock
+
+import pandas as pd
+
+from csvinspector.frames.plan import AggregateNode, FilterNode, FrameNode, \
+    Predicate, ProjectNode, ScanNode, optimize
+from csvinspector.frames.scan import CsvScan
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.types import DataFrame
+from csvinspector.primitives import FunctionForce
+
+from .test_frames import CsvFileTestCase
+
+
+#
+##############################################################################
+
+def cheap(column):
+    return column < 10
+
+
+class TestOptimizer(CsvFileTestCase):
+
+    n_rows = 50
+
+    def setUp(self):
+        super().setUp()
+        self.expected = pd.read_csv(self.csv_path)
+        self.scan = ScanNode(CsvScan(self.csv_path, chunk_size=7))
+
+    def assert_same_rows(self, node, expected: pd.DataFrame):
+        pd.testing.assert_frame_equal(node.collect(),
+                                      expected.reset_index(drop=True))
+        pd.testing.assert_frame_equal(optimize(node).collect(),
+                                      expected.reset_index(drop=True))
+
+    def test_projections_are_fused_into_the_scan(self):
+        node = ProjectNode(ProjectNode(self.scan, [3, 1, 2]), [2, -1, 0])
+        optimized = optimize(node)
+        self.assertIsInstance(optimized, ScanNode)
+        self.assertEqual(optimized.columns, ["qty", "qty", "name"])
+        self.assert_same_rows(node, self.expected.iloc[:, [2, 2, 3]])
+
+    def test_filter_is_pushed_into_the_scan(self):
+        predicate = Predicate([1], cheap, "(< price 10)")
+        node = FilterNode(ProjectNode(self.scan, [3, 1]), predicate)
+        optimized = optimize(node)
+        self.assertIsInstance(optimized, ScanNode)
+        self.assertEqual(str(optimized.predicate), "(< price 10)")
+        self.assert_same_rows(
+            node, self.expected[self.expected["price"] < 10].iloc[:, [3, 1]])
+
+    def test_unused_columns_are_not_read(self):
+        predicate = Predicate([1], cheap, "(< price 10)")
+        node = ProjectNode(FilterNode(self.scan, predicate), [3])
+        optimized = optimize(node)
+        self.assertIsInstance(optimized, ProjectNode)
+        self.assertEqual(optimized.child.scan.columns, ["price", "name"])
+        self.assert_same_rows(
+            node, self.expected[self.expected["price"] < 10].iloc[:, [3]])
+        self.assertEqual(optimize(node).count_rows(),
+                         (self.expected["price"] < 10).sum())
+
+    def test_filters_are_combined(self):
+        node = FilterNode(FilterNode(self.scan, Predicate([1], cheap, "a")),
+                          Predicate([0], lambda c: c % 2 == 0, "b"))
+        optimized = optimize(node)
+        self.assertIsInstance(optimized, ScanNode)
+        self.assertEqual(str(optimized.predicate), "a and b")
+        self.assert_same_rows(node, self.expected[
+            (self.expected["price"] < 10) & (self.expected["id"] % 2 == 0)])
+
+    def test_frames_in_memory(self):
+        frame = FrameNode(self.expected)
+        node = ProjectNode(FilterNode(frame, Predicate([1], cheap, "a")),
+                           [0])
+        optimized = optimize(node)
+        self.assertIsInstance(optimized.child, FilterNode)
+        self.assertEqual(optimized.child.columns, ["id", "price"])
+        self.assert_same_rows(
+            node, self.expected[self.expected["price"] < 10].iloc[:, [0]])
+
+    def test_aggregate_reads_used_columns(self):
+        node = AggregateNode(self.scan, [2], [(1, "sum"), (3, "nunique")])
+        optimized = optimize(node)
+        self.assertEqual(optimized.child.columns, ["price", "qty", "name"])
+        self.assertEqual(node.columns, ["qty", "sum(price)", "nunique(name)"])
+
+        groups = self.expected.groupby("qty")
+        expected = pd.DataFrame({"qty": groups.sum().index,
+                                 "sum(price)": groups["price"].sum().values,
+                                 "nunique(name)":
+                                     groups["name"].nunique().values})
+        self.assert_same_rows(node, expected)
+
+    def test_invalid_nodes(self):
+        with self.assertRaises(IndexError):
+            ProjectNode(self.scan, [4])
+        with self.assertRaises(ValueError):
+            AggregateNode(self.scan, [], [(0, "median")])
+
+    def test_predicates_must_be_conditions(self):
+        for function in (lambda c: c, lambda c: 5):
+            node = FilterNode(self.scan, Predicate([1], function, "price"))
+            with self.assertRaises(TypeError):
+                node.collect()
+
+
+class TestLazyEvaluation(CsvFileTestCase):
+
+    n_rows = 50
+
+    def setUp(self):
+        super().setUp()
+        self.env = NestedEnvironment()
+
+    def test_plans_run_when_needed(self):
+        df = DataFrame.from_csv_file(self.csv_path)
+        with mock.patch.object(CsvScan, "chunks") as chunks:
+            filtered = df.filter(Predicate([1], cheap, "a")).project([0])
+            self.assertEqual(filtered.columns, ["id"])
+            chunks.assert_not_called()
+
+        self.assertIn("where a", str(filtered))
+        forced = FunctionForce("df_force").call((filtered,), self.env)
+        self.assertFalse(forced.is_lazy)
+        self.assertEqual(list(forced.data_frame["id"]),
+                         [i for i in range(50) if i % 100 < 10])
+
+    def test_frames_in_memory_are_lazy_too(self):
+        df = DataFrame(pd.DataFrame({"a": [1, 2], "b": [3, 4]})).project([1])
+        self.assertTrue(df.is_lazy)
+        self.assertEqual(list(df.data_frame["b"]), [3, 4])
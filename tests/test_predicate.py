@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from csvinspector.frames.plan import ScanNode
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.exceptions import ArgumentsException, \
+    EvaluationException
+from csvinspector.lang.lexer import StrLexer
+from csvinspector.lang.parser import Parser
+from csvinspector.lang.predicate import compile_predicate
+from csvinspector.lang.symbol import Symbol
+from csvinspector.lang.types import ConsCell, Integer
+from csvinspector.primitives import load_all
+
+from .test_frames import CsvFrameTestCase
+
+
+#
+##############################################################################
+
+def parse(text: str):
+    return Parser(StrLexer(text)).parse_next()
+
+
+class TestCompilePredicate(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({"STATUS": ["ACTIVE", "INACTIVE", "ACTIVE"],
+                                "price": [1.5, 20.0, 7.0],
+                                "qty": [3, 1, 2]})
+        self.env = NestedEnvironment()
+        load_all(self.env)
+
+    def mask(self, text: str) -> [bool]:
+        predicate = compile_predicate(parse(text), list(self.df.columns),
+                                      self.env)
+        return list(predicate.mask(self.df))
+
+    def test_comparisons(self):
+        self.assertEqual(self.mask('(= STATUS "ACTIVE")'),
+                         [True, False, True])
+        self.assertEqual(self.mask('(!= STATUS "ACTIVE")'),
+                         [False, True, False])
+        self.assertEqual(self.mask("(< price 7)"), [True, False, False])
+        self.assertEqual(self.mask("(<= price 7)"), [True, False, True])
+        self.assertEqual(self.mask("(> qty price)"), [True, False, False])
+        self.assertEqual(self.mask("(>= 2 qty)"), [False, True, True])
+
+    def test_logical_operations(self):
+        self.assertEqual(self.mask('(and (= STATUS "ACTIVE") (> qty 2))'),
+                         [True, False, False])
+        self.assertEqual(self.mask('(or (> price 10) (< qty 3) (> qty 5))'),
+                         [False, True, True])
+        self.assertEqual(self.mask('(not (= STATUS "ACTIVE"))'),
+                         [False, True, False])
+        self.assertEqual(self.mask("(! (> qty 1))"), [False, True, False])
+
+    def test_negated_constants(self):
+        self.assertEqual(self.mask("(not true)"), [False, False, False])
+        self.assertEqual(self.mask("(! false)"), [True, True, True])
+        self.assertEqual(self.mask("(not (= 1 1))"), [False, False, False])
+        self.assertEqual(self.mask("(not (> 1 2))"), [True, True, True])
+        self.assertEqual(self.mask("(and (not (= 1 1)) (> qty 0))"),
+                         [False, False, False])
+
+    def test_negations_of_values_are_rejected(self):
+        for text in ("(not qty)", "(not 1)", '(! "a")', "(not (+ qty 1))"):
+            with self.assertRaises(EvaluationException, msg=text):
+                self.mask(text)
+
+    def test_values_are_not_conditions(self):
+        for text in ("5", '"x"', "qty", "STATUS", "(+ qty 1)"):
+            with self.assertRaises(EvaluationException, msg=text):
+                self.mask(text)
+
+    def test_boolean_columns_with_missing_values(self):
+        self.df["flag"] = pd.Series([True, None, False], dtype=object)
+        self.assertEqual(self.mask("flag"), [True, False, False])
+
+    def test_arithmetic(self):
+        self.assertEqual(self.mask("(> (* price qty) 10)"),
+                         [False, True, True])
+
+    def test_variables_and_constants(self):
+        self.env.bind(Symbol("limit"), Integer(2))
+        self.assertEqual(self.mask("(> qty limit)"), [True, False, False])
+        self.assertEqual(self.mask("true"), [True, True, True])
+
+    def test_only_used_columns_are_read(self):
+        predicate = compile_predicate(parse("(> qty (+ price qty))"),
+                                      list(self.df.columns), self.env)
+        self.assertEqual(predicate.positions, (2, 1))
+        self.assertEqual(str(predicate), "(> qty (+ price qty))")
+
+    def test_never_evaluates_the_expression(self):
+        with mock.patch.object(ConsCell, "eval") as cons_eval:
+            self.mask('(and (= STATUS "ACTIVE") (> qty 1))')
+        cons_eval.assert_not_called()
+
+    def test_invalid_conditions(self):
+        for text in ("(< price)", "(= 1 2 3)", "(like STATUS 1)", "(not)",
+                     "((< price 1))"):
+            with self.assertRaises(ArgumentsException, msg=text):
+                self.mask(text)
+
+    def test_type_errors(self):
+        with self.assertRaisesRegex(EvaluationException, "STATUS"):
+            self.mask("(< STATUS 1)")
+
+
+class TestWhere(CsvFrameTestCase):
+
+    n_rows = 300
+
+    def test_where(self):
+        df = self.run_script('(df_where (and (< price 10) (= qty 3)) df)')
+        self.assertTrue(df.is_lazy)
+        expected = self.expected[(self.expected["price"] < 10) &
+                                 (self.expected["qty"] == 3)]
+        pd.testing.assert_frame_equal(df.data_frame,
+                                      expected.reset_index(drop=True))
+        self.assertEqual(df.count_rows(), len(expected))
+
+    def test_where_is_pushed_into_the_scan(self):
+        df = self.run_script('($ 3 (df_where (= name "item7") df))')
+        plan = df.optimized_plan
+        self.assertIsInstance(plan, ScanNode)
+        self.assertEqual(list(df.data_frame["name"]), ["item7"])
+
+    def test_where_on_projection(self):
+        df = self.run_script("(df_where (> id 295) ($ 2 0 df))")
+        self.assertEqual(list(df.data_frame["id"]), [296, 297, 298, 299])
+        with self.assertRaises(ArgumentsException):
+            self.run_script("(df_where (> price 1) ($ 2 0 df))")
+
+    def test_where_negated_constant(self):
+        self.assertEqual(self.run_script("(df_where (not true) df)")
+                         .count_rows(), 0)
+        self.assertEqual(self.run_script("(df_where (not (= 1 2)) df)")
+                         .count_rows(), 300)
+
+    def test_where_rejects_values_as_conditions(self):
+        for script in ("(df_where 5 df)", '(df_where "x" df)',
+                       "(df_where price df)", "(df_where name df)"):
+            with self.assertRaises(EvaluationException, msg=script):
+                self.run_script(script).count_rows()
+
+    def test_where_arguments(self):
+        with self.assertRaises(ArgumentsException):
+            self.run_script("(df_where (> id 1) 3)")
+        with self.assertRaises(ArgumentsException):
+            self.run_script("(df_where (> id 1))")
@@ -2,11 +2,14 @@
 
 import unittest
 
+import pandas as pd
+
 from csvinspector.lang import listops
 from csvinspector.lang.environment import NestedEnvironment
-from csvinspector.lang.exceptions import EvaluationException
+from csvinspector.lang.exceptions import ArgumentsException, \
+    EvaluationException
 from csvinspector.lang.symbol import SYM_NIL
-from csvinspector.lang.types import Integer, Real
+from csvinspector.lang.types import DataFrame, Integer, Real
 from csvinspector.primitives import FunctionAdd, FunctionSubtract, \
     FunctionMultiply, FunctionDivide
 
@@ -37,6 +40,16 @@ class TestFunctionAdd(unittest.TestCase):
         result = self.f_add.apply(op, self.env)
         self.assertEqual(result, Integer(-5))
 
+    def test_addition_of_integers_and_reals(self):
+        op = listops.from_list([Integer(2), Real(0.5), Integer(3)])
+        result = self.f_add.apply(op, self.env)
+        self.assertEqual(result, Real(5.5))
+
+    def test_addition_of_many_integers(self):
+        op = listops.from_list([Integer(i) for i in range(10000)])
+        result = self.f_add.apply(op, self.env)
+        self.assertEqual(result, Integer(sum(range(10000))))
+
 
 class TestFunctionSubtract(unittest.TestCase):
 
@@ -65,6 +78,12 @@ class TestFunctionSubtract(unittest.TestCase):
         self.assertEqual(result, Integer(1))
 
 
+    def test_subtraction_of_integers_and_reals(self):
+        op = listops.from_list([Integer(2), Real(0.5), Integer(3)])
+        result = self.f_subtract.apply(op, self.env)
+        self.assertEqual(result, Real(-1.5))
+
+
 class TestFunctionMultiply(unittest.TestCase):
 
     def setUp(self):
@@ -92,6 +111,12 @@ class TestFunctionMultiply(unittest.TestCase):
         self.assertEqual(result, Integer(-6))
 
 
+    def test_multiplication_of_integers_and_reals(self):
+        op = listops.from_list([Integer(2), Real(0.5), Integer(3)])
+        result = self.f_multiply.apply(op, self.env)
+        self.assertEqual(result, Real(3.0))
+
+
 class TestFunctionDivide(unittest.TestCase):
 
     def setUp(self):
@@ -121,3 +146,78 @@ class TestFunctionDivide(unittest.TestCase):
         op = listops.from_list([Real(3.0), Integer(2)])
         result = self.f_divide.apply(op, self.env)
         self.assertEqual(result, Real(1.5))
+
+    def test_integer_steps_are_truncated_until_a_real(self):
+        op = listops.from_list([Integer(7), Integer(2), Real(2.0),
+                                Integer(2)])
+        result = self.f_divide.apply(op, self.env)
+        self.assertEqual(result, Real(0.75))
+
+    def test_real_division_by_0(self):
+        op = listops.from_list([Real(1.5), Real(0.0)])
+        with self.assertRaises(EvaluationException):
+            self.f_divide.apply(op, self.env)
+
+
+class TestColumnArithmetic(unittest.TestCase):
+
+    def setUp(self):
+        self.env = NestedEnvironment()
+        self.price = DataFrame(pd.DataFrame({"price": [1.5, 2.0, 4.0]}))
+        self.qty = DataFrame(pd.DataFrame({"qty": [2, 3, 0]}))
+
+    def column(self, function, *args):
+        result = function.call(args, self.env)
+        self.assertIsInstance(result, DataFrame)
+        self.assertEqual(len(result.data_frame.columns), 1)
+        return result.data_frame.iloc[:, 0]
+
+    def test_multiply_columns(self):
+        column = self.column(FunctionMultiply('*'), self.price, self.qty)
+        self.assertEqual(column.name, "price * qty")
+        self.assertEqual(list(column), [3.0, 6.0, 0.0])
+
+    def test_scalars_are_broadcast(self):
+        column = self.column(FunctionAdd('+'), Integer(1), self.qty,
+                             Real(0.5))
+        self.assertEqual(list(column), [3.5, 4.5, 1.5])
+        column = self.column(FunctionSubtract('-'), Integer(10), self.qty)
+        self.assertEqual(list(column), [8, 7, 10])
+
+    def test_column_division_is_true_division(self):
+        column = self.column(FunctionDivide('/'), self.qty, Integer(2))
+        self.assertEqual(list(column), [1.0, 1.5, 0.0])
+
+    def test_column_division_by_0(self):
+        column = self.column(FunctionDivide('/'), self.price, self.qty)
+        self.assertEqual(list(column), [0.75, 2.0 / 3, float("inf")])
+
+    def test_multiple_columns_are_rejected(self):
+        both = DataFrame(pd.concat([self.price.data_frame,
+                                    self.qty.data_frame], axis=1))
+        with self.assertRaises(ArgumentsException):
+            FunctionAdd('+').call((both, Integer(1)), self.env)
+
+    def test_compact_columns_do_not_overflow(self):
+        df = DataFrame(pd.DataFrame({"n": [100, 127, -128]})).compacted()
+        self.assertEqual(df.data_frame["n"].dtype, "int8")
+        column = self.column(FunctionAdd('+'), df, df)
+        self.assertEqual(list(column), [200, 254, -256])
+        column = self.column(FunctionMultiply('*'), df, Integer(1000))
+        self.assertEqual(list(column), [100000, 127000, -128000])
+
+    def test_overflow(self):
+        with self.assertRaises(EvaluationException):
+            FunctionMultiply('*').call((self.qty, Integer(2 ** 70)),
+                                       self.env)
+
+    def test_columns_are_combined_by_position(self):
+        shifted = DataFrame(pd.DataFrame({"qty": [2, 3, 0]},
+                                         index=[10, 11, 12]))
+        column = self.column(FunctionAdd('+'), self.price, shifted)
+        self.assertEqual(list(column), [3.5, 5.0, 4.0])
+
+    def test_columns_of_different_lengths(self):
+        short = DataFrame(pd.DataFrame({"qty": [1, 2]}))
+        with self.assertRaises(EvaluationException):
+            FunctionAdd('+').call((self.price, short), self.env)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from csvinspector.frames import parallel
+from csvinspector.frames.profile import ColumnProfile, FrameProfile, \
+    HyperLogLog, KllSketch, STATISTICS
+from csvinspector.frames.scan import CsvScan
+
+from .test_frames import CsvFrameTestCase
+
+
+#
+##############################################################################
+
+class TestSketches(unittest.TestCase):
+
+    def test_hyperloglog(self):
+        sketch, other = HyperLogLog(), HyperLogLog()
+        for start in range(0, 60000, 10000):
+            sketch.add(pd.Series(np.arange(start, start + 10000) % 50000))
+        self.assertAlmostEqual(sketch.estimate(), 50000, delta=2500)
+
+        other.add(pd.Series(["a", "b", "c", "a"]))
+        self.assertEqual(other.estimate(), 3)
+        exact = HyperLogLog(exact=100000)
+        exact.add(pd.Series(np.arange(50000)))
+        self.assertEqual(exact.estimate(), 50000)
+        sketch.merge(other)
+        self.assertAlmostEqual(sketch.estimate(), 50003, delta=2500)
+
+    def test_kll_quantiles(self):
+        values = np.random.default_rng(3).permutation(100000).astype(float)
+        sketch, other = KllSketch(seed=1), KllSketch(seed=2)
+        for chunk in np.array_split(values[:60000], 7):
+            sketch.add(chunk)
+        other.add(values[60000:])
+        sketch.merge(other)
+        for expected, quantile in zip([10000, 50000, 90000],
+                                      sketch.quantiles([0.1, 0.5, 0.9])):
+            self.assertAlmostEqual(quantile, expected, delta=2000)
+        self.assertLess(sum(len(level) for level in sketch._levels), 1000)
+
+    def test_kll_without_values(self):
+        self.assertTrue(np.isnan(KllSketch().quantiles([0.5])[0]))
+
+
+class TestColumnProfile(unittest.TestCase):
+
+    def test_moments_of_merged_chunks(self):
+        values = pd.Series(np.random.default_rng(4).normal(1e6, 2, 1000))
+        values[::9] = np.nan
+        profile = ColumnProfile()
+        for start in range(0, len(values), 77):
+            profile.add(values.iloc[start:start + 77])
+        statistics = dict(zip(STATISTICS[1:], profile.statistics()))
+        self.assertEqual(statistics["count"], values.count())
+        self.assertEqual(statistics["nulls"], values.isna().sum())
+        self.assertAlmostEqual(statistics["mean"], values.mean())
+        self.assertAlmostEqual(statistics["std"], values.std())
+        self.assertEqual(statistics["min"], values.min())
+        self.assertEqual(statistics["max"], values.max())
+
+    def test_numbers_with_missing_values(self):
+        profile = ColumnProfile()
+        profile.add(pd.Series([1, 2, 3]))
+        profile.add(pd.Series([4.0, np.nan]))
+        self.assertEqual(profile.statistics()[:6], ["float64", 4, 1, 4, 1, 4])
+
+    def test_mixed_types(self):
+        profile = ColumnProfile()
+        profile.add(pd.Series([1, 2]))
+        profile.add(pd.Series(["a", "b"], dtype=object))
+        statistics = profile.statistics()
+        self.assertEqual(statistics[:6], ["object", 4, 0, 4, None, None])
+        self.assertTrue(all(np.isnan(s) for s in statistics[6:]))
+
+    def test_categories(self):
+        profile = ColumnProfile()
+        profile.add(pd.Series(["b", "a", None, "b"], dtype="category"))
+        profile.add(pd.Series(["c"], dtype="category"))
+        self.assertEqual(profile.statistics()[1:6], [4, 1, 3, "a", "c"])
+
+
+class TestProfile(CsvFrameTestCase):
+
+    n_rows = 700
+    chunk_size = 90
+
+    def assert_profile(self, result: pd.DataFrame, expected: pd.DataFrame):
+        self.assertEqual(list(result.columns), STATISTICS)
+        self.assertEqual(list(result["column"]), list(expected.columns))
+        self.assertEqual(list(result["count"]), list(expected.count()))
+        self.assertEqual(list(result["distinct"]), list(expected.nunique()))
+        self.assertEqual(list(result["min"]), list(expected.min()))
+        self.assertEqual(list(result["max"]), list(expected.max()))
+        numbers = expected.select_dtypes("number")
+        by_column = result.set_index("column").loc[numbers.columns]
+        np.testing.assert_allclose(by_column["mean"], numbers.mean())
+        np.testing.assert_allclose(by_column["std"], numbers.std())
+
+    def test_profile(self):
+        df = self.run_script("(df_profile df)")
+        self.assertTrue(df.is_lazy)
+        self.assertEqual(df.count_rows(), 4)
+        self.assert_profile(df.data_frame, self.expected)
+        np.testing.assert_allclose(df.data_frame["p50"][:3], [349.5, 50, 3],
+                                   atol=7)
+
+    def test_profile_of_rows_and_columns(self):
+        df = self.run_script("(df_profile ($ 3 1 (df_where (< qty 2) df)))")
+        self.assert_profile(df.data_frame, self.expected[
+            self.expected["qty"] < 2].iloc[:, [3, 1]])
+
+    def test_profile_without_rows(self):
+        df = self.run_script("(df_profile (df_where (< qty 0) df))")
+        self.assertEqual(list(df.data_frame["count"]), [0, 0, 0, 0])
+        self.assertEqual(list(df.data_frame["nulls"]), [0, 0, 0, 0])
+
+    def test_parallel_reduction(self):
+        new_profile = functools.partial(FrameProfile, 2)
+        with mock.patch.object(parallel, "MIN_PARALLEL_BYTES", 0):
+            scan = CsvScan(self.csv_path, chunk_size=90, jobs=3) \
+                .project([3, 1])
+            profile = scan.reduce(new_profile)
+            self.assertIsNotNone(parallel.reduce_parallel(
+                self.csv_path, scan.header, 3, [1, 3], [1, 0], 90,
+                new_profile))
+        self.assert_profile(profile.result(["name", "price"]),
+                            self.expected.iloc[:, [3, 1]])
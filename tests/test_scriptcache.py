@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+
+from csvinspector import interpreter
+from csvinspector.lang import listops
+from csvinspector.lang.environment import NestedEnvironment
+from csvinspector.lang.lexer import StrLexer
+from csvinspector.lang.parser import Parser
+from csvinspector.lang.symbol import Symbol
+from csvinspector.primitives import load_all
+from csvinspector.scriptcache import CACHE_DIR_NAME, ScriptCache, \
+    decode_forms, encode_forms
+
+
+#
+##############################################################################
+
+SCRIPT = '(let a (+ 1 2.5 -3))\n(let b "text \\"quoted\\"")\n(let c a)\n'
+
+
+def parse_all(text):
+    parser = Parser(StrLexer(text))
+    forms = []
+    while parser.has_next():
+        forms.append(parser.parse_next())
+    return forms
+
+
+#
+##############################################################################
+
+class TestFormsEncoding(unittest.TestCase):
+
+    def test_round_trip(self):
+        forms = parse_all(SCRIPT + '(($ 1 2) (read_csv "x.csv") sym)')
+        self.assertEqual(decode_forms(encode_forms(forms)), forms)
+
+    def test_long_list_does_not_recurse(self):
+        forms = parse_all("(+ {0})".format(" ".join(["1"] * 50000)))
+        decoded = decode_forms(encode_forms(forms))
+        self.assertEqual(listops.to_list(decoded[0]),
+                         listops.to_list(forms[0]))
+
+
+class TestScriptCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.script = os.path.join(self.tmp_dir.name, "script.cl")
+        with open(self.script, "w") as f:
+            f.write(SCRIPT)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_miss_then_hit(self):
+        cache = ScriptCache()
+        key = cache.key(self.script)
+        self.assertIsNone(cache.load(key))
+
+        cache.store(key, parse_all(SCRIPT), 0.5)
+        forms, parse_seconds = cache.load(key)
+        self.assertEqual(forms, parse_all(SCRIPT))
+        self.assertEqual(parse_seconds, 0.5)
+        self.assertTrue(os.path.isdir(
+            os.path.join(self.tmp_dir.name, CACHE_DIR_NAME)))
+
+    def test_modified_script_invalidates_entry(self):
+        cache = ScriptCache()
+        cache.store(cache.key(self.script), parse_all(SCRIPT), 0.5)
+        with open(self.script, "a") as f:
+            f.write("(let d 4)\n")
+        self.assertIsNone(cache.load(cache.key(self.script)))
+
+    def test_cache_dir(self):
+        cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        cache = ScriptCache(cache_dir)
+        key = cache.key(self.script)
+        cache.store(key, parse_all(SCRIPT), 0.5)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        self.assertIsNotNone(cache.load(key))
+
+    def test_run_file_uses_cache(self):
+        cache = ScriptCache()
+        for _ in range(2):
+            env = NestedEnvironment()
+            load_all(env)
+            interpreter.run_file(env, self.script, cache)
+            self.assertEqual(env.find(Symbol("c")), env.find(Symbol("a")))
+        self.assertIsNotNone(cache.load(cache.key(self.script)))
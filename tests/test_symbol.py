@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+import copy
+import pickle
+import unittest
+
+from csvinspector.lang.lexer import StrLexer
+from csvinspector.lang.parser import Parser
+from csvinspector.lang.symbol import SYM_NIL, Symbol
+
+
+#
+##############################################################################
+
+class TestSymbol(unittest.TestCase):
+
+    def test_same_name_same_instance(self):
+        self.assertIs(Symbol("abc"), Symbol("abc"))
+        self.assertIs(Symbol.intern("abc"), Symbol("abc"))
+        self.assertIs(Symbol.intern("nil"), SYM_NIL)
+
+    def test_different_names(self):
+        self.assertIsNot(Symbol("abc"), Symbol("abd"))
+        self.assertNotEqual(Symbol("abc"), Symbol("abd"))
+
+    def test_equality_and_hash(self):
+        self.assertEqual(Symbol("abc"), Symbol("abc"))
+        self.assertEqual(hash(Symbol("abc")), hash(Symbol("abc")))
+        self.assertNotEqual(Symbol("abc"), "abc")
+        self.assertIn(Symbol("abc"), {Symbol("abc"): 1})
+
+    def test_name_is_read_only(self):
+        symbol = Symbol("abc")
+        with self.assertRaises(AttributeError):
+            symbol.name = "xyz"
+        self.assertEqual(symbol.name, "abc")
+        self.assertIs(Symbol("abc"), symbol)
+
+    def test_copy_and_pickle_keep_identity(self):
+        symbol = Symbol("abc")
+        self.assertIs(copy.deepcopy(symbol), symbol)
+        self.assertIs(pickle.loads(pickle.dumps(symbol)), symbol)
+
+    def test_parser_interns_atoms(self):
+        parser = Parser(StrLexer("abc abc nil"))
+        first, second, nil = (parser.parse_next() for _ in range(3))
+        self.assertIs(first, second)
+        self.assertIs(nil, SYM_NIL)
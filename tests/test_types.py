@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+import math
+import pickle
+import unittest
+
+from csvinspector.lang.symbol import SYM_NIL, Symbol
+from csvinspector.lang.types import ConsCell, Integer, Real, String
+
+
+#
+##############################################################################
+
+class TestNodeTypes(unittest.TestCase):
+
+    def test_nodes_have_no_instance_dict(self):
+        nodes = (Integer(1000), Real(3.25), String("a"), Symbol("a"),
+                 ConsCell(Integer(1), SYM_NIL))
+        for node in nodes:
+            self.assertFalse(hasattr(node, "__dict__"), type(node))
+
+    def test_small_integers_are_shared(self):
+        self.assertIs(Integer(0), Integer(0))
+        self.assertIs(Integer(-5), Integer(-5))
+        self.assertIs(Integer(256), Integer(256))
+        self.assertEqual(Integer(10 ** 6), Integer(10 ** 6))
+
+    def test_common_reals_are_shared(self):
+        self.assertIs(Real(1.0), Real(1))
+        self.assertIs(Real(0.0), Real(0.0))
+
+    def test_shared_numbers_are_immutable(self):
+        for number in (Integer(1), Real(1.0)):
+            with self.assertRaises(AttributeError):
+                number.value = 2
+            self.assertEqual(number.value, 1)
+        self.assertEqual(Integer(1).value, 1)
+
+    def test_negative_zero_keeps_its_sign(self):
+        self.assertEqual(math.copysign(1.0, Real(-0.0).value), -1.0)
+        self.assertEqual(math.copysign(1.0, Real(0.0).value), 1.0)
+
+    def test_integers_and_reals_are_not_equal(self):
+        self.assertNotEqual(Integer(1), Real(1.0))
+        self.assertNotEqual(Real(1.0), Integer(1))
+
+    def test_pickle(self):
+        for node in (Integer(3), Integer(10 ** 9), Real(2.5), String("x"),
+                     ConsCell(Symbol("a"), SYM_NIL)):
+            self.assertEqual(pickle.loads(pickle.dumps(node)), node)
+        self.assertIs(pickle.loads(pickle.dumps(Integer(3))), Integer(3))